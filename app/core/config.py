@@ -55,6 +55,24 @@ def get_database_url() -> str:
     
     return os.getenv("DB_URL", "sqlite:///./fbr_invoices.db")
 
+def get_read_database_url() -> str:
+    """
+    Optional URL for the read-only (reporting) engine, e.g. a MySQL replica.
+    Empty means "derive from DB_URL" (see app.db.session).
+    """
+    server = os.getenv("DB_READ_SERVER")
+    if server:
+        user = os.getenv("DB_READ_USER", os.getenv("DB_USER", "root"))
+        password = os.getenv("DB_READ_PASSWORD", os.getenv("DB_PASSWORD", ""))
+        port = os.getenv("DB_READ_PORT", os.getenv("DB_PORT", "3306"))
+        name = os.getenv("DB_READ_NAME", os.getenv("DB_NAME", "fbr_invoice_uploader"))
+
+        encoded_password = urllib.parse.quote_plus(password)
+
+        return f"mysql+pymysql://{user}:{encoded_password}@{server}:{port}/{name}"
+
+    return os.getenv("DB_READ_URL", "")
+
 class Settings(BaseModel):
     model_config = ConfigDict(case_sensitive=True)
 
@@ -73,6 +91,13 @@ class Settings(BaseModel):
     FBR_ITEM_NAME: str = Field(default_factory=lambda: _pick_env_value("FBR_ITEM_NAME"))
 
     DB_URL: str = Field(default_factory=get_database_url)
+    DB_READ_URL: str = Field(default_factory=get_read_database_url)
+    DB_READ_POOL_SIZE: int = Field(default_factory=lambda: int(os.getenv("DB_READ_POOL_SIZE", "5")))
+    DB_READ_MAX_OVERFLOW: int = Field(default_factory=lambda: int(os.getenv("DB_READ_MAX_OVERFLOW", "10")))
+    DB_READ_POOL_RECYCLE: int = Field(default_factory=lambda: int(os.getenv("DB_READ_POOL_RECYCLE", "1800")))
+    # Soft-deleted customers/captured rows are hard deleted after this many days (0 = keep forever)
+    PURGE_RETENTION_DAYS: int = Field(default_factory=lambda: int(os.getenv("PURGE_RETENTION_DAYS", "90")))
+    PURGE_INTERVAL_HOURS: float = Field(default_factory=lambda: float(os.getenv("PURGE_INTERVAL_HOURS", "24")))
     LOG_LEVEL: str = Field(default_factory=lambda: os.getenv("LOG_LEVEL", "INFO"))
     ENCRYPTION_KEY: str = Field(default_factory=lambda: os.getenv("ENCRYPTION_KEY", ""))
     HONDA_PORTAL_USERNAME: str = Field(default_factory=lambda: os.getenv("HONDA_PORTAL_USERNAME", ""))
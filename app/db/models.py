@@ -26,11 +26,30 @@ class Customer(Base):
     address = Column(String(255), nullable=True)
     type = Column(String(20), default=CustomerType.INDIVIDUAL)
     is_deleted = Column(Boolean, default=False)
+    deleted_at = Column(DateTime, nullable=True)  # When soft deleted; purged after the retention window
     
     created_at = Column(DateTime, default=dt.datetime.utcnow)
     
     invoices = relationship("Invoice", back_populates="customer")
 
+class CustomerMergeSuggestion(Base):
+    """A likely duplicate pair found by the dedupe job, best matches first."""
+    __tablename__ = "customer_merge_suggestions"
+    __table_args__ = (
+        Index('ix_merge_suggestion_status_score', 'status', 'score'),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    primary_id = Column(Integer, ForeignKey("customers.id"), nullable=False)  # Record that is kept
+    duplicate_id = Column(Integer, ForeignKey("customers.id"), nullable=False)  # Record folded into it
+    score = Column(Float, nullable=False)  # 0..1
+    reasons = Column(String(255), nullable=True)
+    status = Column(String(20), default="PENDING")  # PENDING, MERGED, DISMISSED
+    created_at = Column(DateTime, default=dt.datetime.utcnow)
+
+    primary = relationship("Customer", foreign_keys=[primary_id])
+    duplicate = relationship("Customer", foreign_keys=[duplicate_id])
+
 class ProductModel(Base):
     __tablename__ = "product_models"
     
@@ -48,6 +67,10 @@ class ProductModel(Base):
 
 class Invoice(Base):
     __tablename__ = "invoices"
+    __table_args__ = (
+        # A customer's latest invoice (CNIC autofill) without a sort
+        Index('ix_invoices_customer_id_id', 'customer_id', 'id'),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     invoice_number = Column(String(50), unique=True, index=True, nullable=False)
@@ -102,6 +125,10 @@ class InvoiceItem(Base):
 
 class CapturedData(Base):
     __tablename__ = "captured_data"
+    __table_args__ = (
+        # Keyset paging of the captured data explorer (newest first)
+        Index('ix_captured_data_created_id', 'created_at', 'id'),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(100), nullable=True)
@@ -116,6 +143,7 @@ class CapturedData(Base):
     model = Column(String(50), nullable=True)
     
     is_deleted = Column(Boolean, default=False)
+    deleted_at = Column(DateTime, nullable=True)  # When soft deleted; purged after the retention window
     created_at = Column(DateTime, default=dt.datetime.utcnow)
 
 class Motorcycle(Base):
@@ -1,5 +1,7 @@
-from sqlalchemy import create_engine, text
-from sqlalchemy.orm import sessionmaker
+from pathlib import Path
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine.url import make_url
+from sqlalchemy.orm import scoped_session, sessionmaker
 from sqlalchemy.exc import OperationalError
 from app.core import config
 from app.db.models import Base
@@ -20,6 +22,61 @@ engine = create_engine(
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Thread-scoped sessions for long-lived services used from several threads:
+# each thread gets its own session instead of sharing one across the UI and workers.
+ScopedSession = scoped_session(SessionLocal)
+
+def _sqlite_file_path(url: str):
+    """Returns the database file path of a file-based SQLite URL, else None."""
+    if not url.startswith("sqlite"):
+        return None
+    database = make_url(url).database
+    if not database or database == ":memory:" or database.startswith("file:"):
+        return None
+    return Path(database).resolve()
+
+def get_read_url() -> str:
+    """
+    URL for the reporting engine: DB_READ_URL / DB_READ_SERVER if configured,
+    a read-only (mode=ro) URI for a SQLite file, otherwise the primary URL.
+    """
+    if config.settings.DB_READ_URL:
+        return config.settings.DB_READ_URL
+    db_file = _sqlite_file_path(config.settings.DB_URL)
+    if db_file:
+        return f"sqlite:///file:{db_file.as_posix()}?mode=ro&uri=true"
+    return config.settings.DB_URL
+
+def _create_read_engine():
+    read_url = get_read_url()
+    if read_url == config.settings.DB_URL and "sqlite" in read_url:
+        # In-memory SQLite can't be opened twice, share the primary engine
+        return engine
+
+    read_connect_args = {"check_same_thread": False} if "sqlite" in read_url else {}
+    return create_engine(
+        read_url,
+        connect_args=read_connect_args,
+        pool_size=config.settings.DB_READ_POOL_SIZE,
+        max_overflow=config.settings.DB_READ_MAX_OVERFLOW,
+        pool_recycle=config.settings.DB_READ_POOL_RECYCLE,
+        pool_pre_ping=True
+    )
+
+if _sqlite_file_path(config.settings.DB_URL):
+    @event.listens_for(engine, "connect")
+    def _enable_wal(dbapi_connection, connection_record):
+        # WAL lets report readers run while the cashier or sync thread commits
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute("PRAGMA journal_mode=WAL")
+        finally:
+            cursor.close()
+
+# Read-only engine for reports, dashboard stats and exports
+read_engine = _create_read_engine()
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
 def init_db():
     """Re-initialize the database engine. Useful after settings change."""
     global engine, SessionLocal
@@ -88,6 +145,30 @@ def create_mysql_db_if_missing():
 from app.utils.string_utils import normalize_business_name
 from app.db.models import Base, Customer
 
+# Indexes over live rows only, for the is_deleted = 0 filter nearly every list
+# query has, plus one over dead rows for the purge: (name, table, columns, live).
+# SQLite gets partial indexes; MySQL, which has none, gets is_deleted as the
+# leading column instead.
+SOFT_DELETE_INDEXES = [
+    ("ix_customers_live_id", "customers", ("id",), True),
+    ("ix_captured_data_live_created", "captured_data", ("created_at", "id"), True),
+    ("ix_customers_deleted_at", "customers", ("deleted_at",), False),
+    ("ix_captured_data_deleted_at", "captured_data", ("deleted_at",), False),
+]
+
+
+def soft_delete_index_ddl(dialect_name: str):
+    """CREATE INDEX statements for SOFT_DELETE_INDEXES on the given dialect."""
+    statements = []
+    for name, table, columns, live in SOFT_DELETE_INDEXES:
+        if dialect_name == "sqlite":
+            statements.append(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({', '.join(columns)}) "
+                              f"WHERE is_deleted = {0 if live else 1}")
+        else:
+            statements.append(f"CREATE INDEX {name} ON {table} (is_deleted, {', '.join(columns)})")
+    return statements
+
+
 # ... (existing imports)
 
 def run_migrations():
@@ -238,6 +319,56 @@ def run_migrations():
             except Exception as e:
                 logger.error(f"Migration for uq_customer_cnic failed: {e}")
 
+            # Migration: Keyset paging index for the captured data explorer
+            try:
+                conn.execute(text("CREATE INDEX ix_captured_data_created_id ON captured_data (created_at, id)"))
+                logger.info("Migrating: Created index ix_captured_data_created_id")
+                conn.commit()
+            except Exception as e:
+                err_msg = str(e).lower()
+                if "duplicate key" not in err_msg and "already exists" not in err_msg and "1061" not in err_msg:
+                    logger.warning(f"Could not create ix_captured_data_created_id index: {e}")
+
+            # Migration: Latest invoice per customer for CNIC autofill
+            try:
+                conn.execute(text("CREATE INDEX ix_invoices_customer_id_id ON invoices (customer_id, id)"))
+                logger.info("Migrating: Created index ix_invoices_customer_id_id")
+                conn.commit()
+            except Exception as e:
+                err_msg = str(e).lower()
+                if "duplicate key" not in err_msg and "already exists" not in err_msg and "1061" not in err_msg:
+                    logger.warning(f"Could not create ix_invoices_customer_id_id index: {e}")
+
+            # Migration: is_deleted / deleted_at for soft delete and the purge
+            for table in ("customers", "captured_data"):
+                try:
+                    try:
+                        conn.execute(text(f"SELECT is_deleted FROM {table} LIMIT 1"))
+                    except Exception:
+                        logger.info(f"Migrating: Adding is_deleted to {table} table.")
+                        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN is_deleted BOOLEAN DEFAULT 0"))
+                        conn.commit()
+                    try:
+                        conn.execute(text(f"SELECT deleted_at FROM {table} LIMIT 1"))
+                    except Exception:
+                        logger.info(f"Migrating: Adding deleted_at to {table} table.")
+                        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN deleted_at DATETIME DEFAULT NULL"))
+                        # Rows deleted before this existed start their retention window now
+                        conn.execute(text(f"UPDATE {table} SET deleted_at = CURRENT_TIMESTAMP WHERE is_deleted = 1"))
+                        conn.commit()
+                except Exception as e:
+                    logger.error(f"Soft-delete column migration for {table} failed: {e}")
+
+            # Migration: Live-row / dead-row indexes for soft-deleted tables
+            for statement in soft_delete_index_ddl(engine.dialect.name):
+                try:
+                    conn.execute(text(statement))
+                    conn.commit()
+                except Exception as e:
+                    err_msg = str(e).lower()
+                    if "duplicate key" not in err_msg and "already exists" not in err_msg and "1061" not in err_msg:
+                        logger.warning(f"Could not create soft-delete index ({statement}): {e}")
+
     except Exception as e:
         logger.error(f"Migration phase 2 failed: {e}")
 
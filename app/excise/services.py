@@ -1,4 +1,3 @@
-import openpyxl
 from datetime import datetime
 from sqlalchemy.orm import Session
 from app.db.session import SessionLocal
@@ -25,6 +24,8 @@ class ExciseImportService:
         - Amount
         - Payment Date
         """
+        import openpyxl
+
         try:
             workbook = openpyxl.load_workbook(file_path, data_only=True)
             sheet = workbook.active
@@ -3,6 +3,13 @@ import sys
 import time
 from PIL import Image
 
+# Startup phase timings, logged once the main window is idle
+_T0 = time.perf_counter()
+_phases = []
+
+def mark_phase(name):
+    _phases.append((name, time.perf_counter() - _T0))
+
 # Add project root to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -68,9 +75,22 @@ def show_splash():
     splash_root.update()
     return splash_root, lbl_loading, progress
 
+def log_startup_phases():
+    """Logs how long each startup phase took and the total splash-to-usable time."""
+    mark_phase("usable")
+    from app.core.logger import logger
+
+    previous = 0.0
+    parts = []
+    for name, elapsed in _phases:
+        parts.append(f"{name}={elapsed - previous:.2f}s")
+        previous = elapsed
+    logger.info(f"Startup: {previous:.2f}s to usable ({', '.join(parts)})")
+
 def main():
     # 1. Show Splash Screen
     splash, status_lbl, progress = show_splash()
+    mark_phase("splash")
     
     # 2. Perform Imports (Simulation of work)
     try:
@@ -113,6 +133,7 @@ def main():
         status_lbl.configure(text="Initializing database...")
         splash.update()
         init_db()
+        mark_phase("init_db")
         
         # 5. Import Main App (Heavy Import)
         status_lbl.configure(text="Loading user interface...")
@@ -126,6 +147,7 @@ def main():
                 messagebox.showerror("Critical Error", "Incompatible Environment.\nPlease run using run.bat")
                 sys.exit(1)
             raise
+        mark_phase("import_ui")
 
         # 6. Launch App
         status_lbl.configure(text="Starting...")
@@ -153,6 +175,8 @@ def main():
             pass # Ignore errors during destruction
         
         app = App()
+        mark_phase("build_window")
+        app.after_idle(log_startup_phases)
         app.mainloop()
         
     except Exception as e:
@@ -69,20 +69,37 @@ class BackupService:
             self.app_data_dir = Path(platformdirs.user_data_dir(APP_NAME, appauthor=False))
         else:
             self.app_data_dir = Path.home() / f".{APP_NAME}"
-            
-        self.app_data_dir.mkdir(parents=True, exist_ok=True)
-        
+
         self.config_file = self.app_data_dir / CONFIG_FILE_NAME
-        self.config = self.load_config()
-        
+        # Loaded on first access so importing this module stays free of disk I/O
+        self._config = None
+        self._config_lock = threading.Lock()
+        self.scheduler_thread = None
+        self.stop_event = threading.Event()
+
+    @property
+    def config(self) -> BackupConfig:
+        if self._config is None:
+            with self._config_lock:
+                if self._config is None:
+                    self._load()
+        return self._config
+
+    @config.setter
+    def config(self, value: BackupConfig):
+        self._config = value
+
+    def _load(self):
+        """Creates the data directory, loads the config and fills in defaults."""
+        self.app_data_dir.mkdir(parents=True, exist_ok=True)
+        self._config = self.load_config()
+
         # Ensure local path exists or set default
-        if not self.config.local_path:
-            self.config.local_path = str(self.app_data_dir / BACKUP_DIR_NAME)
+        if not self._config.local_path:
+            self._config.local_path = str(self.app_data_dir / BACKUP_DIR_NAME)
             self.save_config()
-            
+
         self._ensure_key()
-        self.scheduler_thread = None
-        self.stop_event = threading.Event()
 
     def load_config(self) -> BackupConfig:
         if self.config_file.exists():
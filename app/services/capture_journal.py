@@ -0,0 +1,121 @@
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List
+
+
+class CaptureJournal:
+    """
+    Append-only, line-delimited log of captured field events.
+
+    append() only queues the event; a background writer appends everything that
+    arrived within `flush_delay` seconds in one write (and one fsync), so typing
+    in a long form costs a few small appends instead of a full JSON rewrite per
+    keystroke. The owner takes mark(), writes a compacted snapshot and then
+    calls reset(mark) to drop what the snapshot covers; after a crash, replay()
+    returns the events newer than the last snapshot.
+    """
+
+    def __init__(self, path, flush_delay: float = 0.25):
+        self.path = Path(path)
+        self.flush_delay = flush_delay
+        self._pending: List[Dict] = []
+        self._cond = threading.Condition()
+        # Serializes file writes (flush, reset) without holding up append()
+        self._write_lock = threading.Lock()
+        self._writer = None
+        self._closed = False
+        # Continue numbering after a crash so reset() can tell old lines from new ones
+        self._seq = max((e.get("seq", 0) for e in self.replay()), default=0)
+
+    def append(self, event: Dict):
+        with self._cond:
+            self._seq += 1
+            self._pending.append({**event, "seq": self._seq})
+            self._closed = False
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(target=self._run, daemon=True, name="capture-journal")
+                self._writer.start()
+            self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if self._closed and not self._pending:
+                    return
+            # Let a burst of keystrokes collect into one write
+            time.sleep(self.flush_delay)
+            self.flush()
+
+    def flush(self):
+        """Writes queued events now."""
+        with self._write_lock:
+            # Only the swap holds _cond; append() never waits on the disk
+            with self._cond:
+                batch, self._pending = self._pending, []
+            if not batch:
+                return
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write("".join(json.dumps(event) + "\n" for event in batch))
+                    f.flush()
+                    os.fsync(f.fileno())
+            except Exception as e:
+                logging.error(f"Error appending to capture journal: {e}")
+                with self._cond:
+                    self._pending[:0] = batch
+
+    def mark(self) -> int:
+        """Sequence number of the newest event; take it before snapshotting."""
+        with self._cond:
+            return self._seq
+
+    def reset(self, upto: int = None):
+        """
+        Forgets events up to `upto` (default: all), queued or on disk. Events that
+        arrived while the snapshot was being written are kept.
+        """
+        with self._write_lock:
+            with self._cond:
+                if upto is None:
+                    upto = self._seq
+                self._pending = [e for e in self._pending if e.get("seq", 0) > upto]
+            try:
+                if self.path.exists():
+                    newer = [e for e in self.replay() if e.get("seq", 0) > upto]
+                    with open(self.path, "w", encoding="utf-8") as f:
+                        f.write("".join(json.dumps(event) + "\n" for event in newer))
+            except Exception as e:
+                logging.error(f"Error truncating capture journal: {e}")
+
+    def replay(self) -> List[Dict]:
+        """Events on disk, oldest first. A torn last line from a crash is skipped."""
+        events = []
+        if not self.path.exists():
+            return events
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        events.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        logging.warning("Skipping incomplete capture journal line")
+        except Exception as e:
+            logging.error(f"Error reading capture journal: {e}")
+        return events
+
+    def close(self):
+        """Flushes what is queued and lets the writer thread exit."""
+        self.flush()
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
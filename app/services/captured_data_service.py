@@ -1,18 +1,32 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, desc
-from app.db.session import SessionLocal
+from sqlalchemy import and_, or_, desc
+from app.db.session import ScopedSession
 from app.db.models import CapturedData
-from typing import List, Optional, Tuple, Dict, Any
+from typing import Callable, List, Optional, Tuple, Dict, Any
+from datetime import datetime
 import math
+import threading
+import time
 
 import logging
 
 # Configure logger
 logger = logging.getLogger(__name__)
 
+# Seconds a total count is shown before it is recounted in the background
+COUNT_CACHE_TTL = 30
+
 class CapturedDataService:
     def __init__(self):
-        self.db: Session = SessionLocal()
+        # Proxy to a per-thread session, safe to use from UI and worker threads
+        self.db = ScopedSession
+        # search query -> (total, counted_at)
+        self._count_cache: Dict[str, Tuple[int, float]] = {}
+        # search query -> callbacks waiting on a count already running
+        self._count_waiters: Dict[str, List[Callable]] = {}
+        self._count_lock = threading.Lock()
+        # Bumped by invalidate_counts so a count racing a write isn't cached
+        self._count_version = 0
 
     def delete_by_chassis(self, db: Session, chassis_number: str) -> bool:
         """
@@ -57,6 +71,10 @@ class CapturedDataService:
     ) -> Dict[str, Any]:
         """
         Retrieve paginated captured data with optional search.
+
+        Legacy OFFSET pagination with a COUNT on every call. The Captured Data
+        screen uses get_captured_page and get_total_count; this is kept for
+        scripts/test_deletion.py.
         
         Args:
             page (int): Current page number (1-based).
@@ -70,6 +88,25 @@ class CapturedDataService:
         # Commit ensures the current transaction (if any) is closed and next query starts a new one
         self.db.commit()
 
+        query = self._filtered_query(search_query)
+
+        # Get total count before pagination
+        total_records = query.count()
+        total_pages = math.ceil(total_records / per_page) if total_records > 0 else 1
+
+        # Apply pagination
+        offset = (page - 1) * per_page
+        data = query.order_by(desc(CapturedData.created_at)).offset(offset).limit(per_page).all()
+
+        return {
+            "data": data,
+            "total_records": total_records,
+            "total_pages": total_pages,
+            "current_page": page,
+            "per_page": per_page
+        }
+
+    def _filtered_query(self, search_query: str = None):
         query = self.db.query(CapturedData).filter(CapturedData.is_deleted == False)
 
         if search_query:
@@ -85,23 +122,112 @@ class CapturedDataService:
                     CapturedData.model.ilike(search)
                 )
             )
+        return query
 
-        # Get total count before pagination
-        total_records = query.count()
-        total_pages = math.ceil(total_records / per_page) if total_records > 0 else 1
+    def get_captured_page(
+        self,
+        cursor: Optional[Tuple[Any, int]] = None,
+        per_page: int = 20,
+        search_query: str = None
+    ) -> Dict[str, Any]:
+        """
+        Retrieve one page of captured data, newest first, using keyset pagination.
 
-        # Apply pagination
-        offset = (page - 1) * per_page
-        data = query.order_by(desc(CapturedData.created_at)).offset(offset).limit(per_page).all()
+        Rows come after `cursor` (the (created_at, id) of the previous page's last
+        row) via the (created_at, id) index, so a deep page costs the same as the
+        first one. Legacy rows without created_at sort last (NULL is lowest in both
+        SQLite and MySQL) and are paged by id. No total is counted here; see
+        get_total_count.
+
+        Returns:
+            Dict containing 'data', 'next_cursor' (None on the last page) and 'has_more'.
+        """
+        self.db.commit()
+
+        query = self._filtered_query(search_query)
+        if cursor:
+            created_at, record_id = cursor
+            if created_at is None:
+                query = query.filter(CapturedData.created_at.is_(None), CapturedData.id < record_id)
+            else:
+                query = query.filter(
+                    or_(
+                        CapturedData.created_at < created_at,
+                        and_(CapturedData.created_at == created_at, CapturedData.id < record_id),
+                        CapturedData.created_at.is_(None)
+                    )
+                )
+
+        # One extra row tells us whether there is a next page without counting
+        rows = query.order_by(desc(CapturedData.created_at), desc(CapturedData.id)).limit(per_page + 1).all()
+        has_more = len(rows) > per_page
+        rows = rows[:per_page]
 
         return {
-            "data": data,
-            "total_records": total_records,
-            "total_pages": total_pages,
-            "current_page": page,
+            "data": rows,
+            "next_cursor": (rows[-1].created_at, rows[-1].id) if has_more else None,
+            "has_more": has_more,
             "per_page": per_page
         }
 
+    def get_total_count(self, search_query: str = None, on_ready: Callable = None) -> Optional[int]:
+        """
+        Returns the cached number of matching records (None if never counted).
+
+        A missing or stale count is refreshed on a background thread and then
+        passed to on_ready(total), which runs on that thread.
+        """
+        key = search_query or ""
+        with self._count_lock:
+            cached = self._count_cache.get(key)
+            fresh = cached is not None and time.monotonic() - cached[1] < COUNT_CACHE_TTL
+            if not fresh:
+                running = key in self._count_waiters
+                waiters = self._count_waiters.setdefault(key, [])
+                if on_ready:
+                    waiters.append(on_ready)
+                if not running:
+                    self._start_count(key)
+        return cached[0] if cached else None
+
+    def _start_count(self, key: str):
+        # Called with _count_lock held
+        threading.Thread(target=self._count_in_background, args=(key, self._count_version),
+                         daemon=True, name="captured-count").start()
+
+    def _count_in_background(self, key: str, version: int):
+        total = None
+        try:
+            self.db.commit()
+            total = self._filtered_query(key or None).count()
+        except Exception as e:
+            logger.error(f"Error counting captured data: {e}")
+        finally:
+            # This thread's session would otherwise stay open
+            self.db.remove()
+
+        with self._count_lock:
+            if total is not None and version != self._count_version:
+                # Records changed while counting: count again for the same waiters
+                self._start_count(key)
+                return
+            if total is not None:
+                self._count_cache[key] = (total, time.monotonic())
+            waiters = self._count_waiters.pop(key, [])
+        if total is None:
+            return
+        for callback in waiters:
+            try:
+                callback(total)
+            except Exception as e:
+                logger.error(f"Captured count callback error: {e}")
+
+    def invalidate_counts(self):
+        """Forget cached totals, e.g. after records were added or removed."""
+        with self._count_lock:
+            self._count_version += 1
+            self._count_cache.clear()
+
     def delete_records(self, record_ids: List[int], soft_delete: bool = True) -> Tuple[bool, str]:
         """
         Delete captured data records.
@@ -128,11 +254,12 @@ class CapturedDataService:
                 result = self.db.query(CapturedData).filter(
                     CapturedData.id.in_(record_ids)
                 ).update(
-                    {CapturedData.is_deleted: True}, 
+                    {CapturedData.is_deleted: True, CapturedData.deleted_at: datetime.utcnow()}, 
                     synchronize_session=False
                 )
                 
                 self.db.commit()
+                self.invalidate_counts()
                 msg = f"Successfully soft deleted {result} record(s)."
                 logger.info(f"AUDIT: {msg} IDs: {record_ids}")
                 return True, msg
@@ -143,6 +270,7 @@ class CapturedDataService:
                 ).delete(synchronize_session=False)
                 
                 self.db.commit()
+                self.invalidate_counts()
                 msg = f"Successfully permanently deleted {result} record(s)."
                 logger.info(f"AUDIT: {msg} IDs: {record_ids}")
                 return True, msg
@@ -1,24 +1,53 @@
 import logging
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, List, Optional
 from datetime import datetime
+import queue
+import threading
 import uuid
 import re
 import time
 
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 from app.db.session import SessionLocal
 from app.db.models import CapturedData
+from app.services.captured_data_service import captured_data_service
 from app.core.logger import logger
 
+# Submissions waiting for the writer; when full, submit() refuses instead of blocking the browser
+SUBMISSION_QUEUE_SIZE = 100
+# Most submissions the writer upserts in one statement
+WRITE_BATCH_SIZE = 50
+WRITE_RETRIES = 3
+
+# Columns refreshed when a chassis is submitted again
+UPSERT_COLUMNS = ("name", "father", "cnic", "cell", "address", "engine_number", "color", "model", "created_at")
+
+
 class CapturedFormProcessor:
     def __init__(self, config: Dict[str, Any]):
         self.config = config
         self.mapping = config.get("field_mapping", {})
+        self._queue = queue.Queue(maxsize=SUBMISSION_QUEUE_SIZE)
+        self._writer = None
+        self._writer_lock = threading.Lock()
+        self._listeners: List[Callable] = []
 
     def process_submission(self, session_data: Dict[str, Any]) -> bool:
         """
         Processes the captured session data, maps it to CapturedData model, 
-        and saves it to the database.
+        and saves it to the database. Blocks until written; the browser uses submit().
+        """
+        record = self.prepare_record(session_data)
+        if record is None:
+            return False
+        return self.save_records([record]) > 0
+
+    def prepare_record(self, session_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Maps and validates a submission without touching the database.
+        Returns the captured_data row to write, or None if it is invalid.
         """
         try:
             # 1. Flatten data from all pages
@@ -32,96 +61,143 @@ class CapturedFormProcessor:
 
             logger.info(f"Processing submission with data: {flat_data}")
 
-            # DEBUG: Dump flat data
-            try:
-                with open("save_debug.txt", "a") as f:
-                    f.write(f"\n--- SUBMISSION START {datetime.now()} ---\n")
-                    f.write(f"Flat Data Keys: {list(flat_data.keys())}\n")
-                    f.write(f"Flat Data Content: {flat_data}\n")
-            except:
-                pass
-
             # 2. Map data to schema fields
             mapped_data = self._map_data(flat_data)
             logger.info(f"Mapped data: {mapped_data}")
 
-            # DEBUG: Dump mapped data
-            try:
-                with open("save_debug.txt", "a") as f:
-                    f.write(f"Mapped Data: {mapped_data}\n")
-            except:
-                pass
-
             # 3. Validate required fields
             if not self._validate(mapped_data):
                 logger.error(f"Validation failed for captured form. Missing fields. Mapped Data: {mapped_data}")
-                return False
+                return None
 
-            logger.info("Validation passed. Attempting to save to database...")
+            engine_val = mapped_data.get("engine_number")
+            return {
+                "name": (mapped_data.get("buyer_name") or "").upper(),
+                "father": (mapped_data.get("buyer_father_name") or "").upper(),
+                "cnic": mapped_data.get("buyer_cnic"),
+                "cell": mapped_data.get("buyer_phone"),
+                "address": (mapped_data.get("buyer_address") or "").upper(),
+                "chassis_number": mapped_data.get("chassis_number"),
+                "engine_number": engine_val.upper() if engine_val else None,
+                "color": (mapped_data.get("color") or "").upper(),
+                "model": (mapped_data.get("model_name") or "").upper(),
+                "created_at": datetime.utcnow(),
+            }
 
-            # 4. Save to CapturedData Table with Retry Logic
-            max_retries = 3
-            
-            for attempt in range(max_retries):
-                try:
-                    with SessionLocal() as db:
-                        # Check uniqueness of chassis
-                        chassis = mapped_data.get("chassis_number")
-                        existing = db.query(CapturedData).filter(CapturedData.chassis_number == chassis).first()
-                        
-                        if existing:
-                            # Update existing record
-                            logger.info(f"Updating existing record for chassis {chassis}")
-                            existing.name = (mapped_data.get("buyer_name") or "").upper()
-                            existing.father = (mapped_data.get("buyer_father_name") or "").upper()
-                            existing.cnic = mapped_data.get("buyer_cnic")
-                            existing.cell = mapped_data.get("buyer_phone")
-                            existing.address = (mapped_data.get("buyer_address") or "").upper()
-                            
-                            # Handle engine number (optional)
-                            engine_val = mapped_data.get("engine_number")
-                            if engine_val:
-                                existing.engine_number = engine_val.upper()
-                            else:
-                                existing.engine_number = None
-
-                            existing.color = (mapped_data.get("color") or "").upper()
-                            existing.model = (mapped_data.get("model_name") or "").upper()
-                            existing.created_at = datetime.utcnow() # Update timestamp?
-                        else:
-                            # Create new record
-                            logger.info(f"Creating new record for chassis {chassis}")
-                            
-                            engine_val = mapped_data.get("engine_number")
-                            
-                            new_record = CapturedData(
-                                name=(mapped_data.get("buyer_name") or "").upper(),
-                                father=(mapped_data.get("buyer_father_name") or "").upper(),
-                                cnic=mapped_data.get("buyer_cnic"),
-                                cell=mapped_data.get("buyer_phone"),
-                                address=(mapped_data.get("buyer_address") or "").upper(),
-                                chassis_number=chassis,
-                                engine_number=engine_val.upper() if engine_val else None,
-                                color=(mapped_data.get("color") or "").upper(),
-                                model=(mapped_data.get("model_name") or "").upper(),
-                                created_at=datetime.utcnow()
-                            )
-                            db.add(new_record)
-                        
-                        db.commit()
-                        logger.info("Successfully saved to database.")
-                        return True
-                        
-                except Exception as e:
-                    logger.error(f"Database error (attempt {attempt+1}): {e}")
-                    time.sleep(1 * (attempt + 1))
-            
-            logger.error("Failed to save to database after retries.")
-            return False
-            
         except Exception as e:
             logger.error(f"Error processing submission: {e}")
+            return None
+
+    # ---- Background writer ----
+
+    def add_listener(self, callback: Callable):
+        """callback(record, error) runs on the writer thread after each queued submission is written."""
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def submit(self, session_data: Dict[str, Any], on_done: Callable = None) -> bool:
+        """
+        Validates the submission and queues it for the writer thread; never waits on the DB.
+        Returns False if it is invalid or the queue is full. on_done(record, error) is
+        called from the writer thread once it is written (error is None) or has failed.
+        """
+        record = self.prepare_record(session_data)
+        if record is None:
+            return False
+        try:
+            self._queue.put_nowait((record, on_done))
+        except queue.Full:
+            logger.error(f"Submission queue full, chassis {record['chassis_number']} not queued")
             return False
+        self._ensure_writer()
+        return True
+
+    def pending_writes(self) -> int:
+        return self._queue.qsize()
+
+    def _ensure_writer(self):
+        with self._writer_lock:
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(target=self._run_writer, daemon=True, name="capture-writer")
+                self._writer.start()
+
+    def _run_writer(self):
+        while True:
+            batch = [self._queue.get()]
+            # Whatever else is already waiting goes into the same statement
+            while len(batch) < WRITE_BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            error = None
+            try:
+                if self.save_records([record for record, _ in batch]):
+                    captured_data_service.invalidate_counts()
+                else:
+                    error = RuntimeError("Failed to save captured data to database")
+            except Exception as e:
+                error = e
+
+            for record, on_done in batch:
+                for callback in ([on_done] if on_done else []) + list(self._listeners):
+                    try:
+                        callback(record, error)
+                    except Exception as e:
+                        logger.error(f"Capture write callback error: {e}")
+
+    def save_records(self, records: List[Dict[str, Any]]) -> int:
+        """
+        Upserts captured_data rows keyed on chassis_number in one statement, with retries.
+        Returns the number of rows written (0 on failure).
+        """
+        # One row per chassis; the latest submission wins
+        rows = list({r["chassis_number"]: r for r in records}.values())
+        if not rows:
+            return 0
+
+        for attempt in range(WRITE_RETRIES):
+            try:
+                with SessionLocal() as db:
+                    self._upsert(db, rows)
+                    db.commit()
+                logger.info(f"Successfully saved {len(rows)} captured record(s) to database.")
+                return len(rows)
+            except Exception as e:
+                logger.error(f"Database error (attempt {attempt+1}): {e}")
+                # Only the writer thread waits here, never the browser
+                time.sleep(1 * (attempt + 1))
+
+        logger.error("Failed to save to database after retries.")
+        return 0
+
+    def _upsert(self, db: Session, rows: List[Dict[str, Any]]):
+        dialect = db.get_bind().dialect.name
+        table = CapturedData.__table__
+        if dialect == "sqlite":
+            stmt = sqlite_insert(table).values(rows)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[table.c.chassis_number],
+                set_={col: stmt.excluded[col] for col in UPSERT_COLUMNS}
+            )
+        elif dialect == "mysql":
+            stmt = mysql_insert(table).values(rows)
+            stmt = stmt.on_duplicate_key_update({col: stmt.inserted[col] for col in UPSERT_COLUMNS})
+        else:
+            for row in rows:
+                existing = db.query(CapturedData).filter(CapturedData.chassis_number == row["chassis_number"]).first()
+                if existing:
+                    for col in UPSERT_COLUMNS:
+                        setattr(existing, col, row[col])
+                else:
+                    db.add(CapturedData(**row))
+            return
+        db.execute(stmt)
 
     def _map_data(self, flat_data: Dict[str, Any]) -> Dict[str, Any]:
         """Maps flat data to schema using field_mapping config"""
@@ -0,0 +1,359 @@
+import logging
+import re
+from collections import defaultdict
+from datetime import datetime
+from functools import lru_cache
+from itertools import combinations
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import func, insert, or_
+from sqlalchemy.orm import aliased
+
+from app.db.models import Customer, CustomerMergeSuggestion, Invoice
+from app.db.session import SessionLocal
+from app.services.customer_service import customer_service
+from app.services.search_index import customer_index
+
+logger = logging.getLogger(__name__)
+
+# Pairs scoring below this are not suggested
+MIN_SCORE = 0.75
+# Blocks larger than this are too generic to be useful (e.g. a common name with
+# no father name); comparing inside them would bring back the quadratic scan
+MAX_BLOCK_SIZE = 50
+# Leading CNIC digits shared by a block (district + most of the serial)
+CNIC_BLOCK_DIGITS = 10
+# Weights of each signal in the score; signals that don't apply are left out
+WEIGHTS = {"name": 0.45, "father": 0.15, "cnic": 0.25, "phone": 0.15}
+CHUNK_SIZE = 500
+
+# Spelling variants common in romanized Urdu names
+_PHONETIC_RULES = (
+    ("ph", "f"), ("kh", "k"), ("gh", "g"), ("sh", "s"), ("ch", "c"), ("th", "t"), ("dh", "d"),
+    ("q", "k"), ("z", "s"), ("v", "w"), ("y", "i"), ("ee", "i"), ("oo", "u"),
+)
+_WORD_RE = re.compile(r"[a-z]+")
+_VOWELS_RE = re.compile(r"[aeiou]")
+_REPEATS_RE = re.compile(r"(.)\1+")
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9]")
+
+
+@lru_cache(maxsize=65536)
+def _phonetic_word(word: str) -> str:
+    # Names are made of a small vocabulary of words, so this is mostly cache hits
+    for old, new in _PHONETIC_RULES:
+        word = word.replace(old, new)
+    return _REPEATS_RE.sub(r"\1", word[0] + _VOWELS_RE.sub("", word[1:]))
+
+
+def phonetic_key(text: Optional[str]) -> str:
+    """
+    Rough sound-alike key: 'MUHAMMAD ALI', 'Mohammad Aly' and 'MOHAMMED ALI'
+    all give 'mhmd al'. Each word keeps its first letter and drops later vowels.
+    """
+    return " ".join(_phonetic_word(w) for w in _WORD_RE.findall((text or "").lower()))
+
+
+def normalize_phone(phone: Optional[str]) -> str:
+    digits = re.sub(r"\D", "", phone or "")
+    if digits.startswith("92") and len(digits) == 12:
+        digits = "0" + digits[2:]
+    elif len(digits) == 10 and digits.startswith("3"):
+        digits = "0" + digits
+    return digits if len(digits) == 11 else ""
+
+
+@lru_cache(maxsize=65536)
+def _bigrams(text: Optional[str]) -> FrozenSet[str]:
+    text = _NON_ALNUM_RE.sub("", (text or "").lower())
+    if len(text) < 2:
+        return frozenset([text]) if text else frozenset()
+    return frozenset(text[i:i + 2] for i in range(len(text) - 1))
+
+
+def _dice(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    return 2 * len(a & b) / (len(a) + len(b))
+
+
+def _near_cnic(a: str, b: str) -> bool:
+    """One digit wrong, or two neighbouring digits swapped."""
+    if len(a) != len(b) or a == b:
+        return a == b
+    diff = [i for i in range(len(a)) if a[i] != b[i]]
+    if len(diff) > 2:
+        return False
+    if len(diff) == 1:
+        return True
+    return len(diff) == 2 and diff[1] == diff[0] + 1 and a[diff[0]] == b[diff[1]] and a[diff[1]] == b[diff[0]]
+
+
+def _chunks(items: List, size: int = CHUNK_SIZE) -> Iterable[List]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class _Candidate:
+    __slots__ = ("id", "type", "invoices", "cnic", "phone", "name_text", "father_text", "_name", "_father", "keys")
+
+    def __init__(self, row, invoices: int):
+        self.id = row.id
+        self.type = str(row.type.value if hasattr(row.type, "value") else row.type)
+        self.invoices = invoices
+        self.cnic = re.sub(r"\D", "", row.cnic or "")
+        self.phone = normalize_phone(row.phone)
+        self.name_text, self.father_text = row.name, row.father_name
+        self._name = self._father = None  # Bigrams, built only if this customer is in a pair
+
+        name_key = phonetic_key(row.name)
+        self.keys = []
+        if len(self.cnic) >= CNIC_BLOCK_DIGITS:
+            self.keys.append("c:" + self.cnic[:CNIC_BLOCK_DIGITS])
+        if name_key:
+            self.keys.append(f"n:{name_key}/{phonetic_key(row.father_name)[:1]}")
+        if self.phone:
+            self.keys.append("p:" + self.phone)
+
+    @property
+    def name(self) -> FrozenSet[str]:
+        if self._name is None:
+            self._name = _bigrams(self.name_text)
+        return self._name
+
+    @property
+    def father(self) -> FrozenSet[str]:
+        if self._father is None:
+            self._father = _bigrams(self.father_text)
+        return self._father
+
+
+class CustomerDedupService:
+    """
+    Finds customers entered more than once and merges them.
+
+    find_duplicates() never compares every pair. Each customer gets a few
+    blocking keys (CNIC prefix, sound-alike name, normalized phone) and only
+    customers sharing a key are scored, so the work grows with block sizes
+    rather than n². Scores are a weighted mix of name/father-name bigram
+    similarity, a near-identical CNIC and an equal phone number; pairs above
+    MIN_SCORE are stored as PENDING CustomerMergeSuggestion rows.
+    """
+
+    # ---- Detection ----
+
+    def find_duplicates(self) -> int:
+        """Replaces the pending suggestions with a fresh scan. Returns how many were found."""
+        db = SessionLocal()
+        try:
+            counts = dict(db.query(Invoice.customer_id, func.count(Invoice.id))
+                          .filter(Invoice.customer_id.isnot(None)).group_by(Invoice.customer_id))
+            rows = db.query(Customer.id, Customer.type, Customer.name, Customer.father_name,
+                            Customer.cnic, Customer.phone).filter(Customer.is_deleted == False).all()
+            candidates = {row.id: _Candidate(row, counts.get(row.id, 0)) for row in rows}
+
+            dismissed = {frozenset(pair) for pair in db.query(
+                CustomerMergeSuggestion.primary_id, CustomerMergeSuggestion.duplicate_id
+            ).filter(CustomerMergeSuggestion.status == "DISMISSED")}
+
+            suggestions = []
+            for a_id, b_id in self._candidate_pairs(candidates.values()):
+                if frozenset((a_id, b_id)) in dismissed:
+                    continue
+                a, b = candidates[a_id], candidates[b_id]
+                if a.type != b.type:
+                    continue
+                signals = self._signals(a, b)
+                score = self._score(signals)
+                if score < MIN_SCORE:
+                    continue
+                # Keep the record with more invoices, then the older one
+                keep, drop = sorted((a, b), key=lambda c: (-c.invoices, c.id))
+                suggestions.append({"primary_id": keep.id, "duplicate_id": drop.id,
+                                    "score": round(score, 3), "reasons": self._reasons(signals)[:255],
+                                    "status": "PENDING"})
+
+            suggestions.sort(key=lambda s: -s["score"])
+            db.query(CustomerMergeSuggestion).filter(
+                CustomerMergeSuggestion.status == "PENDING"
+            ).delete(synchronize_session=False)
+            for chunk in _chunks(suggestions):
+                db.execute(insert(CustomerMergeSuggestion), chunk)
+            db.commit()
+            logger.info(f"Duplicate scan: {len(candidates)} customers, {len(suggestions)} suggestion(s)")
+            return len(suggestions)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _candidate_pairs(self, candidates: Iterable[_Candidate]) -> Set[Tuple[int, int]]:
+        blocks: Dict[str, List[int]] = defaultdict(list)
+        for c in candidates:
+            for key in c.keys:
+                blocks[key].append(c.id)
+
+        pairs = set()
+        skipped = 0
+        for key, ids in blocks.items():
+            if len(ids) < 2:
+                continue
+            if len(ids) > MAX_BLOCK_SIZE:
+                skipped += 1
+                continue
+            pairs.update(combinations(sorted(ids), 2))
+        if skipped:
+            logger.info(f"Duplicate scan skipped {skipped} oversized block(s)")
+        return pairs
+
+    def _signals(self, a: _Candidate, b: _Candidate) -> Dict[str, float]:
+        signals = {}
+        if a.name and b.name:
+            signals["name"] = _dice(a.name, b.name)
+        if a.father and b.father:
+            signals["father"] = _dice(a.father, b.father)
+        # A wrongly entered CNIC is a common reason for the duplicate in the
+        # first place, so a different CNIC is not held against the pair
+        if a.cnic and b.cnic and _near_cnic(a.cnic, b.cnic):
+            signals["cnic"] = 1.0
+        if a.phone and b.phone:
+            signals["phone"] = 1.0 if a.phone == b.phone else 0.0
+        return signals
+
+    def _score(self, signals: Dict[str, float]) -> float:
+        if "name" not in signals:
+            return 0.0
+        weight = sum(WEIGHTS[k] for k in signals)
+        return sum(WEIGHTS[k] * v for k, v in signals.items()) / weight
+
+    def _reasons(self, signals: Dict[str, float]) -> str:
+        reasons = [f"name {signals['name']:.0%}"]
+        if "father" in signals:
+            reasons.append(f"father {signals['father']:.0%}")
+        if signals.get("cnic"):
+            reasons.append("CNIC differs by a typo")
+        if signals.get("phone"):
+            reasons.append("same phone")
+        return ", ".join(reasons)
+
+    # ---- Review ----
+
+    def get_pending_suggestions(self, limit: int = 500) -> List[tuple]:
+        """(id, score, keep id, keep name, keep CNIC, merge id, merge name, merge CNIC, reasons), best first."""
+        keep, drop = aliased(Customer), aliased(Customer)
+        db = SessionLocal()
+        try:
+            return [tuple(row) for row in db.query(
+                CustomerMergeSuggestion.id, CustomerMergeSuggestion.score,
+                keep.id, keep.name, keep.cnic, drop.id, drop.name, drop.cnic, CustomerMergeSuggestion.reasons
+            ).join(keep, keep.id == CustomerMergeSuggestion.primary_id
+            ).join(drop, drop.id == CustomerMergeSuggestion.duplicate_id
+            ).filter(CustomerMergeSuggestion.status == "PENDING"
+            ).order_by(CustomerMergeSuggestion.score.desc(), CustomerMergeSuggestion.id).limit(limit)]
+        finally:
+            db.close()
+
+    def dismiss_suggestions(self, suggestion_ids: List[int]) -> int:
+        """Marks pairs as not duplicates; later scans won't suggest them again."""
+        db = SessionLocal()
+        try:
+            updated = 0
+            for chunk in _chunks(list(suggestion_ids)):
+                updated += db.query(CustomerMergeSuggestion).filter(
+                    CustomerMergeSuggestion.id.in_(chunk)
+                ).update({CustomerMergeSuggestion.status: "DISMISSED"}, synchronize_session=False)
+            db.commit()
+            return updated
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    # ---- Merge ----
+
+    def merge_suggestions(self, suggestion_ids: List[int]) -> Tuple[bool, str]:
+        """
+        Merges each selected pair in one transaction: the duplicate's invoices
+        are re-pointed to the kept customer, blank contact fields on the kept
+        customer are filled from the duplicate, and the duplicate is soft
+        deleted. Chains (A<-B, B<-C) collapse into A.
+        """
+        if not suggestion_ids:
+            return False, "No suggestions selected."
+        db = SessionLocal()
+        # The merged records are still needed after commit to update the caches
+        db.expire_on_commit = False
+        try:
+            suggestions = []
+            for chunk in _chunks(list(suggestion_ids)):
+                suggestions += db.query(CustomerMergeSuggestion).filter(
+                    CustomerMergeSuggestion.id.in_(chunk), CustomerMergeSuggestion.status == "PENDING"
+                ).all()
+            suggestions.sort(key=lambda s: -s.score)
+
+            merged_into: Dict[int, int] = {}
+
+            def resolve(customer_id):
+                while customer_id in merged_into:
+                    customer_id = merged_into[customer_id]
+                return customer_id
+
+            for s in suggestions:
+                keep, drop = resolve(s.primary_id), resolve(s.duplicate_id)
+                if keep != drop:
+                    merged_into[drop] = keep
+                s.status = "MERGED"
+            if not merged_into:
+                db.commit()
+                return False, "Nothing to merge."
+
+            targets: Dict[int, List[int]] = defaultdict(list)
+            for drop in merged_into:
+                targets[resolve(drop)].append(drop)
+
+            merged_at = datetime.utcnow()
+            ids = list(targets) + list(merged_into)
+            customers = {}
+            for chunk in _chunks(ids):
+                customers.update({c.id: c for c in db.query(Customer).filter(Customer.id.in_(chunk))})
+
+            for keep_id, drop_ids in targets.items():
+                db.query(Invoice).filter(Invoice.customer_id.in_(drop_ids)).update(
+                    {Invoice.customer_id: keep_id}, synchronize_session=False)
+                keep = customers[keep_id]
+                for field in ("father_name", "phone", "address", "ntn"):
+                    if not getattr(keep, field):
+                        filler = next((getattr(customers[d], field) for d in drop_ids if getattr(customers[d], field)), None)
+                        if filler:
+                            setattr(keep, field, filler)
+                for drop_id in drop_ids:
+                    customers[drop_id].is_deleted = True
+                    customers[drop_id].deleted_at = merged_at
+
+            # Other pending pairs involving a merged-away record are out of date
+            db.flush()
+            drops = list(merged_into)
+            for chunk in _chunks(drops):
+                db.query(CustomerMergeSuggestion).filter(
+                    CustomerMergeSuggestion.status == "PENDING",
+                    or_(CustomerMergeSuggestion.primary_id.in_(chunk), CustomerMergeSuggestion.duplicate_id.in_(chunk))
+                ).delete(synchronize_session=False)
+            db.commit()
+
+            for drop_id in drops:
+                customer_index.remove(drop_id)
+            for keep_id in targets:
+                customer_index.upsert(customers[keep_id])
+            cnics = [customers[i].cnic for i in ids if customers[i].cnic]
+            if cnics:
+                customer_service.invalidate_profile(*cnics)
+            return True, f"Merged {len(drops)} duplicate customer(s)."
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Customer merge failed: {e}", exc_info=True)
+            return False, f"Error merging customers: {str(e)}"
+        finally:
+            db.close()
+
+
+customer_dedup_service = CustomerDedupService()
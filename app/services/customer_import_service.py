@@ -0,0 +1,297 @@
+import csv
+import logging
+import os
+import re
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+
+from app.db.models import Customer, CustomerType
+from app.db.session import SessionLocal
+from app.services.customer_service import customer_service
+from app.services.search_index import customer_index
+from app.utils.string_utils import normalize_business_name
+
+logger = logging.getLogger(__name__)
+
+# Rows inserted per transaction; also the size of each IN (...) lookup
+IMPORT_CHUNK_SIZE = 500
+
+# Spreadsheet header (lowercase, trimmed) -> Customer column
+HEADER_ALIASES = {
+    "cnic": "cnic", "cnic no": "cnic", "id card": "cnic",
+    "name": "name", "customer name": "name", "owner name": "name", "dealer name": "name",
+    "father name": "father_name", "father_name": "father_name", "s/o": "father_name",
+    "business name": "business_name", "business_name": "business_name", "business": "business_name",
+    "phone": "phone", "cell": "phone", "mobile": "phone", "phone no": "phone",
+    "address": "address",
+    "ntn": "ntn",
+    "type": "type",
+}
+
+CNIC_RE = re.compile(r"^\d{5}-\d{7}-\d$")
+NTN_RE = re.compile(r"^\d{7}(-\d)?$")
+# Same rules as the customer and dealer forms
+PHONE_RE = {
+    CustomerType.INDIVIDUAL.value: re.compile(r"^03\d{9}$"),
+    CustomerType.DEALER.value: re.compile(r"^\d{11}$"),
+}
+REQUIRED = {
+    CustomerType.INDIVIDUAL.value: ("name", "cnic", "phone"),
+    CustomerType.DEALER.value: ("name", "cnic", "business_name", "phone"),
+}
+
+
+class ImportRowError(NamedTuple):
+    row: int  # Spreadsheet row number (header is row 1)
+    field: str
+    message: str
+
+
+class ImportResult:
+    def __init__(self, total: int):
+        self.total = total
+        self.imported = 0
+        self.errors: List[ImportRowError] = []
+
+    @property
+    def failed_rows(self) -> int:
+        return len({e.row for e in self.errors})
+
+    def summary(self) -> str:
+        text = f"Imported {self.imported} of {self.total} row(s)."
+        if self.errors:
+            text += f" {self.failed_rows} row(s) rejected."
+        return text
+
+    def write_report(self, path: str):
+        """Writes the per-row errors as CSV (row, field, error)."""
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["Row", "Field", "Error"])
+            for error in sorted(self.errors):
+                writer.writerow(error)
+
+
+def _text(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)  # Excel stores long digit strings as numbers
+    return str(value).strip()
+
+
+def _format_cnic(value: str) -> str:
+    digits = re.sub(r"\D", "", value)
+    if len(digits) == 13:
+        return f"{digits[:5]}-{digits[5:12]}-{digits[12]}"
+    return value
+
+
+def _format_phone(value: str) -> str:
+    digits = re.sub(r"\D", "", value)
+    if digits.startswith("92") and len(digits) == 12:
+        digits = "0" + digits[2:]
+    elif len(digits) == 10 and digits.startswith("3"):
+        digits = "0" + digits  # Leading zero lost in Excel
+    return digits
+
+
+def _chunks(items: List, size: int) -> Iterable[List]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class CustomerImportService:
+    """
+    Bulk import of customers and dealers from CSV or Excel.
+
+    Works on the whole batch at once rather than per row: every column is
+    cleaned and checked in one pass, business names are normalized together,
+    duplicates are found with a set for the file and one IN (...) query per
+    chunk for the database, and rows are inserted IMPORT_CHUNK_SIZE at a time
+    in their own transaction. Nothing is raised for bad rows; each problem is
+    reported against its spreadsheet row in the ImportResult.
+    """
+
+    def read_file(self, file_path: str) -> List[Optional[Dict[str, str]]]:
+        """Rows of a .csv/.xlsx file as dicts keyed by Customer column (None for blank rows)."""
+        ext = os.path.splitext(file_path)[1].lower()
+        if ext == ".csv":
+            with open(file_path, newline="", encoding="utf-8-sig") as f:
+                raw = list(csv.reader(f))
+        elif ext in (".xlsx", ".xlsm"):
+            import openpyxl
+
+            workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+            try:
+                raw = [list(row) for row in workbook.active.iter_rows(values_only=True)]
+            finally:
+                workbook.close()
+        else:
+            raise ValueError(f"Unsupported file type '{ext}'. Use CSV or Excel (.xlsx).")
+
+        if not raw:
+            return []
+        columns = [HEADER_ALIASES.get(_text(h).lower()) for h in raw[0]]
+        if "cnic" not in columns or "name" not in columns:
+            raise ValueError("The file needs at least 'CNIC' and 'Name' columns.")
+
+        rows = []
+        for values in raw[1:]:
+            row = {col: _text(v) for col, v in zip(columns, values) if col}
+            # Blank lines still count so errors point at the right row
+            rows.append(row if any(row.values()) else None)
+        return rows
+
+    def import_file(self, file_path: str, customer_type: Optional[str] = None,
+                    progress_callback: Optional[Callable[[int, int], None]] = None) -> ImportResult:
+        return self.import_rows(self.read_file(file_path), customer_type, progress_callback)
+
+    def import_rows(self, rows: List[Optional[Dict[str, str]]], customer_type: Optional[str] = None,
+                    progress_callback: Optional[Callable[[int, int], None]] = None) -> ImportResult:
+        """
+        Validates and inserts `rows`. customer_type forces every row's type;
+        otherwise a 'type' column is used and rows default to INDIVIDUAL.
+        """
+        result = ImportResult(sum(1 for row in rows if row))
+        records = self._clean(rows, customer_type)
+        valid = self._validate(records, result)
+        valid = self._drop_existing(valid, result)
+
+        done = 0
+        for chunk in _chunks(valid, IMPORT_CHUNK_SIZE):
+            result.imported += self._insert_chunk(chunk, result)
+            done += len(chunk)
+            if progress_callback:
+                progress_callback(done, len(valid))
+
+        logger.info(f"Customer import: {result.summary()}")
+        return result
+
+    # ---- Batch stages ----
+
+    def _clean(self, rows: List[Optional[Dict[str, str]]], customer_type: Optional[str]) -> List[Dict]:
+        # Column-wise normalization; row numbers count the header as row 1
+        forced = customer_type.value if hasattr(customer_type, "value") else customer_type
+        records = []
+        for number, row in enumerate(rows, start=2):
+            if row is None:
+                continue
+            kind = (forced or row.get("type") or CustomerType.INDIVIDUAL.value).strip().upper()
+            business = row.get("business_name", "").upper()
+            records.append({
+                "_row": number,
+                "type": kind,
+                "cnic": _format_cnic(row.get("cnic", "")),
+                "name": row.get("name", "").upper(),
+                "father_name": row.get("father_name", "").upper(),
+                "business_name": business or None,
+                "phone": _format_phone(row.get("phone", "")),
+                "address": row.get("address", "").upper(),
+                "ntn": row.get("ntn", "") or None,
+            })
+        # normalize_business_name over the whole batch in one pass (dealers only,
+        # matching DealerService.create_dealer)
+        names = [r["business_name"] if r["type"] == CustomerType.DEALER.value else None for r in records]
+        for record, normalized in zip(records, map(normalize_business_name, names)):
+            record["normalized_business_name"] = normalized or None
+        return records
+
+    def _validate(self, records: List[Dict], result: ImportResult) -> List[Dict]:
+        valid = []
+        seen_cnic: Dict[str, int] = {}
+        seen_business: Dict[str, int] = {}
+        for r in records:
+            errors = []
+            if r["type"] not in REQUIRED:
+                errors.append(("type", f"Unknown type '{r['type']}'. Use INDIVIDUAL or DEALER."))
+            else:
+                errors += [(field, "Required.") for field in REQUIRED[r["type"]] if not r[field]]
+                if r["phone"] and not PHONE_RE[r["type"]].match(r["phone"]):
+                    errors.append(("phone", f"Invalid phone '{r['phone']}'. Use 03XXXXXXXXX."))
+            if r["cnic"] and not CNIC_RE.match(r["cnic"]):
+                errors.append(("cnic", f"Invalid CNIC '{r['cnic']}'. Use XXXXX-XXXXXXX-X."))
+            if r["ntn"] and not NTN_RE.match(r["ntn"]):
+                errors.append(("ntn", f"Invalid NTN '{r['ntn']}'. Use XXXXXXX or XXXXXXX-X."))
+
+            # In-file duplicates: the first occurrence wins
+            if r["cnic"] in seen_cnic:
+                errors.append(("cnic", f"Duplicate CNIC; first seen on row {seen_cnic[r['cnic']]}."))
+            norm = r["normalized_business_name"]
+            if norm and norm in seen_business:
+                errors.append(("business_name", f"Duplicate business name; first seen on row {seen_business[norm]}."))
+
+            if errors:
+                result.errors += [ImportRowError(r["_row"], field, msg) for field, msg in errors]
+                continue
+            seen_cnic[r["cnic"]] = r["_row"]
+            if norm:
+                seen_business[norm] = r["_row"]
+            valid.append(r)
+        return valid
+
+    def _drop_existing(self, records: List[Dict], result: ImportResult) -> List[Dict]:
+        """Removes rows whose CNIC or business name is already in the database."""
+        cnics = [r["cnic"] for r in records]
+        names = [r["normalized_business_name"] for r in records if r["normalized_business_name"]]
+        db = SessionLocal()
+        try:
+            taken_cnics, taken_names = set(), set()
+            for chunk in _chunks(cnics, IMPORT_CHUNK_SIZE):
+                taken_cnics.update(c for (c,) in db.query(Customer.cnic).filter(Customer.cnic.in_(chunk)))
+            for chunk in _chunks(names, IMPORT_CHUNK_SIZE):
+                taken_names.update(n for (n,) in db.query(Customer.normalized_business_name).filter(
+                    Customer.normalized_business_name.in_(chunk)))
+        finally:
+            db.close()
+
+        kept = []
+        for r in records:
+            if r["cnic"] in taken_cnics:
+                result.errors.append(ImportRowError(r["_row"], "cnic", f"CNIC '{r['cnic']}' already exists."))
+            elif r["normalized_business_name"] in taken_names:
+                result.errors.append(ImportRowError(
+                    r["_row"], "business_name", f"Business Name '{r['business_name']}' already exists."))
+            else:
+                kept.append(r)
+        return kept
+
+    def _insert_chunk(self, chunk: List[Dict], result: ImportResult) -> int:
+        values = [{k: v for k, v in r.items() if k != "_row"} for r in chunk]
+        db = SessionLocal()
+        try:
+            try:
+                db.execute(insert(Customer), values)
+                db.commit()
+                inserted = chunk
+            except IntegrityError:
+                # Someone else took a CNIC/name since the check; find the row(s) one by one
+                db.rollback()
+                inserted = []
+                for record, row_values in zip(chunk, values):
+                    try:
+                        with db.begin_nested():
+                            db.execute(insert(Customer), [row_values])
+                        inserted.append(record)
+                    except IntegrityError as e:
+                        result.errors.append(ImportRowError(record["_row"], "cnic", f"Already exists: {e.orig}"))
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                logger.error(f"Customer import chunk failed: {e}")
+                result.errors += [ImportRowError(r["_row"], "", f"Database error: {e}") for r in chunk]
+                return 0
+
+            cnics = [r["cnic"] for r in inserted]
+            if cnics:
+                for customer in db.query(Customer).filter(Customer.cnic.in_(cnics)):
+                    customer_index.upsert(customer)
+                customer_service.invalidate_profile(*cnics)
+            return len(inserted)
+        finally:
+            db.close()
+
+
+customer_import_service = CustomerImportService()
@@ -1,11 +1,43 @@
 from sqlalchemy.orm import Session
-from app.db.session import SessionLocal
-from app.db.models import Customer, CustomerType
-from typing import List, Optional
+from app.db.session import ScopedSession
+from app.db.models import Customer, CustomerType, Invoice
+from app.services.search_index import customer_index
+from collections import OrderedDict
+from datetime import datetime
+from typing import List, NamedTuple, Optional
+import re
+import threading
+
+# CNIC profiles kept for autofill; regulars at a counter fit easily
+PROFILE_CACHE_SIZE = 512
+
+
+class CustomerProfile(NamedTuple):
+    """Buyer details used to autofill the invoice form from a CNIC."""
+    customer_id: int
+    cnic: str
+    name: Optional[str]
+    father_name: Optional[str]
+    phone: Optional[str]
+    address: Optional[str]
+    ntn: Optional[str]
+    last_invoice_number: Optional[str]
+
+
+def normalize_cnic(cnic: str) -> str:
+    """Digits only, so '35202-1234567-1' and '3520212345671' share a cache entry."""
+    return re.sub(r"\D", "", cnic or "")
+
 
 class CustomerService:
     def __init__(self):
-        self.db: Session = SessionLocal()
+        # Proxy to a per-thread session, safe to use from UI and worker threads
+        self.db = ScopedSession
+        # normalized CNIC -> CustomerProfile, or None for "no such customer"
+        self._profiles: "OrderedDict[str, Optional[CustomerProfile]]" = OrderedDict()
+        self._profile_lock = threading.Lock()
+        # Bumped by every invalidation so a lookup racing a write isn't cached
+        self._profile_version = 0
 
     def check_duplicate_cnic(self, cnic: str, exclude_id: int = None) -> bool:
         if not cnic:
@@ -34,6 +66,8 @@ class CustomerService:
             self.db.add(customer)
             self.db.commit()
             self.db.refresh(customer)
+            customer_index.upsert(customer)
+            self.invalidate_profile(cnic)
             return customer
         except Exception as e:
             self.db.rollback()
@@ -50,12 +84,76 @@ class CustomerService:
         """Get a customer by ID."""
         return self.db.query(Customer).filter(Customer.id == customer_id, Customer.is_deleted == False).first()
 
+    def get_customer_profile(self, cnic: str) -> Optional[CustomerProfile]:
+        """
+        Autofill details for a CNIC, from an LRU cache in front of the database.
+        Misses are cached too, so re-typing a new walk-in's CNIC doesn't requery.
+        Entries are dropped by invalidate_profile() whenever a customer or
+        invoice is written.
+        """
+        key = normalize_cnic(cnic)
+        if not key:
+            return None
+        with self._profile_lock:
+            if key in self._profiles:
+                self._profiles.move_to_end(key)
+                return self._profiles[key]
+            version = self._profile_version
+
+        profile = self._load_profile(key)
+        with self._profile_lock:
+            if version != self._profile_version:
+                return profile
+            self._profiles[key] = profile
+            self._profiles.move_to_end(key)
+            while len(self._profiles) > PROFILE_CACHE_SIZE:
+                self._profiles.popitem(last=False)
+        return profile
+
+    def _load_profile(self, key: str) -> Optional[CustomerProfile]:
+        # Stored CNICs are normally dashed; accept bare digits as well
+        candidates = [key]
+        if len(key) == 13:
+            candidates.append(f"{key[:5]}-{key[5:12]}-{key[12]}")
+        customer = self.db.query(Customer).filter(Customer.cnic.in_(candidates)).first()
+        if customer is None:
+            return None
+        # Served by ix_invoices_customer_id_id: one index seek, no sort
+        last_invoice = self.db.query(Invoice.invoice_number).filter(
+            Invoice.customer_id == customer.id
+        ).order_by(Invoice.id.desc()).first()
+        return CustomerProfile(
+            customer.id, customer.cnic, customer.name, customer.father_name, customer.phone,
+            customer.address, customer.ntn, last_invoice[0] if last_invoice else None
+        )
+
+    def invalidate_profile(self, *cnics: str):
+        """Drops cached profiles for the given CNICs, or all of them if none are given."""
+        with self._profile_lock:
+            self._profile_version += 1
+            if not cnics:
+                self._profiles.clear()
+                return
+            for cnic in cnics:
+                self._profiles.pop(normalize_cnic(cnic), None)
+
     def get_all_customers(self) -> List[Customer]:
         """Get all customers."""
         return self.db.query(Customer).filter(Customer.is_deleted == False).order_by(Customer.id.desc()).all()
 
-    def search_customers(self, query: str) -> List[Customer]:
-        """Search customers by name, cnic, or phone."""
+    def search_customers(self, query: str, limit: int = 50) -> List[Customer]:
+        """
+        Search customers by name, business name, cnic, or phone.
+
+        Served from the in-memory index once it has loaded (matches from the
+        start of a word or number). The database is used until then, and when
+        the index finds nothing, so a match in the middle of a value (e.g. the
+        last digits of a phone) still turns up.
+        """
+        if customer_index.ready:
+            results = customer_index.search_customers(query, limit)
+            if results:
+                return results
         search = f"%{query}%"
         return self.db.query(Customer).filter(
             Customer.is_deleted == False,
@@ -63,7 +161,7 @@ class CustomerService:
             (Customer.cnic.ilike(search)) |
             (Customer.phone.ilike(search)) |
             (Customer.business_name.ilike(search))
-        ).order_by(Customer.id.desc()).limit(50).all()
+        ).order_by(Customer.id.desc()).limit(limit).all()
 
     def update_customer(self, customer_id: int, cnic: str, name: str, father_name: str, phone: str, address: str, ntn: str = None, business_name: str = None, customer_type: str = CustomerType.INDIVIDUAL) -> Optional[Customer]:
         """Update an existing customer."""
@@ -72,6 +170,7 @@ class CustomerService:
 
         customer = self.get_customer_by_id(customer_id)
         if customer:
+            old_cnic = customer.cnic
             try:
                 customer.cnic = cnic
                 customer.name = (name or "").upper()
@@ -83,6 +182,8 @@ class CustomerService:
                 customer.type = customer_type
                 self.db.commit()
                 self.db.refresh(customer)
+                customer_index.upsert(customer)
+                self.invalidate_profile(old_cnic, cnic)
                 return customer
             except Exception as e:
                 self.db.rollback()
@@ -98,7 +199,10 @@ class CustomerService:
         if customer:
             try:
                 customer.is_deleted = True
+                customer.deleted_at = datetime.utcnow()
                 self.db.commit()
+                customer_index.remove(customer_id)
+                self.invalidate_profile(customer.cnic)
                 return True
             except Exception:
                 self.db.rollback()
@@ -114,9 +218,12 @@ class CustomerService:
             # Soft delete: update is_deleted = True
             result = self.db.query(Customer).filter(
                 Customer.id.in_(customer_ids)
-            ).update({Customer.is_deleted: True}, synchronize_session=False)
+            ).update({Customer.is_deleted: True, Customer.deleted_at: datetime.utcnow()}, synchronize_session=False)
             
             self.db.commit()
+            for customer_id in customer_ids:
+                customer_index.remove(customer_id)
+            self.invalidate_profile()
             return True, f"Successfully deleted {result} customer(s)."
         except Exception as e:
             self.db.rollback()
@@ -1,17 +1,20 @@
 from sqlalchemy.orm import Session
 from sqlalchemy import and_
-from app.db.session import SessionLocal
+from app.db.session import ScopedSession
 from app.db.models import Customer, CustomerType
 from typing import List, Optional
 import logging
 
+from app.services.customer_service import customer_service
+from app.services.search_index import customer_index
 from app.utils.string_utils import normalize_business_name
 
 logger = logging.getLogger(__name__)
 
 class DealerService:
     def __init__(self):
-        self.db: Session = SessionLocal()
+        # Proxy to a per-thread session, safe to use from UI and worker threads
+        self.db = ScopedSession
 
     def check_duplicate_dealer(self, business_name: str, cnic: str, exclude_id: int = None) -> Optional[str]:
         """
@@ -69,6 +72,8 @@ class DealerService:
             self.db.add(dealer)
             self.db.commit()
             self.db.refresh(dealer)
+            customer_index.upsert(dealer)
+            customer_service.invalidate_profile(cnic)
             return dealer
         except Exception as e:
             self.db.rollback()
@@ -87,9 +92,14 @@ class DealerService:
         ).first()
 
     def search_dealers_by_business_name(self, query: str, limit: int = 5) -> List[Customer]:
-        """Search dealers by business name (partial match)."""
+        """
+        Search dealers by business name (prefix match). Served from the
+        in-memory index once it has loaded, from the database until then.
+        """
         if not query:
             return []
+        if customer_index.ready:
+            return customer_index.search_dealers(query, limit)
         return self.db.query(Customer).filter(
             Customer.business_name.ilike(f"{query}%"),
             Customer.type == CustomerType.DEALER
@@ -118,6 +128,7 @@ class DealerService:
             Customer.type == CustomerType.DEALER
         ).first()
         if dealer:
+            old_cnic = dealer.cnic
             try:
                 dealer.cnic = cnic
                 dealer.name = (name or "").upper()
@@ -128,6 +139,8 @@ class DealerService:
                 dealer.address = (address or "").upper()
                 self.db.commit()
                 self.db.refresh(dealer)
+                customer_index.upsert(dealer)
+                customer_service.invalidate_profile(old_cnic, cnic)
                 return dealer
             except Exception as e:
                 self.db.rollback()
@@ -148,6 +161,8 @@ class DealerService:
         if dealer:
             self.db.delete(dealer)
             self.db.commit()
+            customer_index.remove(dealer_id)
+            customer_service.invalidate_profile(dealer.cnic)
             return True
         return False
 
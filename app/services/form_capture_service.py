@@ -1,13 +1,18 @@
+import asyncio
+import copy
 import json
 import time
 import threading
 import os
 import logging
 import queue
+from collections import deque
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
 from pathlib import Path
 from datetime import datetime
-from playwright.sync_api import sync_playwright, Page
 from app.services.captured_form_processor import CapturedFormProcessor
+from app.services.capture_journal import CaptureJournal
+from app.services.resource_policy import ResourcePolicy
 
 # Configure logging
 logging.basicConfig(
@@ -16,6 +21,21 @@ logging.basicConfig(
     format='%(asctime)s - %(levelname)s - %(message)s'
 )
 
+# Longest a caller waits on execute_task by default, so a wedged browser can't hang it forever
+DEFAULT_TASK_TIMEOUT = 1800
+# Upper bound on one idle wait of the browser loop; new tasks wake it immediately
+IDLE_PUMP_SECONDS = 0.5
+
+
+class _BrowserTask:
+    __slots__ = ("callback", "future", "enqueued_at")
+
+    def __init__(self, callback):
+        self.callback = callback
+        self.future = Future()
+        self.enqueued_at = time.perf_counter()
+
+
 class FormCaptureService:
     _instance = None
     _lock = threading.RLock()  # RLock to allow re-entrant locking (e.g. clear_data -> _save_data)
@@ -43,10 +63,18 @@ class FormCaptureService:
         self.pending_action = None # For thread-safe navigation
         self.pending_url = None
         self.task_queue = queue.Queue()
+        self._wake_event = None  # asyncio.Event on playwright's loop, set when work arrives
+        self._loop = None
+        # (queue wait, run time) in seconds of recent browser tasks
+        self.task_timings = deque(maxlen=200)
         
         self.load_config()
         self.processor = CapturedFormProcessor(self.config)
+        # Applied by the scraper around its tasks; the interactive session renders everything
+        self.resource_policy = ResourcePolicy.from_config(self.config)
         self._ensure_output_file()
+        # Field edits go to the journal; output_file holds the last compacted snapshot
+        self.journal = CaptureJournal(self.output_file.with_suffix('.journal'))
         logging.info(f"Output file path: {self.output_file.absolute()}")
         self._initialized = True
 
@@ -68,6 +96,7 @@ class FormCaptureService:
                 "target_domains": [],
                 "exclude_selectors": ["input[type='password']"],
                 "debounce_ms": 300,
+                "batch_window_ms": 50,
                 "output_file": "captured_forms.json"
             }
             # Save default config
@@ -89,6 +118,15 @@ class FormCaptureService:
         except Exception as e:
             logging.error(f"Failed to push login config to runtime: {e}")
 
+    def save_config(self):
+        """Writes the in-memory config (including values learned at runtime) back to disk."""
+        with self._lock:
+            try:
+                with open(self.config_path, 'w') as f:
+                    json.dump(self.config, f, indent=2)
+            except Exception as e:
+                logging.error(f"Failed to save capture config: {e}")
+
     def start_capture_session(self, url=None):
         if self.is_running:
             return
@@ -96,23 +134,42 @@ class FormCaptureService:
         self.is_running = True
         
         # Load existing data to preserve history
+        self.session_data = self._load_session_data()
+        
+        self.thread = threading.Thread(target=self._run_browser, args=(url,), daemon=True)
+        self.thread.start()
+
+    def _load_session_data(self):
+        """Last snapshot plus the journaled edits made after it (e.g. before a crash)."""
+        session_data = {"pages": {}}
         if self.output_file.exists():
             try:
                 with open(self.output_file, 'r') as f:
-                    self.session_data = json.load(f)
+                    session_data = json.load(f)
             except:
-                self.session_data = {"pages": {}}
-        else:
-            self.session_data = {"pages": {}}
-            
-        if "pages" not in self.session_data:
-            self.session_data["pages"] = {}
-        
-        self.thread = threading.Thread(target=self._run_browser, args=(url,), daemon=True)
-        self.thread.start()
+                session_data = {"pages": {}}
+        if "pages" not in session_data:
+            session_data["pages"] = {}
+
+        events = self.journal.replay()
+        for event in events:
+            page = session_data["pages"].setdefault(event["page"], {"fields": {}})
+            page.setdefault("fields", {})[event["selector"]] = event["data"]
+            page["last_updated"] = event.get("ts", time.time())
+
+        if events:
+            logging.info(f"Recovered {len(events)} journaled field edits.")
+            with self._lock:
+                self.session_data = session_data
+                self._save_data()
+        return session_data
 
     def stop_capture_session(self):
         self.is_running = False
+        # Shutdown is a safe point for a compacted snapshot
+        if self.session_data:
+            self._save_data()
+        self.journal.close()
         if self.browser:
             try:
                 self.browser.close()
@@ -136,33 +193,137 @@ class FormCaptureService:
             self._save_data()
             logging.info("Session data cleared by user request.")
 
-    def execute_task(self, callback):
+    def save_storage_state(self, path):
         """
-        Executes a callback in the browser thread.
-        Callback receives (page) as argument.
-        Returns the result of the callback.
+        Writes the session's cookies and local storage to `path` (Playwright storage
+        state) so another browser can reuse the login. Returns the active page's URL.
+        """
+        if not self.is_running:
+            raise RuntimeError("Browser is not running. Launch it and log in first.")
+
+        def task(page):
+            page.context.storage_state(path=str(path))
+            return page.url
+        return self.execute_task(task)
+
+    def submit_task(self, callback) -> Future:
+        """
+        Queues callback(page) for the browser thread and returns a Future for its
+        result. The browser loop is woken immediately; cancelling the future before
+        the task starts skips it. Starts the browser session if needed.
         """
         if not self.is_running:
             self.start_capture_session()
-            # Allow some time for thread start
-            time.sleep(1)
-            
-        result_queue = queue.Queue()
-        self.task_queue.put((callback, result_queue))
-        
-        result = result_queue.get()
-        if isinstance(result, Exception):
-            raise result
-        return result
+
+        task = _BrowserTask(callback)
+        if threading.current_thread() is self.thread:
+            # Called from inside a browser task: run inline instead of deadlocking on ourselves
+            self._run_task(task)
+            return task.future
+
+        self.task_queue.put(task)
+        self._wake()
+        return task.future
+
+    def execute_task(self, callback, timeout=DEFAULT_TASK_TIMEOUT):
+        """
+        Executes a callback in the browser thread.
+        Callback receives (page) as argument.
+        Returns the result of the callback; raises TimeoutError after `timeout` seconds.
+        """
+        future = self.submit_task(callback)
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise TimeoutError(f"Browser task did not finish within {timeout}s")
+
+    def _wake(self):
+        loop, event = self._loop, self._wake_event
+        if loop is not None and event is not None:
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                pass  # loop already closed
+
+    def _run_task(self, task):
+        if not task.future.set_running_or_notify_cancel():
+            return
+        started = time.perf_counter()
+        try:
+            task.future.set_result(task.callback(self.page))
+        except Exception as task_ex:
+            task.future.set_exception(task_ex)
+        finished = time.perf_counter()
+        queue_wait, run_time = started - task.enqueued_at, finished - started
+        self.task_timings.append((queue_wait, run_time))
+        logging.debug(f"Browser task {getattr(task.callback, '__name__', 'task')}: queued {queue_wait * 1000:.1f} ms, ran {run_time * 1000:.1f} ms")
+
+    def _run_pending_tasks(self):
+        while True:
+            try:
+                task = self.task_queue.get_nowait()
+            except queue.Empty:
+                return
+            self._run_task(task)
+
+    def _fail_pending_tasks(self):
+        while True:
+            try:
+                task = self.task_queue.get_nowait()
+            except queue.Empty:
+                return
+            if task.future.set_running_or_notify_cancel():
+                task.future.set_exception(RuntimeError("Browser session stopped before the task ran"))
+
+    def task_stats(self):
+        """Median and worst queue wait / run time (ms) over recent browser tasks."""
+        timings = list(self.task_timings)
+        if not timings:
+            return {"tasks": 0}
+        waits = sorted(t[0] for t in timings)
+        runs = sorted(t[1] for t in timings)
+        return {
+            "tasks": len(timings),
+            "queue_wait_ms_p50": waits[len(waits) // 2] * 1000,
+            "queue_wait_ms_max": waits[-1] * 1000,
+            "run_ms_p50": runs[len(runs) // 2] * 1000,
+            "run_ms_max": runs[-1] * 1000,
+        }
+
+    def _pump(self, page, timeout):
+        """
+        Lets playwright dispatch browser events (py_capture calls, popups) for up to
+        `timeout` seconds, returning early as soon as a task is submitted.
+        """
+        sync = getattr(self.playwright, "_sync", None)
+        if sync is None or self._wake_event is None:
+            page.wait_for_timeout(timeout * 1000)
+            return
+
+        async def idle():
+            try:
+                await asyncio.wait_for(self._wake_event.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+        sync(idle())
 
     def _run_browser(self, start_url):
         self.start_url = start_url
+        # Imported here so loading this module (and the UI) doesn't pay for playwright
+        from playwright.sync_api import sync_playwright
         try:
             with sync_playwright() as p:
                 self.playwright = p
+                self._loop = getattr(p, "_loop", None)
+                self._wake_event = asyncio.Event() if self._loop is not None else None
                 self.browser = p.chromium.launch(headless=False)
                 self.context = self.browser.new_context()
                 
+                # Learn what images/fonts/scripts actually cost, for the scrape savings estimate
+                self.resource_policy.observe(self.context)
+
                 # Expose binding to Python
                 self.context.expose_binding("py_capture", self._handle_captured_data)
                 
@@ -227,17 +388,10 @@ class FormCaptureService:
                 # Keep the browser open until stopped
                 while self.is_running:
                     try:
-                        # Process Task Queue
-                        try:
-                            while not self.task_queue.empty():
-                                task, result_q = self.task_queue.get_nowait()
-                                try:
-                                    res = task(self.page)
-                                    result_q.put(res)
-                                except Exception as task_ex:
-                                    result_q.put(task_ex)
-                        except queue.Empty:
-                            pass
+                        # Clear before draining: anything submitted after this wakes the next pump
+                        if self._wake_event is not None:
+                            self._wake_event.clear()
+                        self._run_pending_tasks()
 
                         # Check pending actions
                         if self.pending_action:
@@ -259,8 +413,7 @@ class FormCaptureService:
                         if len(pages) > 0:
                             try:
                                 # Use the last page (active) to pump the event loop
-                                # Reduced timeout for better task responsiveness
-                                pages[-1].wait_for_timeout(100) 
+                                self._pump(pages[-1], IDLE_PUMP_SECONDS)
                             except Exception:
                                 # If page closes during wait, fallback to short sleep
                                 time.sleep(0.1)
@@ -275,16 +428,21 @@ class FormCaptureService:
             print(f"Playwright error: {e}")
         finally:
             self.is_running = False
+            self._wake_event = None
+            self._loop = None
+            self._fail_pending_tasks()
 
     def _handle_captured_data(self, source, data):
         """Callback for window.py_capture(data)"""
         try:
-            # DEBUG RAW DATA
-            try:
-                with open("save_debug.txt", "a") as f:
-                    f.write(f"RAW DATA: {data}\n")
-            except:
-                pass
+            # Field edits arrive coalesced, one batch per browser frame
+            if data.get("type") == "batch":
+                events = data.get("events") or []
+                logging.info(f"Captured batch of {len(events)} field events")
+                page_url = self._source_page_url(source)
+                for event in events:
+                    self._record_field(page_url, event)
+                return
 
             logging.info(f"Captured Data Received: {data}")
             
@@ -297,19 +455,20 @@ class FormCaptureService:
                 if forced_data:
                     logging.info(f"Merging {len(forced_data)} forced capture fields...")
                     page_url = data.get("url", "unknown_url")
-                    
-                    if page_url not in self.session_data["pages"]:
-                        self.session_data["pages"][page_url] = {"fields": {}}
-                    
-                    for selector, value in forced_data.items():
-                        self.session_data["pages"][page_url]["fields"][selector] = {
-                            "value": value,
-                            "timestamp": time.time(),
-                            "type": "forced"
-                        }
-                    
-                    # Save merged state for debugging
-                    self._save_data()
+
+                    with self._lock:
+                        if page_url not in self.session_data["pages"]:
+                            self.session_data["pages"][page_url] = {"fields": {}}
+
+                        for selector, value in forced_data.items():
+                            self.session_data["pages"][page_url]["fields"][selector] = {
+                                "value": value,
+                                "timestamp": time.time(),
+                                "type": "forced"
+                            }
+
+                        # Save merged state for debugging
+                        self._save_data()
 
                     # METRIC: Check capture completeness for dashboard
                     eng_present = 1 if forced_data.get("#txt_engine_no") else 0
@@ -317,64 +476,80 @@ class FormCaptureService:
                     mod_present = 1 if forced_data.get("#txt_model") else 0
                     logging.info(f"METRIC:CAPTURE_QUALITY:engine={eng_present},color={col_present},model={mod_present}")
 
-                success = self.processor.process_submission(self.session_data)
-                if success:
-                    logging.info("Invoice saved successfully. Clearing session data.")
-                    self.clear_session_data()
-                    
-                    logging.info("Submission captured. Waiting for next action.")
-                    # Removed forced reload to allow validation checks on page
-
-                        
+                # Written by the processor's writer thread; the browser doesn't wait on the DB
+                with self._lock:
+                    submitted = copy.deepcopy(self.session_data)
+                queued = self.processor.submit(
+                    submitted,
+                    on_done=lambda record, error: self._on_submission_written(submitted, record, error)
+                )
+                if queued:
+                    logging.info("Submission captured and queued for saving. Waiting for next action.")
                 return
 
-            # Robust Page URL retrieval
-            page_url = "unknown_url"
-            try:
-                if hasattr(source, "page") and source.page:
-                    page_url = source.page.url
-                elif isinstance(source, dict) and "page" in source:
-                    page_url = source["page"].url
-                elif self.page:
-                    page_url = self.page.url
-            except Exception as e:
-                logging.error(f"Error getting page URL (using fallback): {e}")
-
-            # Initialize page entry if not exists
-            if page_url not in self.session_data["pages"]:
-                self.session_data["pages"][page_url] = {
-                    "last_updated": time.time(),
-                    "fields": {}
-                }
-            
-            # Update data
-            selector = data.get("selector")
-            if selector:
-                self.session_data["pages"][page_url]["fields"][selector] = data
-                self.session_data["pages"][page_url]["last_updated"] = time.time()
-                
-                logging.info(f"Data updated in memory for {page_url}. Calling _save_data()...")
-                self._save_data()
-            else:
-                logging.warning(f"No selector in captured data: {data}")
+            self._record_field(self._source_page_url(source), data)
                 
         except Exception as e:
             logging.error(f"Error handling captured data: {e}")
 
+    def _on_submission_written(self, submitted, record, error):
+        """Writer-thread callback: drops the submitted fields from the session once saved"""
+        if error:
+            logging.error(f"Captured submission for chassis {record.get('chassis_number')} not saved: {error}")
+            return
+        logging.info("Invoice saved successfully. Clearing submitted session data.")
+        with self._lock:
+            # Keep anything edited after the submit (e.g. the next form already being filled)
+            for page_url, page in submitted.get("pages", {}).items():
+                current = self.session_data.get("pages", {}).get(page_url)
+                if not current:
+                    continue
+                fields = current.get("fields", {})
+                for selector, value in page.get("fields", {}).items():
+                    if fields.get(selector) == value:
+                        del fields[selector]
+                if not fields:
+                    del self.session_data["pages"][page_url]
+            self._save_data()
+
+    def _source_page_url(self, source):
+        """Robust Page URL retrieval for a binding call"""
+        try:
+            if hasattr(source, "page") and source.page:
+                return source.page.url
+            elif isinstance(source, dict) and "page" in source:
+                return source["page"].url
+            elif self.page:
+                return self.page.url
+        except Exception as e:
+            logging.error(f"Error getting page URL (using fallback): {e}")
+        return "unknown_url"
+
+    def _record_field(self, page_url, data):
+        """Stores one captured field value and journals it"""
+        selector = data.get("selector")
+        if not selector:
+            logging.warning(f"No selector in captured data: {data}")
+            return
+
+        now = time.time()
+        # The writer thread prunes and snapshots session_data under the same lock
+        with self._lock:
+            page = self.session_data["pages"].setdefault(page_url, {"fields": {}})
+            page["fields"][selector] = data
+            page["last_updated"] = now
+
+            # Written behind by the journal thread; the browser thread doesn't wait on disk
+            self.journal.append({"page": page_url, "selector": selector, "data": data, "ts": now})
+
     def _save_data(self):
-        """Persist data to JSON file"""
+        """Persist a compacted snapshot to the JSON file and empty the journal"""
         with self._lock:
+            journal_mark = self.journal.mark()
             # Retry mechanism for Windows file locking issues
             max_retries = 5
             for attempt in range(max_retries):
                 try:
-                    # Direct debug write
-                    try:
-                        with open("save_debug.txt", "a") as dbg:
-                            dbg.write(f"{datetime.now()}: Attempting save (try {attempt+1}). Pages: {len(self.session_data.get('pages', {}))}\n")
-                    except:
-                        pass
-
                     logging.info(f"Saving data to {self.output_file}")
                     
                     # Ensure directory exists
@@ -395,6 +570,7 @@ class FormCaptureService:
                             temp_file.rename(self.output_file)
                         
                         logging.info("File saved successfully.")
+                        self.journal.reset(journal_mark)
                         return # Success, exit loop
                         
                     except OSError as e:
@@ -424,6 +600,7 @@ class FormCaptureService:
     def _get_injection_script(self):
         """Returns the JavaScript code to inject"""
         debounce_ms = self.config.get("debounce_ms", 300)
+        batch_window_ms = self.config.get("batch_window_ms", 50)
         exclude_selectors = json.dumps(self.config.get("exclude_selectors", []))
         include_selectors = json.dumps(self.config.get("include_selectors", []))
         submit_selector = self.config.get("submit_selector", "button[type='submit']")
@@ -433,6 +610,7 @@ class FormCaptureService:
         return f"""
         (function() {{
             const DEBOUNCE_MS = {debounce_ms};
+            const BATCH_WINDOW_MS = {batch_window_ms};
             const EXCLUDE_SELECTORS = {exclude_selectors};
             const INCLUDE_SELECTORS = {include_selectors};
             const SUBMIT_SELECTOR = "{submit_selector}";
@@ -441,6 +619,61 @@ class FormCaptureService:
             
             let timeouts = {{}};
 
+            // -----------------------------------------------------------
+            // EVENT BUFFER: one py_capture call per frame, latest value per selector
+            // -----------------------------------------------------------
+            const pendingEvents = new Map();
+            let flushQueued = false;
+            let rescanTimer = null;
+
+            function queueCapture(data) {{
+                pendingEvents.set(data.selector, data);
+                scheduleFlush();
+            }}
+
+            function scheduleFlush() {{
+                if (flushQueued) return;
+                flushQueued = true;
+                // Next frame, or the batch window if frames are throttled (background tab)
+                let done = false;
+                const run = () => {{
+                    if (done) return;
+                    done = true;
+                    flushCaptures();
+                }};
+                if (typeof requestAnimationFrame === 'function' && document.visibilityState === 'visible') {{
+                    requestAnimationFrame(run);
+                }}
+                setTimeout(run, BATCH_WINDOW_MS);
+            }}
+
+            // Re-checks whitelisted elements after something changed (replaces the old 2s poll).
+            // At most once per DEBOUNCE_MS on busy pages, never on idle ones.
+            function scheduleRescan() {{
+                if (rescanTimer) return;
+                rescanTimer = setTimeout(() => {{
+                    rescanTimer = null;
+                    try {{
+                        scanWhitelistedElements();
+                    }} catch (e) {{
+                        console.error("Error scanning whitelisted elements:", e);
+                    }}
+                }}, DEBOUNCE_MS);
+            }}
+
+            function flushCaptures() {{
+                flushQueued = false;
+                if (pendingEvents.size === 0) return;
+
+                const events = Array.from(pendingEvents.values());
+                pendingEvents.clear();
+                if (window.py_capture) {{
+                    window.py_capture({{ type: 'batch', events: events }});
+                }} else {{
+                    console.error("py_capture binding not found!");
+                }}
+            }}
+
             function tryPrefillLogin() {{
                 try {{
                     if (!LOGIN_CONFIG) return false;
@@ -597,13 +830,8 @@ class FormCaptureService:
                         timestamp: Date.now() / 1000
                     }};
                     
-                    // Send to Python
-                    if (window.py_capture) {{
-                        window.py_capture(data);
-                        // console.log("Sent to Python:", data);
-                    }} else {{
-                        console.error("py_capture binding not found!");
-                    }}
+                    // Sent to Python with the next batch
+                    queueCapture(data);
                     
                     // Visual Feedback (Safe)
                     try {{
@@ -638,6 +866,10 @@ class FormCaptureService:
                                 capture(e.target, event);
                             }}
                         }}
+                        // Page scripts often fill dependent fields (e.g. name after CNIC) on input/change
+                        if (event === 'input' || event === 'change') {{
+                            scheduleRescan();
+                        }}
                     }} catch (err) {{
                         // console.error("Error in event listener:", err);
                     }}
@@ -681,7 +913,7 @@ class FormCaptureService:
                 const observer = new MutationObserver((mutations) => {{
                     mutations.forEach((mutation) => {{
                         // Ignore our own visual feedback changes to avoid infinite loops
-                        if (mutation.type === 'attributes' && (mutation.attributeName === 'style' || mutation.attributeName === 'data-captured' || mutation.attributeName === 'class')) {{
+                        if (mutation.type === 'attributes' && (mutation.attributeName === 'style' || mutation.attributeName === 'data-captured' || mutation.attributeName === 'class' || mutation.attributeName === 'title')) {{
                             return;
                         }}
 
@@ -691,20 +923,50 @@ class FormCaptureService:
                         if (target && isIncluded(target)) {{
                             debouncedCapture(target, 'mutation');
                         }}
+                        // Label-only views and whitelisted selectors may have appeared
+                        scheduleRescan();
                     }});
                 }});
                 
-                // Only observe if body exists (wait for load usually, but this script injects after load)
-                if (document.body) {{
+                const observeBody = () => {{
                     observer.observe(document.body, {{ 
                         subtree: true, 
                         childList: true, 
                         characterData: true,
                         attributes: true,
                     }});
+                }};
+                // As an init script this runs before <body> exists
+                if (document.body) {{
+                    observeBody();
+                }} else {{
+                    document.addEventListener('DOMContentLoaded', observeBody);
                 }}
             }}
 
+            // Values set from page scripts (el.value = ..., jQuery .val()) fire no events or mutations
+            [window.HTMLInputElement, window.HTMLTextAreaElement, window.HTMLSelectElement].forEach(cls => {{
+                try {{
+                    if (!cls) return;
+                    const desc = Object.getOwnPropertyDescriptor(cls.prototype, 'value');
+                    if (!desc || !desc.set || desc.set.__fbrHooked) return;
+                    const hookedSet = function(v) {{
+                        desc.set.call(this, v);
+                        scheduleRescan();
+                    }};
+                    hookedSet.__fbrHooked = true;
+                    Object.defineProperty(cls.prototype, 'value', {{ ...desc, set: hookedSet }});
+                }} catch (e) {{
+                    console.error("FBR Capture: value hook error", e);
+                }}
+            }});
+
+            // Don't lose the last buffered edits when the page goes away
+            window.addEventListener('pagehide', flushCaptures);
+            document.addEventListener('visibilitychange', () => {{
+                if (document.visibilityState === 'hidden') flushCaptures();
+            }});
+
             // -----------------------------------------------------------
             // JQUERY / SELECT2 HOOKS
             // -----------------------------------------------------------
@@ -724,7 +986,7 @@ class FormCaptureService:
             }}
 
             // -----------------------------------------------------------
-            // ACTIVE POLLING (Safety Net for missed events)
+            // RESCAN (Safety Net for missed events, run on change instead of a timer)
             // -----------------------------------------------------------
             const previousValues = {{}};
 
@@ -830,7 +1092,7 @@ class FormCaptureService:
                                     // Check if value is new
                                     if (previousValues[strategy.selector] !== val) {{
                                         console.log(`[Label Inference] MATCH: '${{strategy.label}}' -> '${{val}}' via ${{method}}`);
-                                        if (window.py_capture) window.py_capture(data);
+                                        queueCapture(data);
                                         previousValues[strategy.selector] = val;
                                         
                                         // Visual feedback restored
@@ -849,7 +1111,7 @@ class FormCaptureService:
                 }});
             }}
 
-            function pollWhitelistedElements() {{
+            function scanWhitelistedElements() {{
                 // 1. Standard Selectors
                 INCLUDE_SELECTORS.forEach(selector => {{
                     const els = document.querySelectorAll(selector);
@@ -862,8 +1124,8 @@ class FormCaptureService:
                         if (previousValues[key] !== val) {{
                             // Value changed!
                             if (previousValues[key] !== undefined) {{ // Don't fire on initial load unless you want to
-                                console.log(`Polling detected change in ${{selector}}`);
-                                capture(el, 'poll');
+                                console.log(`Rescan detected change in ${{selector}}`);
+                                capture(el, 'rescan');
                             }}
                             previousValues[key] = val;
                         }}
@@ -873,9 +1135,7 @@ class FormCaptureService:
                 // 2. Label Inference
                 captureByLabels();
             }}
-            
-            // Poll every 2 seconds
-            setInterval(pollWhitelistedElements, 2000);
+
 
             // Initial Capture of whitelisted elements (Fix for static TD elements)
             setTimeout(() => {{
@@ -892,6 +1152,7 @@ class FormCaptureService:
                         previousValues[key] = val;
                     }});
                 }});
+                captureByLabels();
             }}, 1000);
 
             // -----------------------------------------------------------
@@ -1211,6 +1472,9 @@ class FormCaptureService:
                 
                 validateData(currentData);
 
+                // Field edits still buffered must reach Python before the submission
+                flushCaptures();
+
                 if (window.py_capture) {{
                     window.py_capture({{
                         type: 'form_submission',
@@ -6,6 +6,8 @@ from app.api.schemas import InvoiceCreate
 from app.api.fbr_client import fbr_client
 from app.core.logger import logger
 from app.services.captured_data_service import captured_data_service
+from app.services.customer_service import customer_service
+from app.services.search_index import customer_index
 from datetime import datetime
 from typing import Optional
 import json
@@ -138,6 +140,7 @@ class InvoiceService:
             if invoice_in.buyer_address: customer.address = invoice_in.buyer_address.upper()
             # Reactivate if they were deleted
             customer.is_deleted = False
+            customer.deleted_at = None
         else:
             # Create new
             customer = Customer(
@@ -192,6 +195,8 @@ class InvoiceService:
             
             db.commit()
             db.refresh(db_invoice)
+            customer_index.upsert(customer)
+            customer_service.invalidate_profile(customer.cnic)
             return db_invoice
 
         except Exception as e:
@@ -202,6 +207,8 @@ class InvoiceService:
                  logger.info("Saving invoice locally due to sync failure.")
                  db.commit()
                  db.refresh(db_invoice)
+                 customer_index.upsert(customer)
+                 customer_service.invalidate_profile(customer.cnic)
                  return db_invoice
             else:
                  db.rollback()
@@ -325,8 +332,9 @@ class InvoiceService:
         """
         Finds the most recent invoice for a given CNIC to auto-populate customer details.
         """
-        # Join Customer to filter by CNIC
-        return db.query(Invoice).join(Customer).filter(Customer.cnic == cnic).order_by(Invoice.id.desc()).first()
+        # Resolve the customer first so the lookup uses ix_invoices_customer_id_id
+        customer_id = db.query(Customer.id).filter(Customer.cnic == cnic).scalar_subquery()
+        return db.query(Invoice).filter(Invoice.customer_id == customer_id).order_by(Invoice.id.desc()).first()
 
     def generate_next_invoice_number(self, db: Session) -> str:
         """
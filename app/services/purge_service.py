@@ -0,0 +1,140 @@
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from sqlalchemy import exists, or_, text
+
+from app.core import config
+from app.db.models import CapturedData, Customer, CustomerMergeSuggestion, Invoice
+from app.db.session import SessionLocal
+from app.services.customer_service import customer_service
+
+logger = logging.getLogger(__name__)
+
+# Rows hard deleted per transaction
+PURGE_BATCH_SIZE = 500
+# Pause between batches so the UI's own writes aren't queued behind the purge
+BATCH_PAUSE_SECONDS = 0.05
+# First run waits for startup to settle
+STARTUP_DELAY_SECONDS = 120
+
+
+class PurgeService:
+    """
+    Hard deletes soft-deleted customers and captured rows once their
+    deleted_at is older than PURGE_RETENTION_DAYS, keeping the live tables
+    (and the is_deleted = 0 indexes) small.
+
+    Work is done in PURGE_BATCH_SIZE chunks, each its own short transaction.
+    Customers still referenced by an invoice are never purged.
+    """
+
+    def __init__(self):
+        self._schedule_stop: Optional[threading.Event] = None
+        self._schedule_thread: Optional[threading.Thread] = None
+
+    def purge(self, retention_days: Optional[int] = None, batch_size: int = PURGE_BATCH_SIZE) -> Dict[str, int]:
+        """Runs one purge pass; returns rows removed per table."""
+        if retention_days is None:
+            retention_days = config.settings.PURGE_RETENTION_DAYS
+        if retention_days <= 0:
+            return {}
+        cutoff = datetime.utcnow() - timedelta(days=retention_days)
+
+        counts = {
+            "customers": self._purge_batches(
+                Customer, cutoff, batch_size,
+                ~exists().where(Invoice.customer_id == Customer.id),
+                before_delete=self._drop_merge_suggestions,
+            ),
+            "captured_data": self._purge_batches(CapturedData, cutoff, batch_size),
+        }
+        if counts["customers"]:
+            # Profiles are cached for deleted customers too
+            customer_service.invalidate_profile()
+        if any(counts.values()):
+            self._compact()
+        logger.info(f"Purged soft-deleted rows older than {retention_days} days: {counts}")
+        return counts
+
+    def _purge_batches(self, model, cutoff, batch_size, *criteria, before_delete=None) -> int:
+        total = 0
+        while True:
+            db = SessionLocal()
+            try:
+                # Oldest first through the is_deleted = 1 / deleted_at index
+                ids = [row_id for (row_id,) in db.query(model.id).filter(
+                    model.is_deleted == True, model.deleted_at < cutoff, *criteria
+                ).order_by(model.deleted_at).limit(batch_size)]
+                if ids:
+                    if before_delete:
+                        before_delete(db, ids)
+                    db.query(model).filter(model.id.in_(ids)).delete(synchronize_session=False)
+                    db.commit()
+            except Exception as e:
+                db.rollback()
+                logger.error(f"Purge of {model.__tablename__} failed: {e}")
+                return total
+            finally:
+                db.close()
+
+            total += len(ids)
+            if len(ids) < batch_size:
+                return total
+            time.sleep(BATCH_PAUSE_SECONDS)
+
+    def _drop_merge_suggestions(self, db, customer_ids):
+        db.query(CustomerMergeSuggestion).filter(or_(
+            CustomerMergeSuggestion.primary_id.in_(customer_ids),
+            CustomerMergeSuggestion.duplicate_id.in_(customer_ids),
+        )).delete(synchronize_session=False)
+
+    def _compact(self):
+        # Refresh planner stats after a large delete; SQLite only, and cheap
+        # (a full VACUUM would lock the database for too long)
+        db = SessionLocal()
+        try:
+            if db.get_bind().dialect.name == "sqlite":
+                db.execute(text("PRAGMA optimize"))
+        except Exception as e:
+            logger.warning(f"Post-purge optimize failed: {e}")
+        finally:
+            db.close()
+
+    # ---- Schedule ----
+
+    def start_schedule(self, interval_hours: float):
+        """Purges shortly after startup and then every `interval_hours` until stop_schedule()."""
+        self.stop_schedule()
+        stop = threading.Event()
+
+        def loop():
+            delay = STARTUP_DELAY_SECONDS
+            while not stop.wait(delay):
+                try:
+                    self.purge()
+                except Exception as e:
+                    logger.error(f"Scheduled purge failed: {e}")
+                delay = interval_hours * 3600
+
+        self._schedule_stop = stop
+        self._schedule_thread = threading.Thread(target=loop, daemon=True, name="purge-schedule")
+        self._schedule_thread.start()
+
+    def stop_schedule(self):
+        if self._schedule_stop:
+            self._schedule_stop.set()
+        self._schedule_stop = None
+        self._schedule_thread = None
+
+    def start_configured_schedule(self) -> bool:
+        """Starts the schedule from PURGE_RETENTION_DAYS / PURGE_INTERVAL_HOURS, if enabled."""
+        if config.settings.PURGE_RETENTION_DAYS <= 0 or config.settings.PURGE_INTERVAL_HOURS <= 0:
+            return False
+        self.start_schedule(config.settings.PURGE_INTERVAL_HOURS)
+        return True
+
+
+purge_service = PurgeService()
@@ -0,0 +1,88 @@
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from sqlalchemy import or_
+from sqlalchemy.orm import Query, Session, joinedload
+
+from app.db.models import Customer, Invoice, InvoiceItem, Motorcycle
+
+
+class ReportService:
+    """Queries behind the Reports screen, shared with the benchmarks."""
+
+    def sales_query(
+        self,
+        db: Session,
+        status_filter: str = "All",
+        search_text: str = "",
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> Query:
+        """Invoices for the sales report, newest first, with items and motorcycles loaded."""
+        query = db.query(Invoice).join(Customer).options(
+            joinedload(Invoice.items).joinedload(InvoiceItem.motorcycle)
+        ).order_by(Invoice.datetime.desc())
+
+        if start_date:
+            query = query.filter(Invoice.datetime >= start_date)
+        if end_date:
+            query = query.filter(Invoice.datetime <= end_date)
+
+        if search_text:
+            search = f"%{search_text}%"
+            query = query.outerjoin(Invoice.items).outerjoin(InvoiceItem.motorcycle).filter(
+                or_(
+                    Invoice.invoice_number.ilike(search),
+                    Customer.name.ilike(search),
+                    Customer.cnic.ilike(search),
+                    Motorcycle.chassis_number.ilike(search),
+                    Motorcycle.engine_number.ilike(search)
+                )
+            )
+
+        if status_filter == "Synced":
+            query = query.filter(Invoice.is_fiscalized == True)
+        elif status_filter == "Pending":
+            query = query.filter(Invoice.is_fiscalized == False, Invoice.sync_status != "FAILED")
+        elif status_filter == "Failed":
+            query = query.filter(Invoice.sync_status == "FAILED")
+
+        return query
+
+    def sales_rows(self, invoices: List[Invoice]) -> List[Tuple]:
+        """Sales tree rows: (date, invoice number, buyer, chassis, engine, amount, status)."""
+        rows = []
+        for inv in invoices:
+            date_str = inv.datetime.strftime("%Y-%m-%d %H:%M")
+
+            # Determine Status (its tag is the lower-cased status)
+            if inv.is_fiscalized:
+                status = "Synced"
+            elif inv.sync_status == "FAILED":
+                status = "Failed"
+            else:
+                status = "Pending"
+
+            buyer_name = inv.customer.name if inv.customer else "N/A"
+
+            # Get chassis and engine numbers
+            chassis_list = []
+            engine_list = []
+            for item in inv.items:
+                if item.motorcycle:
+                    chassis_list.append(item.motorcycle.chassis_number or "")
+                    engine_list.append(item.motorcycle.engine_number or "")
+
+            rows.append((
+                date_str,
+                inv.invoice_number,
+                buyer_name,
+                ", ".join(filter(None, chassis_list)),
+                ", ".join(filter(None, engine_list)),
+                f"{inv.total_amount:,.2f}",
+                status
+            ))
+        return rows
+
+
+report_service = ReportService()
@@ -0,0 +1,205 @@
+import base64
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RESOURCE_POLICY = {
+    "enabled": True,
+    # Playwright resource types that are never needed to read the stock table
+    "block_resource_types": ["image", "media", "font"],
+    # Of the blocked types, these get a tiny placeholder instead of a network error,
+    # so pages waiting on img.onload still settle
+    "stub_resource_types": ["image"],
+    # Analytics/ads: scripts are answered with an empty body, everything else aborted
+    "blocked_domains": [
+        "google-analytics.com", "googletagmanager.com", "doubleclick.net",
+        "facebook.net", "facebook.com", "hotjar.com", "clarity.ms",
+    ],
+    # When true, any request outside the portal's own domain (and allowed_domains) is blocked
+    "block_third_party": False,
+    "allowed_domains": [],
+    # Used until enough real requests of a type have been sampled
+    "estimated_bytes": {"image": 40000, "media": 500000, "font": 60000, "script": 30000, "other": 5000},
+    "estimated_ms": {"image": 250, "media": 1500, "font": 300, "script": 250, "other": 100},
+}
+
+# 1x1 transparent GIF
+PLACEHOLDER_GIF = base64.b64decode("R0lGODlhAQABAIAAAAAAAP///yH5BAEAAAAALAAAAAABAAEAAAIBRAA7")
+
+SAMPLE_LIMIT = 20
+
+
+def _domain_matches(host: str, domain: str) -> bool:
+    return host == domain or host.endswith("." + domain)
+
+
+def _site_of(host: str) -> str:
+    """Rough registrable domain: the last two labels (dealers.ahlportal.com -> ahlportal.com)."""
+    parts = host.split(".")
+    return ".".join(parts[-2:]) if len(parts) > 2 else host
+
+
+class ResourcePolicy:
+    """
+    Blocks or stubs heavy resources while scraper tasks run.
+
+    The interactive capture session renders normally: the route is only installed
+    on the scraper's own page (and tabs it opens via `route_page()`), and only for
+    the duration of `applied()`, so other tabs of the same browser context are
+    never affected. Savings are estimated from the sizes and
+    timings of the same resource types when they were loaded normally (sampled
+    via `observe()`), falling back to `estimated_bytes`/`estimated_ms`.
+    """
+
+    def __init__(self, policy: Dict = None):
+        self.policy = {**DEFAULT_RESOURCE_POLICY, **(policy or {})}
+        self._lock = threading.Lock()
+        self._first_party: Optional[str] = None
+        self._samples: Dict[str, Dict[str, float]] = {}
+        self._sampling_context = None
+        self.reset_stats()
+
+    @classmethod
+    def from_config(cls, config: Dict) -> "ResourcePolicy":
+        return cls(config.get("resource_policy"))
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.policy.get("enabled"))
+
+    def reset_stats(self):
+        with self._lock:
+            self._stats = {"blocked": {}, "stubbed": {}, "allowed": 0}
+
+    # ---- Sampling real costs (interactive session) ----
+
+    def observe(self, context):
+        """Samples body size and duration of finished requests until each type has enough."""
+        self._sampling_context = context
+        context.on("requestfinished", self._sample)
+
+    def _sample(self, request):
+        rtype = request.resource_type
+        tracked = set(self.policy["block_resource_types"]) | {"script"}
+        if rtype not in tracked:
+            return
+        with self._lock:
+            sample = self._samples.setdefault(rtype, {"count": 0, "bytes": 0, "ms": 0.0})
+            if sample["count"] >= SAMPLE_LIMIT:
+                return
+        try:
+            size = request.sizes().get("responseBodySize", 0)
+            timing = request.timing
+            duration = max(0.0, timing.get("responseEnd", -1))
+        except Exception:
+            return
+        with self._lock:
+            sample["count"] += 1
+            sample["bytes"] += size
+            sample["ms"] += duration
+            done = all(
+                self._samples.get(t, {}).get("count", 0) >= SAMPLE_LIMIT for t in tracked
+            )
+        if done and self._sampling_context is not None:
+            try:
+                self._sampling_context.remove_listener("requestfinished", self._sample)
+            except Exception:
+                pass
+            self._sampling_context = None
+
+    def _cost(self, rtype: str):
+        sample = self._samples.get(rtype)
+        if sample and sample["count"]:
+            return sample["bytes"] / sample["count"], sample["ms"] / sample["count"]
+        key = rtype if rtype in self.policy["estimated_bytes"] else "other"
+        return self.policy["estimated_bytes"].get(key, 0), self.policy["estimated_ms"].get(key, 0)
+
+    # ---- Routing (scrape sessions) ----
+
+    @contextmanager
+    def applied(self, page, page_url: str = ""):
+        """Routes the requests of `page` through the policy for the duration of the block; resets stats."""
+        if not self.enabled:
+            yield self
+            return
+        self.reset_stats()
+        host = urlparse(page_url).hostname or ""
+        self._first_party = _site_of(host) if host else None
+        page.route("**/*", self._handle_route)
+        try:
+            yield self
+        finally:
+            try:
+                page.unroute("**/*", self._handle_route)
+            except Exception as e:
+                logger.debug(f"Could not remove resource route: {e}")
+
+    def route_page(self, page):
+        """Routes an extra tab opened inside applied(); the route goes away when the tab is closed."""
+        if self.enabled:
+            page.route("**/*", self._handle_route)
+
+    def decide(self, url: str, resource_type: str) -> str:
+        """Returns 'continue', 'stub' or 'abort' for a request."""
+        if resource_type == "document":
+            return "continue"
+        host = urlparse(url).hostname or ""
+        if any(_domain_matches(host, d) for d in self.policy["blocked_domains"]):
+            return "stub" if resource_type == "script" else "abort"
+        if resource_type in self.policy["block_resource_types"]:
+            return "stub" if resource_type in self.policy["stub_resource_types"] else "abort"
+        if self.policy["block_third_party"] and self._first_party and host:
+            allowed = [self._first_party, *self.policy["allowed_domains"]]
+            if not any(_domain_matches(host, d) for d in allowed):
+                return "stub" if resource_type == "script" else "abort"
+        return "continue"
+
+    def _handle_route(self, route, request):
+        rtype = request.resource_type
+        action = self.decide(request.url, rtype)
+        try:
+            if action == "continue":
+                with self._lock:
+                    self._stats["allowed"] += 1
+                route.continue_()
+                return
+            with self._lock:
+                bucket = self._stats["stubbed" if action == "stub" else "blocked"]
+                bucket[rtype] = bucket.get(rtype, 0) + 1
+            if action == "abort":
+                route.abort("blockedbyclient")
+            elif rtype == "image":
+                route.fulfill(status=200, content_type="image/gif", body=PLACEHOLDER_GIF)
+            elif rtype == "script":
+                route.fulfill(status=200, content_type="application/javascript", body="")
+            else:
+                route.fulfill(status=200, body="")
+        except Exception as e:
+            # Page closed or request already handled
+            logger.debug(f"Resource route failed for {request.url}: {e}")
+
+    def stats(self) -> Dict:
+        """Counts of blocked/stubbed requests and the estimated bytes and time saved."""
+        with self._lock:
+            blocked = dict(self._stats["blocked"])
+            stubbed = dict(self._stats["stubbed"])
+            allowed = self._stats["allowed"]
+            saved_bytes = 0.0
+            saved_ms = 0.0
+            for counts in (blocked, stubbed):
+                for rtype, count in counts.items():
+                    size, ms = self._cost(rtype)
+                    saved_bytes += size * count
+                    saved_ms += ms * count
+        return {
+            "blocked": blocked,
+            "stubbed": stubbed,
+            "allowed": allowed,
+            "saved_bytes": int(saved_bytes),
+            # Sum of per-request load times; requests load in parallel, so wall-clock savings are lower
+            "saved_request_ms": int(saved_ms),
+        }
@@ -0,0 +1,326 @@
+import json
+import logging
+import os
+import queue
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set
+
+from app.services.form_capture_service import DEFAULT_TASK_TIMEOUT, FormCaptureService
+from app.services.resource_policy import ResourcePolicy
+from app.services.scraper_service import HondaScraper, ScrapeCheckpoint
+
+logger = logging.getLogger(__name__)
+
+STORAGE_STATE_FILE = "scrape_storage_state.json"
+LOGIN_FIELD_SELECTOR = "input[type='password']"
+
+
+class ScrapeAuthError(Exception):
+    """The saved portal session is missing or expired; log in again in the capture browser."""
+
+
+def load_known_chassis() -> Set[str]:
+    """Upper-cased chassis numbers already in inventory, for incremental scrapes."""
+    from app.db.models import Motorcycle
+    from app.db.session import SessionLocal
+
+    db = SessionLocal()
+    try:
+        return {c.upper() for (c,) in db.query(Motorcycle.chassis_number).all() if c}
+    finally:
+        db.close()
+
+
+class ScrapeWorker:
+    """
+    Headless browser dedicated to stock scrapes.
+
+    Runs on its own thread with its own browser and context, so a long scrape no
+    longer queues behind (or blocks) the cashier's headed capture session. The
+    portal login (which needs a CAPTCHA) still happens in the headed browser; its
+    cookies are exported with `use_capture_login()` and loaded here as Playwright
+    storage state, and the state is written back after each scrape so renewed
+    cookies survive restarts.
+
+    Exposes the same execute_task/config/save_config/resource_policy surface as
+    FormCaptureService, so HondaScraper can run on it unchanged.
+    """
+
+    def __init__(self, storage_state_path: str = None):
+        self.storage_state_path = storage_state_path or os.path.join(os.getcwd(), STORAGE_STATE_FILE)
+        self.capture_service = FormCaptureService()
+        self.resource_policy = ResourcePolicy.from_config(self.capture_service.config)
+        self.is_running = False
+        self.browser = None
+        self.context = None
+        self.page = None
+        self.task_queue = queue.Queue()
+        self.thread = None
+        self._start_lock = threading.Lock()
+        self._ready = threading.Event()
+        self._start_error = None
+        self._scrape_lock = threading.Lock()
+        self._schedule_stop = None
+        self._schedule_thread = None
+        self.last_result: Optional[Dict] = None
+
+    # ---- Same surface as FormCaptureService ----
+
+    @property
+    def config(self) -> Dict:
+        # Shares learned pagination strategies etc. with the capture session
+        return self.capture_service.config
+
+    def save_config(self):
+        self.capture_service.save_config()
+
+    def execute_task(self, callback, timeout=DEFAULT_TASK_TIMEOUT):
+        """
+        Runs callback(page) on the worker thread and returns its result.
+        Raises TimeoutError after `timeout` seconds, e.g. if the worker hangs or dies.
+        """
+        self.start()
+        future = Future()
+        self.task_queue.put((callback, future))
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise TimeoutError(f"Scrape task did not finish within {timeout}s")
+
+    # ---- Lifecycle ----
+
+    @property
+    def has_login(self) -> bool:
+        return os.path.exists(self.storage_state_path)
+
+    def start(self, timeout: float = 60):
+        with self._start_lock:
+            if self.is_running:
+                return
+            self._ready.clear()
+            self._start_error = None
+            self.is_running = True
+            self.thread = threading.Thread(target=self._run_browser, daemon=True, name="scrape-worker")
+            self.thread.start()
+        if not self._ready.wait(timeout):
+            raise RuntimeError("Scrape browser did not start in time")
+        if self._start_error:
+            raise self._start_error
+
+    def stop(self):
+        self.stop_schedule()
+        if self.is_running:
+            self.is_running = False
+            self.task_queue.put(None)
+            if self.thread and self.thread is not threading.current_thread():
+                self.thread.join(timeout=10)
+
+    def _new_context(self):
+        if self.context:
+            try:
+                self.context.close()
+            except Exception:
+                pass
+        state = self.storage_state_path if self.has_login else None
+        self.context = self.browser.new_context(storage_state=state)
+        self.page = self.context.new_page()
+
+    def _run_browser(self):
+        # Imported here so loading this module (and the UI) doesn't pay for playwright
+        from playwright.sync_api import sync_playwright
+        try:
+            with sync_playwright() as p:
+                try:
+                    self.browser = p.chromium.launch(headless=True)
+                    self._new_context()
+                except Exception as e:
+                    self._start_error = e
+                    return
+                finally:
+                    self._ready.set()
+
+                while self.is_running:
+                    item = self.task_queue.get()
+                    if item is None:
+                        break
+                    task, future = item
+                    # Skipped if the caller already gave up on it
+                    if not future.set_running_or_notify_cancel():
+                        continue
+                    try:
+                        future.set_result(task(self.page))
+                    except Exception as task_ex:
+                        future.set_exception(task_ex)
+
+                self.browser.close()
+        except Exception as e:
+            logger.error(f"Scrape worker stopped: {e}")
+        finally:
+            self.is_running = False
+            self.browser = self.context = self.page = None
+            self._ready.set()
+            # Fail anything still waiting instead of leaving callers blocked
+            while not self.task_queue.empty():
+                item = self.task_queue.get_nowait()
+                if item and item[1].set_running_or_notify_cancel():
+                    item[1].set_exception(RuntimeError("Scrape worker stopped"))
+
+    # ---- Authentication ----
+
+    def use_capture_login(self) -> Optional[str]:
+        """
+        Copies the headed session's cookies into the worker and returns the URL
+        open there (normally the stock list the user navigated to).
+        """
+        url = self.capture_service.save_storage_state(self.storage_state_path)
+        if self.is_running:
+            self.execute_task(lambda page: self._new_context())
+        return url
+
+    def _persist_storage_state(self, page):
+        try:
+            page.context.storage_state(path=self.storage_state_path)
+        except Exception as e:
+            logger.warning(f"Could not save scrape session state: {e}")
+
+    def _open_list(self, page, list_url: str):
+        page.goto(list_url, timeout=30000)
+        try:
+            page.wait_for_selector("tbody tr", timeout=15000)
+        except Exception:
+            pass
+        if page.query_selector(LOGIN_FIELD_SELECTOR):
+            raise ScrapeAuthError("Portal session expired. Log in again in the browser, then rerun the scrape.")
+
+    # ---- Scrapes ----
+
+    def scrape_stock(self, list_url: str, incremental: bool = True, max_pages: int = 1000,
+                     known_chassis: Set[str] = None, status_callback=None) -> List[Dict]:
+        """Opens `list_url` in the headless browser and scrapes it. Blocks the caller."""
+        if not self.has_login:
+            raise ScrapeAuthError("No saved portal login. Log in once in the browser first.")
+        with self._scrape_lock:
+            scraper = HondaScraper(capture_service=self)
+            if status_callback:
+                status_callback("Opening stock list (background)...")
+            self.execute_task(lambda page: self._open_list(page, list_url))
+            try:
+                if incremental:
+                    if known_chassis is None:
+                        known_chassis = load_known_chassis()
+                    items = scraper.scrape_incremental(known_chassis, ScrapeCheckpoint(run_type="background"),
+                                                       max_pages=max_pages, status_callback=status_callback)
+                else:
+                    items = scraper.scrape_all_pages(max_pages=max_pages, status_callback=status_callback, workers=4)
+            finally:
+                self.execute_task(self._persist_storage_state)
+
+        self.last_result = {"items": items, "finished_at": datetime.now(), "list_url": list_url}
+        logger.info(f"Background scrape of {list_url} returned {len(items)} items")
+        return items
+
+    def submit_scrape(self, list_url: str, on_done: Callable = None, **kwargs) -> threading.Thread:
+        """Runs scrape_stock on a background thread; on_done(items, error) is called when it finishes."""
+        def run():
+            try:
+                items = self.scrape_stock(list_url, **kwargs)
+            except Exception as e:
+                logger.error(f"Background scrape failed: {e}")
+                if on_done:
+                    on_done(None, e)
+                return
+            if on_done:
+                on_done(items, None)
+
+        worker = threading.Thread(target=run, daemon=True, name="scrape-job")
+        worker.start()
+        return worker
+
+    def take_last_result(self) -> Optional[Dict]:
+        """Returns the last finished scrape (once), e.g. to preload the import dialog."""
+        result, self.last_result = self.last_result, None
+        return result
+
+    # ---- Scheduling ----
+
+    def start_schedule(self, list_url: str, interval_minutes: float, on_done: Callable = None):
+        """Runs an incremental scrape of `list_url` every `interval_minutes` until stop_schedule()."""
+        self.stop_schedule()
+        stop = threading.Event()
+
+        def loop():
+            while not stop.wait(interval_minutes * 60):
+                try:
+                    items = self.scrape_stock(list_url, incremental=True)
+                    if on_done:
+                        on_done(items, None)
+                except Exception as e:
+                    logger.error(f"Scheduled scrape failed: {e}")
+                    if on_done:
+                        on_done(None, e)
+
+        self._schedule_stop = stop
+        self._schedule_thread = threading.Thread(target=loop, daemon=True, name="scrape-schedule")
+        self._schedule_thread.start()
+        logger.info(f"Scheduled background scrape of {list_url} every {interval_minutes} min")
+
+    def stop_schedule(self):
+        if self._schedule_stop:
+            self._schedule_stop.set()
+        self._schedule_stop = None
+        self._schedule_thread = None
+
+    def start_configured_schedule(self, on_done: Callable = None) -> bool:
+        """Starts the schedule from capture_config.json's background_scrape entry, if set up."""
+        settings = self.config.get("background_scrape") or {}
+        interval = float(settings.get("interval_minutes") or 0)
+        list_url = settings.get("list_url")
+        if interval <= 0 or not list_url or not self.has_login:
+            return False
+        self.start_schedule(list_url, interval, on_done)
+        return True
+
+    def remember_list_url(self, list_url: str):
+        settings = self.config.setdefault("background_scrape", {"interval_minutes": 0})
+        if settings.get("list_url") != list_url:
+            settings["list_url"] = list_url
+            self.save_config()
+
+
+_scrape_worker: Optional[ScrapeWorker] = None
+_scrape_worker_lock = threading.Lock()
+
+
+def get_scrape_worker(create: bool = True) -> Optional[ScrapeWorker]:
+    """
+    The shared ScrapeWorker, built on first use so importing this module (and the
+    inventory screen) doesn't set up the capture service. With create=False returns
+    None if it was never built.
+    """
+    global _scrape_worker
+    with _scrape_worker_lock:
+        if _scrape_worker is None and create:
+            _scrape_worker = ScrapeWorker()
+        return _scrape_worker
+
+
+def start_scheduled_scrape(config_path: str = "capture_config.json", storage_state_path: str = None) -> bool:
+    """
+    Startup entry point for the scheduled scrape. Reads the background_scrape entry
+    straight from capture_config.json and only builds the worker (and its capture
+    service) when an interval, a list URL and a saved login are all there.
+    """
+    path = Path(config_path)
+    if not path.exists():
+        return False
+    with open(path, 'r') as f:
+        settings = json.load(f).get("background_scrape") or {}
+    if float(settings.get("interval_minutes") or 0) <= 0 or not settings.get("list_url"):
+        return False
+    if not os.path.exists(storage_state_path or os.path.join(os.getcwd(), STORAGE_STATE_FILE)):
+        return False
+    return get_scrape_worker().start_configured_schedule()
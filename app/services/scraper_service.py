@@ -1,16 +1,245 @@
+import hashlib
+import json
 import logging
+import os
 import sys
 import threading
 import time
+import urllib.parse
 from tkinter import messagebox
-from typing import List, Dict, Optional
+from datetime import datetime
+from typing import List, Dict, Optional, Set
 from app.services.form_capture_service import FormCaptureService
 
 logger = logging.getLogger(__name__)
 
+# Stock table layout on the dealer portal: field -> zero-based <td> index
+STOCK_TABLE_COLUMNS = {
+    "purchase_order": 1,
+    "model": 3,
+    "color": 4,
+    "engine_number": 5,
+    "chassis_number": 6,
+    "status": 7,
+}
+
+# Serializes the whole table in one round trip. Rows without enough cells are skipped,
+# like the per-cell path does.
+EXTRACT_TABLE_JS = r"""(columns) => {
+    let rows = Array.from(document.querySelectorAll('tbody tr'));
+    if (rows.length === 0) {
+        rows = Array.from(document.querySelectorAll('tr')).slice(1);
+    }
+    const maxIndex = Math.max(...Object.values(columns));
+    const result = [];
+    for (const row of rows) {
+        const cells = row.querySelectorAll('td');
+        if (cells.length < 7 || cells.length <= maxIndex) continue;
+        const record = {};
+        for (const [field, index] of Object.entries(columns)) {
+            record[field] = (cells[index].innerText || '').trim();
+        }
+        result.push(record);
+    }
+    return result;
+}"""
+
+# Finds the "of N" total-pages label in the pager
+DETECT_TOTAL_PAGES_JS = r"""() => {
+    const allElements = document.querySelectorAll('*');
+    for (const el of allElements) {
+        if (el.innerText && el.innerText.length < 50 && el.innerText.match(/of\s+(\d+)/i)) {
+             const match = el.innerText.match(/of\s+(\d+)/i);
+             if (match) {
+                     const num = parseInt(match[1]);
+                     const text = el.textContent.toLowerCase();
+                     if (text.includes('page')) return num;
+                     if (text.includes('item') || text.includes('record') || text.includes('entry')) continue; 
+                     if (num < 100) return num;
+                 }
+            }
+        }
+    return null;
+}"""
+
+# Installed before a page change: flags the window as soon as table rows are added or
+# removed anywhere in the document. Re-arming resets the flag.
+ARM_TABLE_WATCH_JS = r"""() => {
+    if (window.__stockTableObserver) window.__stockTableObserver.disconnect();
+    window.__stockTableChanged = false;
+    const touchesRows = (nodes) => Array.from(nodes).some(
+        n => n.nodeType === 1 && (n.tagName === 'TR' || n.tagName === 'TBODY' || n.tagName === 'TABLE' || n.querySelector?.('tr'))
+    );
+    window.__stockTableObserver = new MutationObserver((mutations) => {
+        for (const m of mutations) {
+            if (touchesRows(m.addedNodes) || touchesRows(m.removedNodes)) {
+                window.__stockTableChanged = true;
+                window.__stockTableObserver.disconnect();
+                return;
+            }
+        }
+    });
+    window.__stockTableObserver.observe(document.body, {childList: true, subtree: true});
+    return true;
+}"""
+
+# Resolves true once the rows differ from `oldText`/`oldRowCount` or the armed watch has
+# fired, and false after `timeoutMs`. `oldRowCount` may be null, in which case only the
+# first cell is compared. A full navigation drops the window state, so the current table
+# is compared first and a fresh observer covers the rest.
+WAIT_TABLE_CHANGE_JS = r"""({oldText, oldRowCount, timeoutMs}) => new Promise((resolve) => {
+    const rowsReady = () => {
+        let rows = document.querySelectorAll('tbody tr');
+        let count = rows.length;
+        let firstRow = rows[0];
+        if (count === 0) {
+            const all = document.querySelectorAll('tr');
+            count = Math.max(0, all.length - 1);
+            firstRow = all[1];
+        }
+        if (!firstRow) return false;
+        const cell = firstRow.querySelector('td:nth-child(2)');
+        const text = cell ? cell.innerText.trim() : '';
+        return text !== oldText || (oldRowCount !== null && count > oldRowCount);
+    };
+    const watchFired = () => window.__stockTableChanged === true && !!document.querySelector('tr td');
+    if (watchFired() || rowsReady()) return resolve(true);
+    let observer = null;
+    let timer = null;
+    const done = (result) => {
+        if (observer) observer.disconnect();
+        clearTimeout(timer);
+        if (window.__stockTableObserver) window.__stockTableObserver.disconnect();
+        resolve(result);
+    };
+    timer = setTimeout(() => done(false), timeoutMs);
+    observer = new MutationObserver(() => {
+        if (watchFired() || rowsReady()) done(true);
+    });
+    observer.observe(document.body, {childList: true, subtree: true, characterData: true});
+})"""
+
+TABLE_CHANGE_TIMEOUT_MS = 10000
+
+# Order _go_to_next_page probes pager styles in when nothing has been learned yet
+PAGINATION_STRATEGIES = ("input", "select", "button", "link")
+PAGE_INPUT_SELECTOR = 'input[type="text"], input[type="number"], input:not([type])'
+NEXT_BUTTON_SELECTORS = (
+    "button[title='Next Page']", "a[title='Next Page']",
+    "button[aria-label='Next Page']",
+    ".k-pager-nav.k-pager-last", ".next", ".next-page",
+    "xpath=//a[contains(text(), 'Next')]",
+    "xpath=//button[contains(text(), 'Next')]",
+    "xpath=//span[contains(@class, 'icon-next')]/..",
+)
+
+# Query parameters portals commonly use for the current page number
+PAGE_PARAM_NAMES = ("page", "pageno", "pagenumber", "pageindex", "currentpage", "p")
+
+# Outcomes of _resume_from_checkpoint
+RESUME_CONTINUE = "resumed"    # on the page after the checkpoint
+RESUME_RESTART = "restart"     # back on page 1, checkpoint discarded
+RESUME_FINISHED = "finished"   # the checkpoint page was the last one
+
+class ScrapeCheckpoint:
+    """
+    Progress of the incremental stock scrape, persisted in the working directory.
+
+    Holds the newest purchase order / chassis seen by the last completed run and,
+    while a run is in progress, the last completed page, its signature and the
+    items collected so far, so an interrupted run can resume where it stopped.
+
+    Each run type (the interactive scrape, the background worker) has its own
+    file, so one can't overwrite the other's progress.
+    """
+    FILE_NAME = "scrape_checkpoint_{run_type}.json"
+
+    def __init__(self, path: str = None, run_type: str = "interactive"):
+        self.path = path or os.path.join(os.getcwd(), self.FILE_NAME.format(run_type=run_type))
+        self.data = self._load()
+
+    def _load(self) -> Dict:
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r") as f:
+                    return json.load(f)
+            except Exception as e:
+                logger.warning(f"Could not read scrape checkpoint: {e}")
+        return {}
+
+    def save(self):
+        self.data["updated_at"] = datetime.now().isoformat(timespec="seconds")
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(self.data, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.error(f"Could not save scrape checkpoint: {e}")
+
+    @property
+    def in_progress(self) -> bool:
+        return bool(self.data.get("in_progress"))
+
+    @property
+    def last_completed_page(self) -> int:
+        return int(self.data.get("last_completed_page") or 0)
+
+    @property
+    def last_page_signature(self) -> str:
+        return self.data.get("last_page_signature", "")
+
+    @property
+    def pending_items(self) -> List[Dict]:
+        return list(self.data.get("pending_items", []))
+
+    @property
+    def newest_item(self) -> Optional[Dict]:
+        """First row of page 1 in the run in progress."""
+        return self.data.get("newest_item")
+
+    def start(self, list_url: str):
+        self.data.update({
+            "in_progress": True,
+            "list_url": list_url,
+            "last_completed_page": 0,
+            "last_page_signature": "",
+            "pending_items": [],
+            "newest_item": None,
+        })
+        self.save()
+
+    def page_done(self, page_num: int, signature: str, new_items: List[Dict], newest_item: Dict = None):
+        self.data["last_completed_page"] = page_num
+        self.data["last_page_signature"] = signature
+        self.data.setdefault("pending_items", []).extend(new_items)
+        if newest_item:
+            self.data["newest_item"] = newest_item
+        self.save()
+
+    def finish(self, newest_item: Optional[Dict]):
+        if newest_item:
+            self.data["last_purchase_order"] = newest_item.get("purchase_order", "")
+            self.data["last_chassis"] = newest_item.get("chassis_number", "")
+        self.data.update({"in_progress": False, "pending_items": [], "newest_item": None})
+        self.save()
+
+    @staticmethod
+    def page_signature(page_data: List[Dict]) -> str:
+        """Identifies a page by its rows, so a resume can tell whether the list has shifted."""
+        joined = "|".join(f"{i.get('purchase_order', '')}:{i.get('chassis_number', '')}" for i in page_data)
+        return hashlib.sha1(joined.encode("utf-8")).hexdigest()
+
 class HondaScraper:
-    def __init__(self):
-        self.capture_service = FormCaptureService()
+    # Set to False to always use the per-cell extraction path
+    use_fast_extraction = True
+    # Resource policy of the running scrape task, for the tabs it opens
+    _active_policy = None
+
+    def __init__(self, capture_service=None):
+        # Anything with execute_task(callback) and a config dict works, e.g. the offline replay harness
+        self.capture_service = capture_service or FormCaptureService()
+        self.last_resource_stats = None
 
     def start_browser(self, headless=False):
         """Ensures the browser instance is running via FormCaptureService."""
@@ -126,10 +355,33 @@ class HondaScraper:
             page.keyboard.press(f"{modifier}+d")
         self.capture_service.execute_task(task)
 
+    def _execute_scrape(self, task):
+        """
+        Runs a scrape task in the browser thread with the capture service's resource
+        policy applied, so images/fonts/analytics are skipped only while scraping.
+        """
+        policy = getattr(self.capture_service, "resource_policy", None)
+
+        def scrape_task(page):
+            if policy is None:
+                return task(page)
+            # Only the scraper's page (and its extra tabs) is routed; other tabs render normally
+            with policy.applied(page, page.url):
+                self._active_policy = policy
+                try:
+                    result = task(page)
+                finally:
+                    self._active_policy = None
+            self.last_resource_stats = policy.stats()
+            logger.info(f"Resource policy during scrape: {self.last_resource_stats}")
+            return result
+
+        return self.capture_service.execute_task(scrape_task)
+
     def scrape_current_page(self, page_num: int = 1) -> List[Dict]:
         def task(page):
             return self._scrape_page_logic(page, page_num)
-        return self.capture_service.execute_task(task)
+        return self._execute_scrape(task)
 
     def _scrape_page_logic(self, page, page_num):
         # Logic extracted from scrape_current_page
@@ -138,67 +390,71 @@ class HondaScraper:
         except:
             pass 
 
+        rows = None
+        if self.use_fast_extraction:
+            try:
+                rows = self._extract_rows_fast(page)
+            except Exception as e:
+                logger.warning(f"Fast table extraction failed, falling back to per-cell: {e}")
+
+        if rows is None:
+            rows = self._extract_rows_per_cell(page)
+
         data = []
+        for row in rows:
+            status = "IN_STOCK"
+            if "sold" in row.get("status", "").lower():
+                status = "SOLD"
+
+            item = {
+                "purchase_order": row.get("purchase_order", ""),
+                "model": row.get("model", ""),
+                "color": row.get("color", ""),
+                "engine_number": row.get("engine_number", ""),
+                "chassis_number": row.get("chassis_number", ""),
+                "status": status,
+                "page_number": page_num
+            }
+
+            if item["engine_number"] and item["chassis_number"]:
+                data.append(item)
+
+        return data
+
+    def _extract_rows_fast(self, page, columns: Dict[str, int] = None) -> List[Dict]:
+        """Reads every row of the stock table with a single page.evaluate call."""
+        rows = page.evaluate(EXTRACT_TABLE_JS, columns or STOCK_TABLE_COLUMNS)
+        if not isinstance(rows, list):
+            raise ValueError(f"Unexpected extraction result: {type(rows).__name__}")
+        return rows
+
+    def _extract_rows_per_cell(self, page, columns: Dict[str, int] = None) -> List[Dict]:
+        """Slow path: one round trip per row and per cell."""
+        columns = columns or STOCK_TABLE_COLUMNS
         rows = page.query_selector_all("tbody tr")
         if not rows:
             rows = page.query_selector_all("tr")
             if rows:
                 rows = rows[1:]
 
+        result = []
         for row in rows:
             cells = row.query_selector_all("td")
             if len(cells) < 7:
                 continue 
-            
+
             try:
-                p_order = cells[1].inner_text().strip()
-                model = cells[3].inner_text().strip()
-                color = cells[4].inner_text().strip()
-                engine = cells[5].inner_text().strip()
-                chassis = cells[6].inner_text().strip()
-                status_text = cells[7].inner_text().strip()
-
-                status = "IN_STOCK"
-                if "sold" in status_text.lower():
-                    status = "SOLD"
-
-                item = {
-                    "purchase_order": p_order,
-                    "model": model,
-                    "color": color,
-                    "engine_number": engine,
-                    "chassis_number": chassis,
-                    "status": status,
-                    "page_number": page_num
-                }
-                
-                if engine and chassis:
-                    data.append(item)
+                result.append({field: cells[index].inner_text().strip() for field, index in columns.items()})
             except Exception as e:
                 logger.warning(f"Error parsing row: {e}")
                 continue
-            
-        return data
+
+        return result
 
     def detect_total_pages(self) -> Optional[int]:
         def task(page):
             try:
-                result = page.evaluate(r"""() => {
-                    const allElements = document.querySelectorAll('*');
-                    for (const el of allElements) {
-                        if (el.innerText && el.innerText.length < 50 && el.innerText.match(/of\s+(\d+)/i)) {
-                             const match = el.innerText.match(/of\s+(\d+)/i);
-                             if (match) {
-                                     const num = parseInt(match[1]);
-                                     const text = el.textContent.toLowerCase();
-                                     if (text.includes('page')) return num;
-                                     if (text.includes('item') || text.includes('record') || text.includes('entry')) continue; 
-                                     if (num < 100) return num;
-                                 }
-                            }
-                        }
-                    return null;
-                }""")
+                result = page.evaluate(DETECT_TOTAL_PAGES_JS)
                 if result:
                     logger.info(f"Detected total pages from UI: {result}")
                 return result
@@ -206,99 +462,419 @@ class HondaScraper:
                 return None
         return self.capture_service.execute_task(task)
 
-    def scrape_all_pages(self, max_pages=10, status_callback=None, retry_count=3, delay=1.0) -> List[Dict]:
+    def scrape_all_pages(self, max_pages=10, status_callback=None, retry_count=3, delay=0.0,
+                         workers: int = 1, page_url_template: str = None) -> List[Dict]:
         """
         Scrapes multiple pages. 
         WARNING: This blocks the caller if executed synchronously.
         Best called from a background thread.
+
+        With workers > 1 pages are loaded concurrently in extra tabs of the same
+        (logged-in) browser context, see _scrape_parallel.
         """
         def task(page):
-            accumulated_data = []
-            seen_keys = set()
-            
-            # Detect total pages
-            total_pages = None
-            try:
-                # We can call the logic directly since we have 'page'
-                # But detect_total_pages is defined as a method that calls execute_task.
-                # We shouldn't call self.detect_total_pages() from within a task!
-                # It would try to queue another task and deadlock.
-                # So we need to duplicate logic or structure it better.
-                # I'll just skip detection or use a simpler check here.
-                pass
-            except: pass
+            if workers > 1:
+                return self._scrape_parallel(page, max_pages, status_callback, workers, page_url_template, retry_count)
+            return self._scrape_sequential(page, max_pages, status_callback, retry_count, delay)
+
+        return self._execute_scrape(task)
+
+    def _scrape_sequential(self, page, max_pages, status_callback=None, retry_count=3, delay=0.0) -> List[Dict]:
+        """Walks the pager one page at a time on the given page."""
+        accumulated_data = []
+        seen_keys = set()
+        
+        # Detect total pages
+        total_pages = None
+        try:
+            # We can call the logic directly since we have 'page'
+            # But detect_total_pages is defined as a method that calls execute_task.
+            # We shouldn't call self.detect_total_pages() from within a task!
+            # It would try to queue another task and deadlock.
+            # So we need to duplicate logic or structure it better.
+            # I'll just skip detection or use a simpler check here.
+            pass
+        except: pass
+        
+        total_str = ""
+        
+        for page_num in range(1, max_pages + 1):
+            if status_callback:
+                status_callback(f"Scraping Page {page_num}{total_str}... (Items: {len(accumulated_data)})")
+                
+            logger.info(f"Starting scrape for page {page_num}")
             
-            total_str = ""
+            first_cell_text, old_row_count = self._table_state(page)
+            self._arm_table_watch(page)
             
-            for page_num in range(1, max_pages + 1):
-                if status_callback:
-                    status_callback(f"Scraping Page {page_num}{total_str}... (Items: {len(accumulated_data)})")
-                    
-                logger.info(f"Starting scrape for page {page_num}")
-                
-                first_cell_text = self._get_first_cell_text(page)
-                old_row_count = 0
+            page_data = []
+            for attempt in range(retry_count):
                 try:
-                    old_row_count = len(page.query_selector_all("tbody tr"))
-                except: pass
+                    page_data = self._scrape_page_logic(page, page_num)
+                    if page_data:
+                        break 
+                    else:
+                        if status_callback:
+                            status_callback(f"Page {page_num}{total_str}: Retrying ({attempt+1}/{retry_count})...")
+                        if attempt < retry_count - 1:
+                            time.sleep(2)
+                except Exception as e:
+                    logger.error(f"Error scraping page {page_num}: {e}")
+
+            if page_data:
+                new_items = self._merge_items(page_data, seen_keys, accumulated_data)
                 
-                page_data = []
-                for attempt in range(retry_count):
-                    try:
-                        page_data = self._scrape_page_logic(page, page_num)
-                        if page_data:
-                            break 
-                        else:
-                            if status_callback:
-                                status_callback(f"Page {page_num}{total_str}: Retrying ({attempt+1}/{retry_count})...")
-                            if attempt < retry_count - 1:
-                                time.sleep(2)
-                    except Exception as e:
-                        logger.error(f"Error scraping page {page_num}: {e}")
-
-                if page_data:
-                    new_items = 0
-                    for item in page_data:
-                        key = (item.get("purchase_order", ""), item.get("chassis_number", ""), item.get("engine_number", ""))
-                        if key not in seen_keys:
-                            seen_keys.add(key)
-                            accumulated_data.append(item)
-                            new_items += 1
-                    
-                    if status_callback:
-                        status_callback(f"Page {page_num}{total_str} Done. Added {new_items}. Total: {len(accumulated_data)}")
+                if status_callback:
+                    status_callback(f"Page {page_num}{total_str} Done. Added {new_items}. Total: {len(accumulated_data)}")
 
-                    if new_items == 0 and len(page_data) > 0:
-                        if status_callback:
-                            status_callback(f"Stopping: No new data on Page {page_num}.")
-                        return accumulated_data 
-                else:
+                if new_items == 0 and len(page_data) > 0:
                     if status_callback:
-                        status_callback(f"Page {page_num}{total_str} Failed/Empty. Continuing...")
-                    logger.info(f"Page {page_num} is empty. Assuming end of list.")
-                    break
+                        status_callback(f"Stopping: No new data on Page {page_num}.")
+                    return accumulated_data 
+            else:
+                if status_callback:
+                    status_callback(f"Page {page_num}{total_str} Failed/Empty. Continuing...")
+                logger.info(f"Page {page_num} is empty. Assuming end of list.")
+                break
+            
+            if page_num >= max_pages:
+                break
+            
+            if status_callback:
+                status_callback(f"Page {page_num}{total_str}: Navigating to next...")
                 
-                if page_num >= max_pages:
-                    break
+            if not self._go_to_next_page(page, current_page_num=page_num):
+                logger.info("No next page found or reached end.")
+                break
+            
+            if delay > 0:
+                time.sleep(delay)
+                
+            if status_callback:
+                status_callback(f"Page {page_num + 1}{total_str}: Waiting for load...")
+            
+            self._wait_for_table_update(page, old_text=first_cell_text, old_row_count=old_row_count)
                 
+        return accumulated_data
+
+    def scrape_incremental(self, known_chassis: Set[str], checkpoint: ScrapeCheckpoint = None, max_pages=1000,
+                           status_callback=None, resume=True, page_url_template: str = None) -> List[Dict]:
+        """
+        Scrapes only what is new since the last sync. Assumes the portal lists newest
+        stock first: walks pages from the top and stops at the first page whose
+        chassis numbers are all in `known_chassis` (upper-cased). Progress is
+        checkpointed after every page; with resume=True an interrupted run continues
+        from its last completed page if that page is unchanged.
+        """
+        checkpoint = checkpoint or ScrapeCheckpoint()
+        known = {c.upper() for c in known_chassis if c}
+
+        def task(page):
+            accumulated_data = []
+            seen_keys = set()
+            page_num = 1
+            newest_item = None
+
+            outcome = RESUME_RESTART
+            if resume and checkpoint.in_progress and checkpoint.last_completed_page:
+                outcome = self._resume_from_checkpoint(page, checkpoint, page_url_template)
+
+            if outcome == RESUME_RESTART:
+                checkpoint.start(page.url)
+            else:
+                self._merge_items(checkpoint.pending_items, seen_keys, accumulated_data)
+                newest_item = checkpoint.newest_item
+                page_num = checkpoint.last_completed_page + 1
+                if outcome == RESUME_FINISHED:
+                    # The checkpoint page was the last one: nothing left to walk
+                    checkpoint.finish(newest_item)
+                    return accumulated_data
                 if status_callback:
-                    status_callback(f"Page {page_num}{total_str}: Navigating to next...")
-                    
+                    status_callback(f"Resuming at Page {page_num} ({len(accumulated_data)} items carried over)")
+
+            previous_signature = None
+            while page_num <= max_pages:
+                if status_callback:
+                    status_callback(f"Scraping Page {page_num}... (New: {len(accumulated_data)})")
+
+                first_cell_text, old_row_count = self._table_state(page)
+                self._arm_table_watch(page)
+                page_data = self._scrape_page_logic(page, page_num)
+                if not page_data:
+                    logger.info(f"Page {page_num} is empty. Assuming end of list.")
+                    break
+                signature = ScrapeCheckpoint.page_signature(page_data)
+                if signature == previous_signature:
+                    # The pager didn't move (e.g. a disabled Next link was clicked)
+                    logger.info(f"Page {page_num} repeats the previous page. Assuming end of list.")
+                    break
+                previous_signature = signature
+                if page_num == 1:
+                    newest_item = page_data[0]
+
+                new_items = [i for i in page_data if i["chassis_number"].upper() not in known]
+                added = self._merge_items(new_items, seen_keys, accumulated_data)
+                checkpoint.page_done(page_num, signature, new_items,
+                                     newest_item=page_data[0] if page_num == 1 else None)
+
+                if not new_items:
+                    if status_callback:
+                        status_callback(f"Stopping: Page {page_num} has only known chassis.")
+                    break
+                if added == 0:
+                    if status_callback:
+                        status_callback(f"Stopping: No new data on Page {page_num}.")
+                    break
+
                 if not self._go_to_next_page(page, current_page_num=page_num):
                     logger.info("No next page found or reached end.")
                     break
-                
-                if delay > 0:
-                    time.sleep(delay)
-                    
-                if status_callback:
-                    status_callback(f"Page {page_num + 1}{total_str}: Waiting for load...")
-                
-                self._wait_for_table_update(page, old_text=first_cell_text, old_row_count=old_row_count)
-                    
+                if not self._wait_for_table_update(page, old_text=first_cell_text, old_row_count=old_row_count):
+                    logger.info(f"Table did not change after leaving page {page_num}. Assuming end of list.")
+                    break
+                page_num += 1
+
+            checkpoint.finish(newest_item)
             return accumulated_data
 
-        return self.capture_service.execute_task(task)
+        return self._execute_scrape(task)
+
+    def _resume_from_checkpoint(self, page, checkpoint: ScrapeCheckpoint, page_url_template: str = None) -> str:
+        """
+        Moves `page` past the checkpoint's last completed page if that page is unchanged.
+        Returns RESUME_CONTINUE (now on the next page), RESUME_FINISHED (it was the last
+        page) or RESUME_RESTART (back on page 1; the checkpoint no longer applies).
+        """
+        target = checkpoint.last_completed_page
+        template = page_url_template or self._page_url_template(checkpoint.data.get("list_url", ""))
+        try:
+            if template:
+                page.goto(template.format(page=target), timeout=30000)
+            elif target > 1:
+                old_text, old_row_count = self._table_state(page)
+                self._arm_table_watch(page)
+                if not self._jump_to_page(page, target):
+                    # Nothing moved, still on page 1
+                    return RESUME_RESTART
+                self._wait_for_table_update(page, old_text=old_text, old_row_count=old_row_count)
+
+            page_data = self._scrape_page_logic(page, target)
+            if ScrapeCheckpoint.page_signature(page_data) != checkpoint.last_page_signature:
+                logger.info("Scrape checkpoint is stale (list changed), starting from page 1.")
+                if template or target > 1:
+                    self._return_to_first_page(page, checkpoint, template)
+                return RESUME_RESTART
+
+            first_cell_text, old_row_count = self._table_state(page)
+            self._arm_table_watch(page)
+            if not self._go_to_next_page(page, current_page_num=target):
+                logger.info(f"Checkpoint page {target} is the last page.")
+                return RESUME_FINISHED
+            self._wait_for_table_update(page, old_text=first_cell_text, old_row_count=old_row_count)
+            return RESUME_CONTINUE
+        except Exception as e:
+            logger.warning(f"Could not resume scrape from checkpoint: {e}")
+            if template or target > 1:
+                self._return_to_first_page(page, checkpoint, template)
+            return RESUME_RESTART
+
+    def _return_to_first_page(self, page, checkpoint: ScrapeCheckpoint, template: Optional[str]):
+        """Puts `page` back on page 1 of the list before a restart; raises if it can't."""
+        if template:
+            page.goto(template.format(page=1), timeout=30000)
+            return
+        old_text, old_row_count = self._table_state(page)
+        self._arm_table_watch(page)
+        if self._jump_to_page(page, 1):
+            self._wait_for_table_update(page, old_text=old_text, old_row_count=old_row_count)
+            return
+        list_url = checkpoint.data.get("list_url")
+        if not list_url:
+            raise RuntimeError("Could not return to page 1 of the stock list")
+        # Reloading the list resets an in-page pager
+        page.goto(list_url, timeout=30000)
+
+    @staticmethod
+    def _merge_items(page_data: List[Dict], seen_keys: set, accumulated_data: List[Dict]) -> int:
+        """Appends unseen items, keyed on (purchase_order, chassis, engine). Returns how many were new."""
+        new_items = 0
+        for item in page_data:
+            key = (item.get("purchase_order", ""), item.get("chassis_number", ""), item.get("engine_number", ""))
+            if key not in seen_keys:
+                seen_keys.add(key)
+                accumulated_data.append(item)
+                new_items += 1
+        return new_items
+
+    def _scrape_parallel(self, page, max_pages, status_callback=None, workers=4, page_url_template=None,
+                         retry_count=3) -> List[Dict]:
+        """
+        Loads pages 2..N in `workers` extra tabs of the same browser context (so the
+        login session is shared), jumping straight to each page number either through
+        a page URL parameter or the pager's page-number input. Navigation for a whole
+        batch is started before any of it is awaited, so the browser loads the pages
+        concurrently. Results are merged in page order with the usual de-duplication.
+
+        A page that fails to load is retried on its own tab up to `retry_count` times;
+        only a page that loaded and has no rows ends the list. The detected page total
+        is used for status text, and to treat failures past it as the end of the list.
+        Falls back to the sequential walk (from page 1, which `page` still shows) if no
+        page can be jumped to or a page keeps failing.
+        """
+        base_url = page.url
+        template = page_url_template or self._page_url_template(base_url)
+
+        total_pages = None
+        try:
+            total_pages = page.evaluate(DETECT_TOTAL_PAGES_JS)
+        except Exception:
+            pass
+        last_page = max_pages
+        total_str = f" of {total_pages}" if total_pages else ""
+
+        accumulated_data = []
+        seen_keys = set()
+
+        if status_callback:
+            status_callback(f"Scraping Page 1{total_str}...")
+        first_page = self._scrape_page_logic(page, 1)
+        if not first_page:
+            return accumulated_data
+        self._merge_items(first_page, seen_keys, accumulated_data)
+        if last_page <= 1:
+            return accumulated_data
+
+        tabs = [self._new_tab(page) for _ in range(min(workers, last_page - 1))]
+        try:
+            next_page = 2
+            while next_page <= last_page:
+                batch = list(range(next_page, min(next_page + len(tabs), last_page + 1)))
+                if status_callback:
+                    status_callback(f"Loading Pages {batch[0]}-{batch[-1]}{total_str}... (Items: {len(accumulated_data)})")
+
+                # Start every navigation first, then collect
+                started = [(tab, num, self._start_page_load(tab, base_url, template, num)) for tab, num in zip(tabs, batch)]
+
+                if next_page == 2 and all(token is False for _, _, token in started):
+                    logger.info("Parallel scrape: cannot jump to page numbers, falling back to sequential.")
+                    return self._scrape_sequential(page, max_pages, status_callback, retry_count)
+
+                for tab, num, token in started:
+                    page_data = self._finish_page_load(tab, num, token) if token is not False else None
+                    for attempt in range(1, retry_count):
+                        if page_data is not None:
+                            break
+                        if status_callback:
+                            status_callback(f"Page {num}{total_str}: Retrying ({attempt + 1}/{retry_count})...")
+                        token = self._start_page_load(tab, base_url, template, num)
+                        if token is not False:
+                            page_data = self._finish_page_load(tab, num, token)
+
+                    if page_data is None:
+                        if total_pages and num > total_pages:
+                            logger.info(f"Page {num} is past the detected {total_pages} pages and did not load. Assuming end of list.")
+                            return accumulated_data
+                        logger.warning(f"Page {num} failed {retry_count} times, falling back to sequential.")
+                        if status_callback:
+                            status_callback(f"Page {num} keeps failing, rescanning page by page...")
+                        return self._scrape_sequential(page, max_pages, status_callback, retry_count)
+
+                    if not page_data:
+                        logger.info(f"Page {num} is empty. Assuming end of list.")
+                        return accumulated_data
+
+                    new_items = self._merge_items(page_data, seen_keys, accumulated_data)
+                    if status_callback:
+                        status_callback(f"Page {num}{total_str} Done. Added {new_items}. Total: {len(accumulated_data)}")
+                    if new_items == 0:
+                        if status_callback:
+                            status_callback(f"Stopping: No new data on Page {num}.")
+                        return accumulated_data
+
+                next_page += len(batch)
+        finally:
+            for tab in tabs:
+                try:
+                    tab.close()
+                except Exception:
+                    pass
+
+        return accumulated_data
+
+    def _new_tab(self, page):
+        """Opens another tab in `page`'s context with the running scrape's resource policy."""
+        tab = page.context.new_page()
+        if self._active_policy is not None:
+            self._active_policy.route_page(tab)
+        return tab
+
+    @staticmethod
+    def _page_url_template(url: str) -> Optional[str]:
+        """Turns a URL with a page-number query parameter into a '{page}' template."""
+        parts = urllib.parse.urlsplit(url)
+        params = urllib.parse.parse_qsl(parts.query, keep_blank_values=True)
+        for i, (name, value) in enumerate(params):
+            if name.lower() in PAGE_PARAM_NAMES and value.isdigit():
+                query = urllib.parse.urlencode(params[:i] + [(name, "__PAGE__")] + params[i + 1:])
+                return urllib.parse.urlunsplit(parts._replace(query=query)).replace("__PAGE__", "{page}")
+        return None
+
+    def _start_page_load(self, tab, base_url: str, template: Optional[str], page_num: int):
+        """
+        Starts loading `page_num` in `tab` without waiting for the table.
+        Returns a token for _finish_page_load: None for a URL jump, or the table's
+        (first cell text, row count) before an in-page jump. Returns False if the
+        page number couldn't be reached.
+        """
+        try:
+            if template:
+                tab.goto(template.format(page=page_num), wait_until="commit", timeout=30000)
+                return None
+
+            tab.goto(base_url, wait_until="domcontentloaded", timeout=30000)
+            tab.wait_for_selector("tbody tr", timeout=10000)
+            before = self._table_state(tab)
+            self._arm_table_watch(tab)
+            if self._jump_to_page(tab, page_num):
+                return before
+        except Exception as e:
+            logger.warning(f"Could not start loading page {page_num}: {e}")
+        return False
+
+    def _finish_page_load(self, tab, page_num: int, token) -> Optional[List[Dict]]:
+        """Rows of `page_num`, or None if it failed to load (an empty list is an empty page)."""
+        try:
+            if token:
+                old_text, old_row_count = token
+                if not self._wait_for_table_update(tab, old_text=old_text, old_row_count=old_row_count):
+                    logger.warning(f"Page {page_num} did not load in time")
+                    return None
+            else:
+                tab.wait_for_load_state("domcontentloaded", timeout=30000)
+            return self._scrape_page_logic(tab, page_num)
+        except Exception as e:
+            logger.error(f"Error scraping page {page_num}: {e}")
+            return None
+
+    def _jump_to_page(self, page, page_num: int) -> bool:
+        """Types a page number into the pager's page input (the input strategy of _go_to_next_page)."""
+        try:
+            for inp in page.query_selector_all('input[type="text"], input[type="number"], input:not([type])'):
+                if not inp.is_visible():
+                    continue
+                val = (inp.input_value() or "").strip()
+                if not val.isdigit():
+                    continue
+                box = inp.bounding_box()
+                if box and box['width'] > 150:
+                    continue
+                inp.click()
+                inp.fill(str(page_num))
+                inp.press("Enter")
+                return True
+        except Exception:
+            pass
+        return False
 
     def _get_first_cell_text(self, page) -> str:
         try:
@@ -309,95 +885,161 @@ class HondaScraper:
             pass
         return ""
 
-    def _wait_for_table_update(self, page, old_text: str, old_row_count: int = 0) -> bool:
+    def _get_row_count(self, page) -> int:
+        """Counts table rows the way WAIT_TABLE_CHANGE_JS does (header row excluded)."""
         try:
-            old_text_safe = old_text.replace("'", "\\'")
-            page.wait_for_function(
-                f"""() => {{
-                    let firstRow = document.querySelector('tbody tr');
-                    if (!firstRow) {{
-                        const rows = document.querySelectorAll('tr');
-                        if (rows.length > 1) firstRow = rows[1]; 
-                    }}
-                    if (!firstRow) return false;
-                    const cell = firstRow.querySelector('td:nth-child(2)');
-                    const currentText = cell ? cell.innerText.trim() : '';
-                    let rowCount = document.querySelectorAll('tbody tr').length;
-                    if (rowCount === 0) {{
-                        rowCount = Math.max(0, document.querySelectorAll('tr').length - 1);
-                    }}
-                    return (currentText !== '{old_text_safe}') || (rowCount > {old_row_count});
-                }}""",
-                timeout=10000 
-            )
-            page.wait_for_timeout(500) 
-            return True
+            count = len(page.query_selector_all("tbody tr"))
+            if count == 0:
+                count = max(0, len(page.query_selector_all("tr")) - 1)
+            return count
+        except Exception:
+            return 0
+
+    def _table_state(self, page):
+        """(first cell text, row count) to hand to _wait_for_table_update after a page change."""
+        return self._get_first_cell_text(page), self._get_row_count(page)
+
+    def _arm_table_watch(self, page):
+        """Starts watching the table rows; call before the action that changes the page."""
+        try:
+            page.evaluate(ARM_TABLE_WATCH_JS)
         except Exception as e:
-            page.wait_for_timeout(2000)
-            return False
+            logger.debug(f"Could not arm table watch: {e}")
+
+    def _wait_for_table_update(self, page, old_text: str, old_row_count: Optional[int] = None,
+                               timeout_ms: int = TABLE_CHANGE_TIMEOUT_MS) -> bool:
+        """
+        Waits until the table rows change (see WAIT_TABLE_CHANGE_JS); False on timeout.
+        The row-count check only applies when `old_row_count` is given.
+        """
+        args = {"oldText": old_text, "oldRowCount": old_row_count, "timeoutMs": timeout_ms}
+        try:
+            return bool(page.evaluate(WAIT_TABLE_CHANGE_JS, args))
+        except Exception as e:
+            # The page navigated while we waited; check the new document once it has loaded
+            logger.debug(f"Table watch interrupted ({e}), waiting on the new document")
+            try:
+                page.wait_for_load_state("domcontentloaded", timeout=timeout_ms)
+                return bool(page.evaluate(WAIT_TABLE_CHANGE_JS, args))
+            except Exception as e:
+                logger.warning(f"Table did not update: {e}")
+                return False
 
     def _go_to_next_page(self, page, current_page_num: int = None) -> bool:
+        """
+        Moves to the next page. The strategy (and selector) that worked last time on
+        this portal is tried first; if it fails all strategies are probed again and
+        the one that works is remembered in capture_config.json.
+        """
         next_page = current_page_num + 1 if current_page_num else 2
-        
-        # 1. STRATEGY: Input Field
+        host = urllib.parse.urlparse(str(page.url)).hostname or ""
+
+        learned = self._learned_pagination(host)
+        if learned:
+            strategy, selector = learned.get("strategy"), learned.get("selector")
+            if self._try_pagination(page, strategy, selector, current_page_num, next_page):
+                return True
+            logger.info(f"Learned pagination strategy '{strategy}' failed on {host}, probing again")
+
+        for strategy in PAGINATION_STRATEGIES:
+            selector = self._try_pagination(page, strategy, None, current_page_num, next_page)
+            if selector:
+                self._remember_pagination(host, strategy, selector)
+                return True
+        return False
+
+    def _learned_pagination(self, host: str) -> Optional[Dict]:
+        strategies = self.capture_service.config.get("pagination_strategies", {})
+        learned = strategies.get(host)
+        return learned if isinstance(learned, dict) else None
+
+    def _remember_pagination(self, host: str, strategy: str, selector: str):
+        if not host:
+            return
+        entry = {"strategy": strategy, "selector": selector}
+        strategies = self.capture_service.config.setdefault("pagination_strategies", {})
+        if strategies.get(host) == entry:
+            return
+        strategies[host] = entry
+        logger.info(f"Learned pagination strategy for {host}: {entry}")
+        self.capture_service.save_config()
+
+    def _try_pagination(self, page, strategy: str, selector: Optional[str], current_page_num, next_page) -> Optional[str]:
+        """Runs one pagination strategy. Returns the selector that worked, or None."""
+        handler = {
+            "input": self._paginate_input,
+            "select": self._paginate_select,
+            "button": self._paginate_button,
+            "link": self._paginate_link,
+        }.get(strategy)
+        if handler is None:
+            return None
         try:
-            inputs = page.query_selector_all('input[type="text"], input[type="number"], input:not([type])')
-            for inp in inputs:
-                if not inp.is_visible(): continue
+            return handler(page, selector, current_page_num, next_page)
+        except Exception as e:
+            logger.debug(f"Pagination strategy '{strategy}' failed: {e}")
+            return None
+
+    @staticmethod
+    def _element_selector(element, fallback: str) -> str:
+        element_id = element.get_attribute("id")
+        if not element_id:
+            return fallback
+        # Attribute form, so ids that aren't valid CSS identifiers still match
+        escaped = element_id.replace("\\", "\\\\").replace('"', '\\"')
+        return f'[id="{escaped}"]'
+
+    def _paginate_input(self, page, selector, current_page_num, next_page) -> Optional[str]:
+        selector = selector or PAGE_INPUT_SELECTOR
+        for inp in page.query_selector_all(selector):
+            try:
+                if not inp.is_visible():
+                    continue
                 val = inp.input_value()
-                if val and val.strip() == str(current_page_num):
-                    box = inp.bounding_box()
-                    if box and box['width'] > 150: continue 
-                    try:
-                        inp.click() 
-                        inp.fill(str(next_page))
-                        inp.press("Enter")
-                        page.wait_for_timeout(200)
-                        inp.press("Tab") 
-                        return True
-                    except: pass
-        except: pass
+                if not val or val.strip() != str(current_page_num):
+                    continue
+                box = inp.bounding_box()
+                if box and box['width'] > 150:
+                    continue
+                inp.click()
+                inp.fill(str(next_page))
+                inp.press("Enter")
+                inp.press("Tab")
+                return self._element_selector(inp, selector)
+            except Exception as e:
+                logger.debug(f"Page input candidate failed: {e}")
+        return None
 
-        # 2. STRATEGY: Dropdown (Select)
-        try:
-            selects = page.query_selector_all('select')
-            for select in selects:
-                if not select.is_visible(): continue
-                val = select.input_value()
-                if val == str(current_page_num):
-                     try:
-                        select.select_option(str(next_page))
-                        return True
-                     except: pass
-        except: pass
-        
-        # 3. STRATEGY: Next Button/Icon
-        try:
-            candidates = [
-                "button[title='Next Page']", "a[title='Next Page']", 
-                "button[aria-label='Next Page']", 
-                ".k-pager-nav.k-pager-last", ".next", ".next-page", 
-                "xpath=//a[contains(text(), 'Next')]", 
-                "xpath=//button[contains(text(), 'Next')]",
-                "xpath=//span[contains(@class, 'icon-next')]/.."
-            ]
-            for sel in candidates:
+    def _paginate_select(self, page, selector, current_page_num, next_page) -> Optional[str]:
+        selector = selector or "select"
+        for select in page.query_selector_all(selector):
+            try:
+                if not select.is_visible():
+                    continue
+                if select.input_value() == str(current_page_num):
+                    select.select_option(str(next_page))
+                    return self._element_selector(select, selector)
+            except Exception as e:
+                logger.debug(f"Page select candidate failed: {e}")
+        return None
+
+    def _paginate_button(self, page, selector, current_page_num, next_page) -> Optional[str]:
+        for sel in ((selector,) if selector else NEXT_BUTTON_SELECTORS):
+            try:
                 if page.is_visible(sel):
                     page.click(sel)
-                    return True
-        except: pass
-        
-        # 4. STRATEGY: Page Number Links
-        try:
-            link = page.get_by_role("link", name=str(next_page), exact=True)
-            if link.is_visible():
-                link.click()
-                return True
-            
-            btn = page.get_by_role("button", name=str(next_page), exact=True)
-            if btn.is_visible():
-                btn.click()
-                return True
-        except: pass
+                    return sel
+            except Exception as e:
+                logger.debug(f"Next button '{sel}' failed: {e}")
+        return None
 
-        return False
+    def _paginate_link(self, page, selector, current_page_num, next_page) -> Optional[str]:
+        for role in ((selector,) if selector else ("link", "button")):
+            try:
+                target = page.get_by_role(role, name=str(next_page), exact=True)
+                if target.is_visible():
+                    target.click()
+                    return role
+            except Exception as e:
+                logger.debug(f"Page number {role} failed: {e}")
+        return None
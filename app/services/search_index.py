@@ -0,0 +1,220 @@
+import logging
+import re
+import threading
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from app.db.models import Customer, CustomerType
+from app.utils.string_utils import normalize_business_name
+
+logger = logging.getLogger(__name__)
+
+
+class IndexedCustomer(NamedTuple):
+    """What autocomplete needs of a customer, without holding a DB session."""
+    id: int
+    type: str
+    name: Optional[str]
+    father_name: Optional[str]
+    business_name: Optional[str]
+    cnic: Optional[str]
+    phone: Optional[str]
+    address: Optional[str]
+
+
+def _type_value(customer_type) -> str:
+    return customer_type.value if hasattr(customer_type, "value") else str(customer_type or "")
+
+
+def _digits(value: str) -> str:
+    return re.sub(r"\D", "", value or "")
+
+
+def _name_keys(record: "IndexedCustomer") -> List[str]:
+    """Name and business name keyed from each word on, so 'ali' finds 'MUHAMMAD ALI'."""
+    keys = []
+    for text in (record.name, record.business_name):
+        words = [normalize_business_name(w) for w in (text or "").split()]
+        words = [w for w in words if w]
+        keys.extend("".join(words[i:]) for i in range(len(words)))
+    return keys
+
+
+class PrefixIndex:
+    """Sorted (key, id) pairs; a prefix lookup is a bisect plus a short scan."""
+
+    def __init__(self, pairs: Iterable[Tuple[str, int]] = ()):
+        self._pairs: List[Tuple[str, int]] = sorted(p for p in pairs if p[0])
+
+    def __len__(self):
+        return len(self._pairs)
+
+    def add(self, key: str, record_id: int):
+        if key:
+            insort(self._pairs, (key, record_id))
+
+    def remove(self, key: str, record_id: int):
+        i = bisect_left(self._pairs, (key, record_id))
+        if i < len(self._pairs) and self._pairs[i] == (key, record_id):
+            del self._pairs[i]
+
+    def prefix(self, prefix: str, limit: int) -> List[int]:
+        """IDs whose key starts with `prefix`, in key order, at most `limit`."""
+        ids = []
+        if not prefix:
+            return ids
+        i = bisect_left(self._pairs, (prefix,))
+        while i < len(self._pairs) and len(ids) < limit:
+            key, record_id = self._pairs[i]
+            if not key.startswith(prefix):
+                break
+            if record_id not in ids:
+                ids.append(record_id)
+            i += 1
+        return ids
+
+
+class CustomerSearchIndex:
+    """
+    In-memory prefix index over live customers for autocomplete.
+
+    Keys are normalized the same way as the uniqueness check
+    (normalize_business_name): dealer business names, customer names and
+    business names from every word on, and CNIC and phone digits. start_loading() builds it once on a worker thread; until
+    then `ready` is False and callers fall back to the database. Customer and
+    dealer writes go through upsert()/remove() so it stays current without
+    reloading.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._records: Dict[int, IndexedCustomer] = {}
+        self._business = PrefixIndex()
+        self._names = PrefixIndex()
+        self._cnics = PrefixIndex()
+        self._phones = PrefixIndex()
+        self._loading = False
+        # Changes seen while a load was running, replayed over its snapshot
+        self._pending: List[Tuple[str, object]] = []
+        self.ready = False
+
+    # ---- Loading ----
+
+    def start_loading(self) -> Optional[threading.Thread]:
+        with self._lock:
+            if self.ready or self._loading:
+                return None
+            self._loading = True
+            self._pending = []
+        thread = threading.Thread(target=self.load, daemon=True, name="customer-index")
+        thread.start()
+        return thread
+
+    def load(self):
+        """Reads every live customer once and swaps in a fresh index."""
+        from app.db.session import SessionLocal
+
+        with self._lock:
+            self._loading = True
+        db = SessionLocal()
+        try:
+            rows = db.query(
+                Customer.id, Customer.type, Customer.name, Customer.father_name,
+                Customer.business_name, Customer.cnic, Customer.phone, Customer.address
+            ).filter(Customer.is_deleted == False).all()
+        except Exception as e:
+            logger.error(f"Could not load customer search index: {e}")
+            with self._lock:
+                self._loading = False
+            return
+        finally:
+            db.close()
+
+        records = {row[0]: IndexedCustomer(row[0], _type_value(row[1]), *row[2:]) for row in rows}
+        with self._lock:
+            self._records = records
+            self._business = PrefixIndex((normalize_business_name(r.business_name), r.id)
+                                         for r in records.values() if r.type == CustomerType.DEALER.value)
+            self._names = PrefixIndex((key, r.id) for r in records.values() for key in _name_keys(r))
+            self._cnics = PrefixIndex((_digits(r.cnic), r.id) for r in records.values())
+            self._phones = PrefixIndex((_digits(r.phone), r.id) for r in records.values())
+            pending, self._pending = self._pending, []
+            self._loading = False
+            self.ready = True
+            for op, arg in pending:
+                if op == "upsert":
+                    self._apply_upsert(arg)
+                else:
+                    self._apply_remove(arg)
+        logger.info(f"Customer search index loaded ({len(records)} customers)")
+
+    # ---- Write hooks ----
+
+    def upsert(self, customer):
+        """Adds or refreshes a customer (any object with Customer's columns)."""
+        if customer is None:
+            return
+        if getattr(customer, "is_deleted", False):
+            self.remove(customer.id)
+            return
+        record = IndexedCustomer(
+            customer.id, _type_value(customer.type), customer.name, customer.father_name,
+            customer.business_name, customer.cnic, customer.phone, customer.address
+        )
+        with self._lock:
+            if self._loading:
+                self._pending.append(("upsert", record))
+            if self.ready:
+                self._apply_upsert(record)
+
+    def remove(self, customer_id: int):
+        with self._lock:
+            if self._loading:
+                self._pending.append(("remove", customer_id))
+            if self.ready:
+                self._apply_remove(customer_id)
+
+    def _apply_upsert(self, record: IndexedCustomer):
+        self._apply_remove(record.id)
+        self._records[record.id] = record
+        if record.type == CustomerType.DEALER.value:
+            self._business.add(normalize_business_name(record.business_name), record.id)
+        for key in _name_keys(record):
+            self._names.add(key, record.id)
+        self._cnics.add(_digits(record.cnic), record.id)
+        self._phones.add(_digits(record.phone), record.id)
+
+    def _apply_remove(self, customer_id: int):
+        old = self._records.pop(customer_id, None)
+        if old is None:
+            return
+        if old.type == CustomerType.DEALER.value:
+            self._business.remove(normalize_business_name(old.business_name), old.id)
+        for key in _name_keys(old):
+            self._names.remove(key, old.id)
+        self._cnics.remove(_digits(old.cnic), old.id)
+        self._phones.remove(_digits(old.phone), old.id)
+
+    # ---- Lookups ----
+
+    def search_dealers(self, query: str, limit: int = 5) -> List[IndexedCustomer]:
+        """Dealers whose normalized business name starts with the normalized query."""
+        with self._lock:
+            ids = self._business.prefix(normalize_business_name(query), limit)
+            return [self._records[i] for i in ids]
+
+    def search_customers(self, query: str, limit: int = 10) -> List[IndexedCustomer]:
+        """
+        Customers whose name or business name (from any word), CNIC or phone
+        starts with the query; newest first, like the database search.
+        """
+        with self._lock:
+            ids = []
+            digits = _digits(query)
+            if digits and digits == re.sub(r"[\s+-]", "", query):
+                ids += self._cnics.prefix(digits, limit) + self._phones.prefix(digits, limit)
+            ids += self._names.prefix(normalize_business_name(query), limit)
+            return [self._records[i] for i in sorted(set(ids), reverse=True)[:limit]]
+
+
+customer_index = CustomerSearchIndex()
@@ -1,4 +1,5 @@
 import os
+import threading
 from pathlib import Path
 from dotenv import load_dotenv
 from sqlalchemy.orm import Session
@@ -13,7 +14,15 @@ ENV_FILE = Path(__file__).resolve().parent.parent.parent / ".env"
 class SettingsService:
     def __init__(self):
         self.env_path = ENV_FILE
-        self._initialize_defaults()
+        # Default rows are created on first use, not at import time (before init_db has run)
+        self._defaults_ready = False
+        self._defaults_lock = threading.Lock()
+
+    def _ensure_defaults(self):
+        if not self._defaults_ready:
+            with self._defaults_lock:
+                if not self._defaults_ready:
+                    self._initialize_defaults()
 
     def _initialize_defaults(self):
         """Initialize default configurations in DB if they don't exist."""
@@ -62,6 +71,7 @@ class SettingsService:
                     # but here we specifically target the known bad default we shipped.
             
             db.commit()
+            self._defaults_ready = True
         except Exception as e:
             logger.error(f"Failed to initialize default settings: {e}")
             db.rollback()
@@ -94,6 +104,7 @@ class SettingsService:
         if env not in ("SANDBOX", "PRODUCTION"):
             raise ValueError("Environment must be SANDBOX or PRODUCTION")
         
+        self._ensure_defaults()
         db = SessionLocal()
         try:
             config = db.query(FBRConfiguration).filter_by(environment=env).first()
@@ -126,6 +137,7 @@ class SettingsService:
         if env not in ("SANDBOX", "PRODUCTION"):
             raise ValueError("Environment must be SANDBOX or PRODUCTION")
         
+        self._ensure_defaults()
         db = SessionLocal()
         try:
             # Set all to inactive first
@@ -147,6 +159,7 @@ class SettingsService:
             db.close()
 
     def get_active_environment(self) -> str:
+        self._ensure_defaults()
         db = SessionLocal()
         try:
             config = db.query(FBRConfiguration).filter_by(is_active=True).first()
@@ -156,6 +169,7 @@ class SettingsService:
 
     def get_environment(self, env: str) -> dict:
         env = env.upper()
+        self._ensure_defaults()
         db = SessionLocal()
         try:
             config = db.query(FBRConfiguration).filter_by(environment=env).first()
@@ -180,6 +194,7 @@ class SettingsService:
     
     def get_active_settings(self) -> dict:
         """Get the full configuration for the currently active environment."""
+        self._ensure_defaults()
         db = SessionLocal()
         try:
             config = db.query(FBRConfiguration).filter_by(is_active=True).first()
@@ -2,6 +2,8 @@ import customtkinter as ctk
 from tkinter import messagebox, ttk
 import logging
 from app.services.captured_data_service import captured_data_service
+from app.ui.data_loader import AsyncLoader
+from app.ui.tree_renderer import TreeRenderer
 import math
 
 logger = logging.getLogger(__name__)
@@ -19,6 +21,12 @@ class CapturedDataFrame(ctk.CTkFrame):
         self.total_pages = 1
         self.search_query = ""
         self.is_loading = False
+        # page_cursors[n] is the keyset cursor page n+1 starts after (None for page 1)
+        self.page_cursors = [None]
+        self.has_more = False
+        self.next_cursor = None
+        self.total_records = None
+        self.loader = AsyncLoader(self)
 
         # --- Header ---
         self.header_frame = ctk.CTkFrame(self, fg_color="transparent")
@@ -148,6 +156,7 @@ class CapturedDataFrame(ctk.CTkFrame):
         # Bindings
         self.tree.bind("<Button-1>", self.on_tree_click)
         self.tree.bind("<<TreeviewSelect>>", self.on_tree_select)
+        self.renderer = TreeRenderer(self.tree)
 
         # Scrollbars
         self.vsb = ttk.Scrollbar(self.table_frame, orient="vertical", command=self.tree.yview)
@@ -196,6 +205,7 @@ class CapturedDataFrame(ctk.CTkFrame):
 
     def reset_and_load(self):
         self.current_page = 1
+        self.page_cursors = [None]
         self.load_data()
 
     def prev_page(self):
@@ -204,7 +214,9 @@ class CapturedDataFrame(ctk.CTkFrame):
             self.load_data()
 
     def next_page(self):
-        if self.current_page < self.total_pages:
+        if self.has_more and self.next_cursor is not None:
+            del self.page_cursors[self.current_page:]
+            self.page_cursors.append(self.next_cursor)
             self.current_page += 1
             self.load_data()
 
@@ -325,70 +337,100 @@ class CapturedDataFrame(ctk.CTkFrame):
             self.delete_btn.configure(state="normal")
 
     def load_data(self):
-        if self.is_loading:
-            return
-        
+        """Fetches the current page on a worker thread; the window stays responsive."""
         self.is_loading = True
-        self.configure(cursor="watch")
-        self.update_idletasks() # Force UI update
+        self.search_query = self.search_var.get().strip()
+        search_query = self.search_query
+        cursor = self.page_cursors[self.current_page - 1]
+        per_page = self.per_page
+
+        def query():
+            result = captured_data_service.get_captured_page(
+                cursor=cursor,
+                per_page=per_page,
+                search_query=search_query
+            )
+            result['rows'] = [(
+                "☐", # Checkbox
+                record.id,
+                record.name or "-",
+                record.father or "-",
+                record.cnic or "-",
+                record.cell or "-",
+                record.chassis_number,
+                record.engine_number or "-",
+                record.model or "-",
+                record.color or "-",
+                record.created_at.strftime("%Y-%m-%d %H:%M") if record.created_at else "-"
+            ) for record in result.pop('data')]
+            return result
+
+        # A newer page or search supersedes this one
+        self.loader.load(query, self._show_page, on_error=self._show_load_error)
+
+        total = captured_data_service.get_total_count(
+            search_query,
+            on_ready=lambda n: self._after_safe(lambda: self._show_total(search_query, n))
+        )
+        self._show_total(search_query, total)
 
+    def _after_safe(self, callback):
         try:
-            self.search_query = self.search_var.get().strip()
-            
-            result = captured_data_service.get_captured_data(
-                page=self.current_page,
-                per_page=self.per_page,
-                search_query=self.search_query
-            )
+            self.after(0, callback)
+        except RuntimeError:
+            pass
 
-            # Clear tree
-            for item in self.tree.get_children():
-                self.tree.delete(item)
-            
-            self.prev_selection = set()
-            self.select_all_var.set(False)
+    def _show_load_error(self, error):
+        self.is_loading = False
+        logger.error(f"Error loading captured data: {error}")
+        messagebox.showerror("Error", f"Failed to load data: {error}")
 
-            # Populate tree
-            for record in result['data']:
-                self.tree.insert("", "end", values=(
-                    "☐", # Checkbox
-                    record.id,
-                    record.name or "-",
-                    record.father or "-",
-                    record.cnic or "-",
-                    record.cell or "-",
-                    record.chassis_number,
-                    record.engine_number or "-",
-                    record.model or "-",
-                    record.color or "-",
-                    record.created_at.strftime("%Y-%m-%d %H:%M") if record.created_at else "-"
-                ))
-
-            # Update pagination info
-            self.total_pages = result['total_pages']
-            self.total_records = result['total_records']
-            
-            self.page_label.configure(text=f"Page {self.current_page} of {self.total_pages}")
-            self.total_label.configure(text=f"Total Records: {self.total_records}")
+    def _show_page(self, result):
+        self.is_loading = False
 
-            # Update buttons state
-            if self.current_page <= 1:
-                self.prev_btn.configure(state="disabled")
-            else:
-                self.prev_btn.configure(state="normal")
+        # A reload starts unselected
+        self.tree.selection_remove(self.tree.selection())
+        self.prev_selection = set()
+        self.select_all_var.set(False)
 
-            if self.current_page >= self.total_pages:
-                self.next_btn.configure(state="disabled")
-            else:
-                self.next_btn.configure(state="normal")
+        # Populate tree, keyed on record ID so rows shared with the last page are kept
+        self.renderer.render(result['rows'], key=lambda values: values[1])
 
-        except Exception as e:
-            logger.error(f"Error loading captured data: {e}")
-            messagebox.showerror("Error", f"Failed to load data: {e}")
-        finally:
-            self.is_loading = False
-            self.configure(cursor="")
+        self.has_more = result['has_more']
+        self.next_cursor = result['next_cursor']
+        self._update_page_label()
+
+        # Update buttons state
+        if self.current_page <= 1:
+            self.prev_btn.configure(state="disabled")
+        else:
+            self.prev_btn.configure(state="normal")
+
+        if not self.has_more:
+            self.next_btn.configure(state="disabled")
+        else:
+            self.next_btn.configure(state="normal")
+
+    def _show_total(self, search_query, total):
+        if search_query != self.search_query or not self.winfo_exists():
+            return
+        self.total_records = total
+        if total is None:
+            self.total_label.configure(text="Total Records: counting...")
+        else:
+            self.total_pages = math.ceil(total / self.per_page) if total > 0 else 1
+            self.total_label.configure(text=f"Total Records: {total}")
+        self._update_page_label()
+
+    def _update_page_label(self):
+        if self.total_records is None:
+            self.page_label.configure(text=f"Page {self.current_page}")
+        else:
+            # The count may lag behind new captures; never show "Page 3 of 2"
+            self.page_label.configure(text=f"Page {self.current_page} of {max(self.total_pages, self.current_page)}")
 
     def destroy(self):
         # Cleanup
+        self.loader.cancel()
+        self.renderer.cancel()
         super().destroy()
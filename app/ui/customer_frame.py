@@ -4,6 +4,9 @@ import re
 import logging
 from app.services.customer_service import customer_service
 from app.db.models import CustomerType
+from app.ui.data_loader import AsyncLoader
+from app.ui.import_dialog import start_customer_import
+from app.ui.tree_renderer import TreeRenderer
 
 logger = logging.getLogger(__name__)
 
@@ -14,6 +17,7 @@ class CustomerFrame(ctk.CTkFrame):
         self.grid_rowconfigure(1, weight=1)
         self.selected_customer_id = None
         self.prev_selection = set()
+        self.loader = AsyncLoader(self)
 
         # Header
         self.header_frame = ctk.CTkFrame(self, fg_color="transparent")
@@ -27,6 +31,12 @@ class CustomerFrame(ctk.CTkFrame):
         self.toggle_btn = ctk.CTkButton(self.header_frame, text="Hide Form", width=100, command=self.toggle_form)
         self.toggle_btn.pack(side="left", padx=20)
 
+        self.import_btn = ctk.CTkButton(self.header_frame, text="Import...", width=100, command=self.import_customers)
+        self.import_btn.pack(side="left")
+
+        self.duplicates_btn = ctk.CTkButton(self.header_frame, text="Duplicates...", width=100, command=self.open_duplicates)
+        self.duplicates_btn.pack(side="left", padx=10)
+
         # Search Bar
         self.search_var = ctk.StringVar()
         self.search_var.trace_add("write", self.on_search)
@@ -267,27 +277,47 @@ class CustomerFrame(ctk.CTkFrame):
         # Bind events
         self.tree.bind("<Button-1>", self.on_tree_click)
         self.tree.bind("<<TreeviewSelect>>", self.on_select)
+        self.renderer = TreeRenderer(self.tree)
+
+    def import_customers(self):
+        # Rows are INDIVIDUAL unless the file has a Type column saying DEALER
+        start_customer_import(self, self.import_btn, on_finished=self.load_customers)
+
+    def open_duplicates(self):
+        from app.ui.duplicate_customers_dialog import DuplicateCustomersDialog
+        DuplicateCustomersDialog(self, on_merged=self.load_customers)
+
+    def load_customers(self, delay_ms=0):
+        """Queries customers on a worker thread and fills the list when they arrive."""
+        search = self.search_var.get().strip()
+
+        def query():
+            if search:
+                customers = customer_service.search_customers(search)
+            else:
+                customers = customer_service.get_all_customers()
+            return [("☐", c.id, c.name, c.cnic, c.phone, c.type.value if hasattr(c.type, 'value') else c.type, c.address)
+                    for c in customers]
 
-    def load_customers(self):
-        # Clear existing
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        self.loader.load(query, self._show_customers, on_error=self._show_load_error, delay_ms=delay_ms)
+
+    def _show_customers(self, rows):
+        # A reload starts unselected, as when the list was rebuilt from scratch
+        self.tree.selection_remove(self.tree.selection())
             
         # Reset Select All
         self.select_all_var.set(False)
             
-        # Fetch
-        query = self.search_var.get().strip()
-        if query:
-            customers = customer_service.search_customers(query)
-        else:
-            customers = customer_service.get_all_customers()
-            
-        for c in customers:
-            self.tree.insert("", "end", values=("☐", c.id, c.name, c.cnic, c.phone, c.type.value if hasattr(c.type, 'value') else c.type, c.address))
+        # Only rows that changed are touched; big lists fill in over several idle turns
+        self.renderer.render(rows, key=lambda values: values[1])
+
+    def _show_load_error(self, error):
+        logger.error(f"Error loading customers: {error}")
+        messagebox.showerror("Error", f"Failed to load customers: {error}")
 
     def on_search(self, *args):
-        self.load_customers()
+        # Wait for a pause in typing; each keystroke supersedes the last query
+        self.load_customers(delay_ms=300)
 
     def on_tree_click(self, event):
         """Handle click on checkbox column."""
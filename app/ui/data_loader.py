@@ -0,0 +1,99 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from app.db.session import ScopedSession
+
+logger = logging.getLogger(__name__)
+
+# Shared by every frame; list queries are short, a few threads is plenty
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="ui-loader")
+
+
+class AsyncLoader:
+    """
+    Runs a frame's list query on a worker pool and delivers the result on the
+    Tk thread through after().
+
+    Each load() supersedes the previous one from the same loader: a query that
+    hasn't started is cancelled, and the result of one that is already running
+    is dropped, so only the latest keystroke or filter ever reaches the tree.
+
+    Queries should return plain values (tuples/dicts) rather than ORM objects:
+    the worker's scoped session is removed after each query, which detaches
+    whatever it loaded.
+    """
+
+    def __init__(self, widget):
+        self.widget = widget
+        self._generation = 0
+        self._future = None
+        self._after_job = None
+
+    @property
+    def busy(self) -> bool:
+        return self._future is not None and not self._future.done()
+
+    def load(self, query: Callable[[], Any], on_result: Callable[[Any], None],
+             on_error: Optional[Callable[[Exception], None]] = None, delay_ms: int = 0):
+        """
+        Runs query() on the pool, then on_result(result) on the Tk thread.
+        With delay_ms, waits that long first (debounce) and restarts the wait
+        on every call.
+        """
+        self.cancel()
+        generation = self._generation
+
+        def submit():
+            self._after_job = None
+            self._future = _executor.submit(self._run, generation, query, on_result, on_error)
+
+        if delay_ms > 0:
+            self._after_job = self.widget.after(delay_ms, submit)
+        else:
+            submit()
+
+    def cancel(self):
+        """Drops any pending or running load."""
+        self._generation += 1
+        if self._after_job is not None:
+            try:
+                self.widget.after_cancel(self._after_job)
+            except Exception:
+                pass
+            self._after_job = None
+        if self._future is not None:
+            self._future.cancel()  # Only stops it if not started yet
+            self._future = None
+
+    def _run(self, generation, query, on_result, on_error):
+        if generation != self._generation:
+            return
+        try:
+            result, error = query(), None
+        except Exception as e:
+            logger.error(f"Background load failed: {e}", exc_info=True)
+            result, error = None, e
+        finally:
+            ScopedSession.remove()
+
+        if generation != self._generation:
+            return
+        try:
+            self.widget.after(0, lambda: self._deliver(generation, result, error, on_result, on_error))
+        except RuntimeError:
+            pass  # Widget destroyed while loading
+
+    def _deliver(self, generation, result, error, on_result, on_error):
+        if generation != self._generation:
+            return
+        try:
+            if not self.widget.winfo_exists():
+                return
+        except Exception:
+            return
+        if error is not None:
+            if on_error:
+                on_error(error)
+            return
+        on_result(result)
@@ -2,6 +2,8 @@ import customtkinter as ctk
 from tkinter import messagebox, ttk, Menu
 import re
 from app.services.dealer_service import dealer_service
+from app.db.models import CustomerType
+from app.ui.import_dialog import start_customer_import
 
 class DealerFrame(ctk.CTkFrame):
     def __init__(self, master, **kwargs):
@@ -14,6 +16,9 @@ class DealerFrame(ctk.CTkFrame):
         self.header = ctk.CTkLabel(self, text="Dealer Management", font=ctk.CTkFont(size=24, weight="bold"))
         self.header.grid(row=0, column=0, padx=20, pady=20, sticky="w")
 
+        self.import_btn = ctk.CTkButton(self, text="Import...", width=100, command=self.import_dealers)
+        self.import_btn.grid(row=0, column=0, padx=20, pady=20, sticky="e")
+
         # Main Content Area (Split into Form and List)
         self.content_frame = ctk.CTkFrame(self, fg_color="transparent")
         self.content_frame.grid(row=1, column=0, padx=20, pady=0, sticky="nsew")
@@ -385,6 +390,9 @@ class DealerFrame(ctk.CTkFrame):
         for d in dealers:
             self.tree.insert("", "end", values=(d.id, d.business_name, d.cnic, d.phone))
 
+    def import_dealers(self):
+        start_customer_import(self, self.import_btn, CustomerType.DEALER, on_finished=self.load_dealers)
+
     def show_context_menu(self, event):
         item = self.tree.identify_row(event.y)
         if item:
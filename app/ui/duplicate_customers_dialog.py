@@ -0,0 +1,120 @@
+import customtkinter as ctk
+from tkinter import ttk, messagebox
+import logging
+
+from app.services.customer_dedup_service import customer_dedup_service
+from app.ui.data_loader import AsyncLoader
+from app.ui.tree_renderer import TreeRenderer
+
+logger = logging.getLogger(__name__)
+
+
+class DuplicateCustomersDialog(ctk.CTkToplevel):
+    """Review of suggested duplicate customers: merge or dismiss in bulk."""
+
+    def __init__(self, parent, on_merged=None):
+        super().__init__(parent)
+        self.title("Duplicate Customers")
+        self.geometry("1000x550")
+        self.transient(parent)
+        self.grab_set()
+        self.on_merged = on_merged
+        self.loader = AsyncLoader(self)
+
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(1, weight=1)
+
+        header = ctk.CTkFrame(self, fg_color="transparent")
+        header.grid(row=0, column=0, padx=20, pady=(20, 10), sticky="ew")
+        ctk.CTkLabel(header, text="Possible Duplicates", font=ctk.CTkFont(size=20, weight="bold")).pack(side="left")
+        self.status_label = ctk.CTkLabel(header, text="", text_color="gray")
+        self.status_label.pack(side="left", padx=15)
+        self.scan_btn = ctk.CTkButton(header, text="Scan Again", width=110, command=self.scan)
+        self.scan_btn.pack(side="right")
+
+        tree_frame = ctk.CTkFrame(self)
+        tree_frame.grid(row=1, column=0, padx=20, pady=0, sticky="nsew")
+        columns = ("score", "keep_id", "keep_name", "keep_cnic", "merge_id", "merge_name", "merge_cnic", "reasons")
+        self.tree = ttk.Treeview(tree_frame, columns=columns, show="headings", selectmode="extended")
+        headings = {
+            "score": ("Score", 60), "keep_id": ("Keep ID", 60), "keep_name": ("Keep", 160),
+            "keep_cnic": ("CNIC", 120), "merge_id": ("Merge ID", 70), "merge_name": ("Duplicate", 160),
+            "merge_cnic": ("CNIC", 120), "reasons": ("Why", 220),
+        }
+        for col, (text, width) in headings.items():
+            self.tree.heading(col, text=text)
+            self.tree.column(col, width=width)
+        scrollbar = ttk.Scrollbar(tree_frame, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side="right", fill="y")
+        self.tree.pack(side="left", fill="both", expand=True)
+        self.renderer = TreeRenderer(self.tree)
+
+        actions = ctk.CTkFrame(self, fg_color="transparent")
+        actions.grid(row=2, column=0, padx=20, pady=20, sticky="ew")
+        ctk.CTkButton(actions, text="Merge Selected", fg_color="#2E7D32", hover_color="#1B5E20",
+                      command=self.merge_selected).pack(side="left", padx=5)
+        ctk.CTkButton(actions, text="Not Duplicates", fg_color="gray",
+                      command=self.dismiss_selected).pack(side="left", padx=5)
+        ctk.CTkButton(actions, text="Close", command=self.destroy).pack(side="right", padx=5)
+
+        self.load_suggestions()
+
+    def _selected_ids(self):
+        return [int(iid.split(":", 1)[1]) for iid in self.tree.selection()]
+
+    def load_suggestions(self):
+        self.status_label.configure(text="Loading...")
+        self.loader.load(customer_dedup_service.get_pending_suggestions, self._show_suggestions,
+                         on_error=self._show_error)
+
+    def _show_suggestions(self, rows):
+        self.status_label.configure(text=f"{len(rows)} suggestion(s)")
+        # The suggestion id rides along after the visible columns as the row key
+        self.renderer.render([(f"{r[1]:.0%}",) + tuple(r[2:]) + (r[0],) for r in rows], key=lambda row: row[-1])
+
+    def _show_error(self, error):
+        self.scan_btn.configure(state="normal")
+        self.status_label.configure(text="")
+        messagebox.showerror("Error", f"Could not load duplicates: {error}", parent=self)
+
+    def scan(self):
+        self.scan_btn.configure(state="disabled")
+        self.status_label.configure(text="Scanning customers...")
+
+        def done(count):
+            self.scan_btn.configure(state="normal")
+            self.load_suggestions()
+
+        self.loader.load(customer_dedup_service.find_duplicates, done, on_error=self._show_error)
+
+    def merge_selected(self):
+        ids = self._selected_ids()
+        if not ids:
+            return
+        if not messagebox.askyesno("Confirm Merge", f"Merge {len(ids)} selected pair(s)?\n"
+                                   "Invoices move to the kept customer and the duplicate is deleted.", parent=self):
+            return
+        success, message = customer_dedup_service.merge_suggestions(ids)
+        if success:
+            messagebox.showinfo("Success", message, parent=self)
+            if self.on_merged:
+                self.on_merged()
+        else:
+            messagebox.showerror("Error", message, parent=self)
+        self.load_suggestions()
+
+    def dismiss_selected(self):
+        ids = self._selected_ids()
+        if not ids:
+            return
+        try:
+            customer_dedup_service.dismiss_suggestions(ids)
+        except Exception as e:
+            messagebox.showerror("Error", f"Could not dismiss: {e}", parent=self)
+        self.load_suggestions()
+
+    def destroy(self):
+        self.loader.cancel()
+        self.renderer.cancel()
+        super().destroy()
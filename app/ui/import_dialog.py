@@ -0,0 +1,54 @@
+import logging
+from tkinter import filedialog, messagebox
+from typing import Callable, Optional
+
+from app.services.customer_import_service import customer_import_service
+from app.ui.data_loader import AsyncLoader
+
+logger = logging.getLogger(__name__)
+
+
+def start_customer_import(frame, button, customer_type: Optional[str] = None,
+                          on_finished: Optional[Callable[[], None]] = None):
+    """
+    Asks for a CSV/Excel file and imports it on a worker thread. `button` is
+    disabled while the import runs; on_finished() runs afterwards (e.g. to
+    reload the list). Rejected rows can be saved as a CSV report.
+    """
+    path = filedialog.askopenfilename(
+        title="Import from CSV or Excel",
+        filetypes=[("Spreadsheets", "*.csv *.xlsx"), ("CSV Files", "*.csv"), ("Excel Files", "*.xlsx")]
+    )
+    if not path:
+        return
+
+    label = button.cget("text")
+    button.configure(state="disabled", text="Importing...")
+
+    def restore():
+        button.configure(state="normal", text=label)
+        if on_finished:
+            on_finished()
+
+    def on_result(result):
+        restore()
+        if not result.errors:
+            messagebox.showinfo("Import Complete", result.summary())
+            return
+        if messagebox.askyesno("Import Complete", f"{result.summary()}\n\nSave a report of the rejected rows?"):
+            report = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV Files", "*.csv")],
+                                                  initialfile="import_errors.csv")
+            if report:
+                try:
+                    result.write_report(report)
+                except Exception as e:
+                    messagebox.showerror("Error", f"Could not save report: {e}")
+
+    def on_error(error):
+        restore()
+        messagebox.showerror("Import Failed", str(error))
+
+    # The button stays disabled until on_result/on_error, so a running import is never superseded
+    if not hasattr(frame, "_import_loader"):
+        frame._import_loader = AsyncLoader(frame)
+    frame._import_loader.load(lambda: customer_import_service.import_file(path, customer_type), on_result, on_error)
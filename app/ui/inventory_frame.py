@@ -4,7 +4,10 @@ from tkinter import messagebox, ttk, filedialog, Menu
 from app.db.session import SessionLocal
 from app.db.models import Motorcycle, Supplier, ProductModel
 from app.services.scraper_service import HondaScraper
+from app.services.scrape_worker import get_scrape_worker, load_known_chassis
 from app.utils.url_manager import UrlManager
+from app.ui.data_loader import AsyncLoader
+from app.ui.tree_renderer import TreeRenderer
 from sqlalchemy import or_
 from app.services.price_service import price_service
 
@@ -129,6 +132,8 @@ class InventoryFrame(ctk.CTkFrame):
         
         self.prev_selection = set()
         self.selected_ids = set() # Global set of selected IDs (int)
+        self.loader = AsyncLoader(self)
+        self.renderer = TreeRenderer(self.tree)
 
         # Refresh Data
         self.refresh_inventory()
@@ -287,54 +292,69 @@ class InventoryFrame(ctk.CTkFrame):
         self.refresh_inventory(search_text, status)
 
     def refresh_inventory(self, search_query=None, status_filter="All"):
-        # Clear current items
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        self.prev_selection = set()
-            
-        db = SessionLocal()
-        try:
-            query = db.query(Motorcycle).join(ProductModel)
-            
-            # Apply Filters
-            if status_filter and status_filter != "All":
-                query = query.filter(Motorcycle.status == status_filter)
+        """Queries the stock list and totals on a worker thread, then fills the tree."""
+        def query():
+            db = SessionLocal()
+            try:
+                query = db.query(
+                    Motorcycle.id, ProductModel.make, ProductModel.model_name, Motorcycle.chassis_number,
+                    Motorcycle.engine_number, Motorcycle.color, Motorcycle.sale_price, Motorcycle.status
+                ).join(ProductModel)
                 
-            if search_query:
-                search = f"%{search_query}%"
-                query = query.filter(
-                    or_(
-                        Motorcycle.chassis_number.ilike(search),
-                        Motorcycle.engine_number.ilike(search),
-                        ProductModel.model_name.ilike(search),
-                        ProductModel.make.ilike(search)
+                # Apply Filters
+                if status_filter and status_filter != "All":
+                    query = query.filter(Motorcycle.status == status_filter)
+                    
+                if search_query:
+                    search = f"%{search_query}%"
+                    query = query.filter(
+                        or_(
+                            Motorcycle.chassis_number.ilike(search),
+                            Motorcycle.engine_number.ilike(search),
+                            ProductModel.model_name.ilike(search),
+                            ProductModel.make.ilike(search)
+                        )
                     )
-                )
-            
-            bikes = query.all()
-            for bike in bikes:
-                self.tree.insert("", "end", values=(
-                    bike.id, bike.product_model.make, bike.product_model.model_name, bike.chassis_number, 
-                    bike.engine_number, bike.color, f"{bike.sale_price:,.0f}", bike.status, "☐"
-                ))
-            
-            self.update_stats()
-            self.restore_selection() # Restore selection state for visible items
-        finally:
-            db.close()
+                
+                rows = [
+                    (bike_id, make, model_name, chassis, engine, color, f"{sale_price:,.0f}", status, "☐")
+                    for bike_id, make, model_name, chassis, engine, color, sale_price, status in query.all()
+                ]
+                return rows, self._query_stats(db)
+            finally:
+                db.close()
 
-    def update_stats(self):
-        db = SessionLocal()
+        self.loader.load(query, self._show_inventory,
+                         on_error=lambda e: messagebox.showerror("Error", f"Failed to load inventory: {e}"))
+
+    def _show_inventory(self, result):
+        rows, stats = result
+        self.prev_selection = set()
+        self.update_stats(stats)
+
+        # Diffed on motorcycle ID; selection state is restored once all rows are in
+        self.renderer.render(rows, key=lambda values: values[0], on_done=self.restore_selection)
+
+    def _query_stats(self, db):
         try:
             in_stock = db.query(Motorcycle).filter(Motorcycle.status == "IN_STOCK").count()
             sold = db.query(Motorcycle).filter(Motorcycle.status == "SOLD").count()
-            
-            self.lbl_stock.configure(text=f"In Stock: {in_stock}")
-            self.lbl_sold.configure(text=f"Sold: {sold}")
+            return in_stock, sold
         except Exception:
-            pass
-        finally:
-            db.close()
+            return None
+
+    def update_stats(self, stats=None):
+        if stats is None:
+            db = SessionLocal()
+            try:
+                stats = self._query_stats(db)
+            finally:
+                db.close()
+        if stats is None:
+            return
+        in_stock, sold = stats
+        self.lbl_stock.configure(text=f"In Stock: {in_stock}")
+        self.lbl_sold.configure(text=f"Sold: {sold}")
 
     def edit_selected_motorcycle(self, event=None):
         selected_items = self.tree.selection()
@@ -502,9 +522,22 @@ class WebImportDialog(ctk.CTkToplevel):
         self.sale_entry.pack(side="left", padx=5)
         
         # 3. Scrape Action
+        scrape_options = ctk.CTkFrame(self, fg_color="transparent")
+        scrape_options.grid(row=5, column=0, padx=20, pady=5, sticky="w")
+
         self.pagination_var = ctk.BooleanVar(value=True)
-        self.pagination_check = ctk.CTkCheckBox(self, text="Scrape All Pages (Max 50)", variable=self.pagination_var)
-        self.pagination_check.grid(row=5, column=0, padx=20, pady=5)
+        self.pagination_check = ctk.CTkCheckBox(scrape_options, text="Scrape All Pages (Max 50)", variable=self.pagination_var)
+        self.pagination_check.pack(anchor="w", pady=2)
+
+        # Walks from the newest page and stops once a page holds only bikes already in stock
+        self.incremental_var = ctk.BooleanVar(value=False)
+        self.incremental_check = ctk.CTkCheckBox(scrape_options, text="Only New Stock (Resume)", variable=self.incremental_var)
+        self.incremental_check.pack(anchor="w", pady=2)
+
+        # Scrapes in a separate headless browser (reusing this login) so form capture stays usable
+        self.background_var = ctk.BooleanVar(value=False)
+        self.background_check = ctk.CTkCheckBox(scrape_options, text="Run in Background (Headless)", variable=self.background_var)
+        self.background_check.pack(anchor="w", pady=2)
 
         self.scrape_btn = ctk.CTkButton(self, text="2. Scrape Page", command=self.start_scrape, state="disabled")
         self.scrape_btn.grid(row=5, column=1, columnspan=3, padx=20, pady=20)
@@ -521,6 +554,14 @@ class WebImportDialog(ctk.CTkToplevel):
         # Handle close
         self.protocol("WM_DELETE_WINDOW", self.on_close)
 
+        # Show what a scheduled/background scrape found since the dialog was last open
+        worker = get_scrape_worker(create=False)
+        pending = worker.take_last_result() if worker else None
+        if pending and pending["items"]:
+            found_at = pending["finished_at"].strftime("%H:%M")
+            self.info_label.configure(text=f"Background scrape at {found_at} found {len(pending['items'])} items. Review and import below.")
+            self.after(0, lambda: self._on_scrape_complete(pending["items"]))
+
     def toggle_password_visibility(self):
         if self.show_password_var.get():
             self.password_entry.configure(show="")
@@ -594,8 +635,18 @@ class WebImportDialog(ctk.CTkToplevel):
 
         def scrape_worker():
             try:
-                if self.pagination_var.get():
-                    new_data = self.scraper.scrape_all_pages(max_pages=1000, status_callback=update_status)
+                if self.background_var.get():
+                    background_scraper = get_scrape_worker()
+                    list_url = background_scraper.use_capture_login()
+                    background_scraper.remember_list_url(list_url)
+                    new_data = background_scraper.scrape_stock(
+                        list_url, incremental=self.incremental_var.get(), status_callback=update_status
+                    )
+                    background_scraper.take_last_result()
+                elif self.incremental_var.get():
+                    new_data = self.scraper.scrape_incremental(load_known_chassis(), max_pages=1000, status_callback=update_status)
+                elif self.pagination_var.get():
+                    new_data = self.scraper.scrape_all_pages(max_pages=1000, status_callback=update_status, workers=4)
                 else:
                     new_data = self.scraper.scrape_current_page()
                 
@@ -629,7 +680,12 @@ class WebImportDialog(ctk.CTkToplevel):
                 self.scrape_btn.configure(state="normal", text="2. Scrape Page")
                 return
                 
-            preview_text = f"Total Items: {len(self.scraped_data)} (Added New: {added_count})\n\n"
+            preview_text = f"Total Items: {len(self.scraped_data)} (Added New: {added_count})\n"
+            stats = self.scraper.last_resource_stats
+            if stats and stats["saved_bytes"]:
+                skipped = sum(stats["blocked"].values()) + sum(stats["stubbed"].values())
+                preview_text += f"Skipped {skipped} heavy requests (~{stats['saved_bytes'] / 1_000_000:.1f} MB)\n"
+            preview_text += "\n"
             for i, item in enumerate(self.scraped_data):
                 page_info = f"[Page {item.get('page_number', '?')}] " if item.get('page_number') else ""
                 preview_text += f"{i+1}. {page_info}{item['model']} - {item['color']} (Eng: {item['engine_number']}, Chas: {item['chassis_number']})\n"
@@ -3,40 +3,42 @@ from tkinter import messagebox, filedialog
 import re
 from datetime import datetime
 import requests
-import qrcode
 from PIL import Image
 from tenacity import RetryError
-from app.db.session import SessionLocal, init_db
+from app.db.session import SessionLocal, ReadSessionLocal, init_db
+from sqlalchemy import func
 from app.services.invoice_service import invoice_service
 from app.services.price_service import price_service
 from app.services.settings_service import settings_service
 from app.services.ocr_service import ocr_service
 from app.api.schemas import InvoiceCreate, InvoiceItemCreate
-from app.ui.inventory_frame import InventoryFrame
-from app.ui.reports_frame import ReportsFrame
-from app.ui.dealer_frame import DealerFrame
-from app.ui.customer_frame import CustomerFrame
-from app.ui.print_invoice_frame import PrintInvoiceFrame
-from app.ui.price_list_dialog import PriceListDialog
-from app.ui.fbr_settings_dialog import FBRSettingsDialog
-from app.ui.db_settings_dialog import DatabaseSettingsDialog
-from app.ui.backup_frame import BackupFrame
-from app.ui.spare_ledger_frame import SpareLedgerFrame
 from app.services.dealer_service import dealer_service
+from app.services.customer_service import customer_service, normalize_cnic
 from app.services.backup_service import backup_service
-from app.services.form_capture_service import form_capture_service
-from app.services.update_service import UpdateService
 from app.services.sync_service import sync_service
-from app.ui.captured_data_frame import CapturedDataFrame
 from app.ui.welcome_frame import WelcomeFrame
 from app.ui.autocomplete_entry import AutocompleteEntry
+from app.ui.data_loader import AsyncLoader
 from app.ui.stock_summary_frame import StockSummaryFrame
-from app.excise.ui.excise_frame import ExciseFrame
 
 from app.utils.price_data import price_manager
 import app.core.config as config
+import importlib
+import sys
 import threading
 
+# Deferred screens warmed up after startup, most likely first
+WARMUP_FRAMES = ("inventory", "reports", "customer", "dealer", "captured_data")
+FRAME_MODULES = {
+    "inventory": "app.ui.inventory_frame",
+    "reports": "app.ui.reports_frame",
+    "customer": "app.ui.customer_frame",
+    "dealer": "app.ui.dealer_frame",
+    "captured_data": "app.ui.captured_data_frame",
+}
+WARMUP_DELAY_MS = 2000
+WARMUP_STEP_MS = 300
+
 ctk.set_appearance_mode("System")
 ctk.set_default_color_theme("blue")
 
@@ -121,22 +123,30 @@ class App(ctk.CTk):
         self.create_menu_bar()
         
         self.create_home_frame()
-        self.create_inventory_frame()
         self.create_invoice_frame()
-        self.create_reports_frame()
-        self.create_dealer_frame()
-        self.create_customer_frame()
-        self.create_print_frame()
-        self.create_backup_frame()
-        self.create_spare_ledger_frame()
-        self.create_captured_data_frame()
-        self.create_excise_frame()
+
+        # Every other screen is built the first time select_frame_by_name targets it
+        self._frame_factories = {
+            "inventory": ("inventory_frame", self.create_inventory_frame),
+            "reports": ("reports_frame", self.create_reports_frame),
+            "dealer": ("dealer_frame", self.create_dealer_frame),
+            "customer": ("customer_frame", self.create_customer_frame),
+            "print_invoice": ("print_invoice_frame", self.create_print_frame),
+            "backup": ("backup_frame", self.create_backup_frame),
+            "spare_ledger": ("spare_ledger_frame", self.create_spare_ledger_frame),
+            "captured_data": ("captured_data_frame", self.create_captured_data_frame),
+            "excise": ("excise_frame", self.create_excise_frame),
+        }
 
         self.select_frame_by_name("home")
         
         # Show Welcome Screen
         self.create_welcome_frame()
         
+        # Build likely-next screens once the window is idle
+        self.after(WARMUP_DELAY_MS, self.start_frame_warmup)
+        self.after(WARMUP_DELAY_MS, self.start_background_services)
+
         # Start Backup Scheduler if enabled
         backup_service.start_scheduler()
         # Start ledger auto-close daily check
@@ -158,9 +168,19 @@ class App(ctk.CTk):
     def on_closing(self):
         """Clean up resources before closing"""
         try:
-            form_capture_service.stop_capture_session()
+            # Only stop the browser if the capture service was ever loaded
+            capture_module = sys.modules.get("app.services.form_capture_service")
+            if capture_module:
+                capture_module.form_capture_service.stop_capture_session()
         except Exception as e:
             print(f"Error stopping capture: {e}")
+        try:
+            worker_module = sys.modules.get("app.services.scrape_worker")
+            worker = worker_module.get_scrape_worker(create=False) if worker_module else None
+            if worker:
+                worker.stop()
+        except Exception as e:
+            print(f"Error stopping scrape worker: {e}")
         try:
             sync_service.stop()
         except Exception as e:
@@ -438,6 +458,7 @@ class App(ctk.CTk):
     def check_updates(self):
         """Checks for software updates from git."""
         try:
+            from app.services.update_service import UpdateService
             updater = UpdateService()
             available, msg = updater.check_for_updates()
             
@@ -456,6 +477,7 @@ class App(ctk.CTk):
             messagebox.showerror("Update Error", f"Failed to check for updates:\n{str(e)}")
 
     def create_spare_ledger_frame(self):
+        from app.ui.spare_ledger_frame import SpareLedgerFrame
         self.spare_ledger_frame = SpareLedgerFrame(self)
         self.spare_ledger_frame.grid(row=0, column=1, sticky="nsew")
         self.spare_ledger_frame.grid_forget()
@@ -645,7 +667,7 @@ class App(ctk.CTk):
         threading.Thread(target=self._refresh_stats_thread, daemon=True).start()
 
     def _refresh_stats_thread(self):
-        db = SessionLocal()
+        db = ReadSessionLocal()
         try:
             data = {}
             # Count Motorcycles (In Stock)
@@ -655,8 +677,7 @@ class App(ctk.CTk):
             data['sold'] = db.query(Motorcycle).filter(Motorcycle.status == "SOLD").count()
             
             # Sum Invoices
-            invoices = db.query(Invoice).all()
-            data['sales'] = sum(inv.total_amount for inv in invoices)
+            data['sales'] = db.query(func.coalesce(func.sum(Invoice.total_amount), 0.0)).scalar()
             
             # FBR Success
             data['fbr_success'] = db.query(Invoice).filter(Invoice.fbr_invoice_number != None).count()
@@ -1592,24 +1613,27 @@ class App(ctk.CTk):
              self.auto_fill_customer_by_cnic(cnic)
 
     def auto_fill_customer_by_cnic(self, cnic):
-        """Fetches customer details from the last invoice with this CNIC."""
-        db = SessionLocal()
-        try:
-            invoice = invoice_service.get_last_invoice_by_cnic(db, cnic)
-            if invoice:
-                # Populate fields
-                if invoice.buyer_name:
-                    self.buyer_name_var.set(invoice.buyer_name)
-                if invoice.buyer_father_name:
-                    self.father_name_var.set(invoice.buyer_father_name)
-                if invoice.buyer_phone:
-                    self.buyer_cell_var.set(invoice.buyer_phone)
-                if invoice.buyer_address:
-                    self.buyer_address_var.set(invoice.buyer_address)
-        except Exception as e:
-            print(f"Error fetching customer by CNIC: {e}")
-        finally:
-            db.close()
+        """Fills buyer details for a known CNIC; the lookup runs off the UI thread."""
+        if not hasattr(self, "cnic_loader"):
+            self.cnic_loader = AsyncLoader(self)
+        self.cnic_loader.load(
+            lambda: customer_service.get_customer_profile(cnic),
+            lambda profile: self._apply_customer_profile(cnic, profile),
+            on_error=lambda e: logger.error(f"Error fetching customer by CNIC: {e}")
+        )
+
+    def _apply_customer_profile(self, cnic, profile):
+        # The field may have been edited again while the lookup ran
+        if profile is None or normalize_cnic(self.buyer_cnic_var.get()) != normalize_cnic(cnic):
+            return
+        if profile.name:
+            self.buyer_name_var.set(profile.name)
+        if profile.father_name:
+            self.father_name_var.set(profile.father_name)
+        if profile.phone:
+            self.buyer_cell_var.set(profile.phone)
+        if profile.address:
+            self.buyer_address_var.set(profile.address)
 
     def display_qr_code(self, data):
         logging.info(f"Displaying QR Code for data: {data}")
@@ -1619,6 +1643,7 @@ class App(ctk.CTk):
         
         try:
             # Generate QR
+            import qrcode
             qr = qrcode.QRCode(version=1, box_size=10, border=2)
             qr.add_data(data)
             qr.make(fit=True)
@@ -1751,34 +1776,42 @@ class App(ctk.CTk):
         self.after(100, lambda: self.buyer_cnic_entry.focus_set())
 
     def create_inventory_frame(self):
+        from app.ui.inventory_frame import InventoryFrame
         self.inventory_frame = InventoryFrame(self, corner_radius=0, fg_color="transparent")
         self.inventory_frame.grid_columnconfigure(0, weight=1)
 
     def create_reports_frame(self):
+        from app.ui.reports_frame import ReportsFrame
         self.reports_frame = ReportsFrame(self, corner_radius=0, fg_color="transparent")
         self.reports_frame.grid_columnconfigure(0, weight=1)
 
     def create_dealer_frame(self):
+        from app.ui.dealer_frame import DealerFrame
         self.dealer_frame = DealerFrame(self, corner_radius=0, fg_color="transparent")
         self.dealer_frame.grid_columnconfigure(0, weight=1)
 
     def create_customer_frame(self):
+        from app.ui.customer_frame import CustomerFrame
         self.customer_frame = CustomerFrame(self, corner_radius=0, fg_color="transparent")
         self.customer_frame.grid_columnconfigure(0, weight=1)
 
     def create_print_frame(self):
+        from app.ui.print_invoice_frame import PrintInvoiceFrame
         self.print_invoice_frame = PrintInvoiceFrame(self, corner_radius=0, fg_color="transparent")
         self.print_invoice_frame.grid_columnconfigure(0, weight=1)
 
     def create_backup_frame(self):
+        from app.ui.backup_frame import BackupFrame
         self.backup_frame = BackupFrame(self, corner_radius=0, fg_color="transparent")
         self.backup_frame.grid_columnconfigure(0, weight=1)
 
     def create_captured_data_frame(self):
+        from app.ui.captured_data_frame import CapturedDataFrame
         self.captured_data_frame = CapturedDataFrame(self, corner_radius=0, fg_color="transparent")
         self.captured_data_frame.grid_columnconfigure(0, weight=1)
 
     def create_excise_frame(self):
+        from app.excise.ui.excise_frame import ExciseFrame
         self.excise_frame = ExciseFrame(self, corner_radius=0, fg_color="transparent")
         self.excise_frame.grid_columnconfigure(0, weight=1)
 
@@ -1793,11 +1826,79 @@ class App(ctk.CTk):
             self.welcome_frame.destroy()
             del self.welcome_frame
 
+    def _ensure_frame(self, name):
+        """Builds a deferred frame if it doesn't exist yet. Returns True if it was just built."""
+        factory = self._frame_factories.get(name)
+        if not factory:
+            return False
+        attr, create = factory
+        if getattr(self, attr, None) is not None:
+            return False
+        create()
+        return True
+
+    def start_frame_warmup(self):
+        """
+        Imports the likely-next screens and primes the price cache on a worker thread,
+        then builds those frames one at a time while the UI is idle.
+        """
+        def preload():
+            for name in WARMUP_FRAMES:
+                try:
+                    importlib.import_module(FRAME_MODULES[name])
+                except Exception as e:
+                    logger.error(f"Warm-up import failed for {name}: {e}")
+            try:
+                price_service.get_all_active_prices()
+            except Exception as e:
+                logger.error(f"Warm-up price preload failed: {e}")
+            self._warmup_queue = list(WARMUP_FRAMES)
+            self.after(0, self._warmup_next_frame)
+
+        threading.Thread(target=preload, daemon=True).start()
+
+    def start_background_services(self):
+        """Starts the configured background jobs on a worker thread, once the window is idle."""
+        def start():
+            try:
+                # Scheduled headless stock scrapes, if set up in capture_config.json
+                from app.services.scrape_worker import start_scheduled_scrape
+                start_scheduled_scrape()
+            except Exception as e:
+                logger.error(f"Could not start scheduled stock scrape: {e}")
+            try:
+                # Dealer autocomplete switches from the DB to memory once this is built
+                from app.services.search_index import customer_index
+                customer_index.start_loading()
+            except Exception as e:
+                logger.error(f"Could not start loading the customer index: {e}")
+            try:
+                # Periodic hard delete of long soft-deleted rows
+                from app.services.purge_service import purge_service
+                purge_service.start_configured_schedule()
+            except Exception as e:
+                logger.error(f"Could not start purge schedule: {e}")
+
+        threading.Thread(target=start, daemon=True, name="startup-services").start()
+
+    def _warmup_next_frame(self):
+        if not self._warmup_queue:
+            return
+        name = self._warmup_queue.pop(0)
+        try:
+            self._ensure_frame(name)
+        except Exception as e:
+            logger.error(f"Warm-up build failed for {name}: {e}")
+        self.after(WARMUP_STEP_MS, lambda: self.after_idle(self._warmup_next_frame))
+
     def select_frame_by_name(self, name):
         self.current_frame_name = name
         # Close any open menu first
         self.close_menu()
 
+        # Constructors load their own data, so skip the refresh on the first show
+        just_built = self._ensure_frame(name)
+
         # Define Frame Mapping: Name -> (Frame Instance, Refresh Callback)
         frames = {
             "home": (getattr(self, "home_frame", None), None),
@@ -1852,7 +1953,7 @@ class App(ctk.CTk):
         self._visible_frame = target_frame
         
         # 4. Run Refresh Action
-        if refresh_action:
+        if refresh_action and not just_built:
             try:
                 self.after(10, refresh_action)
             except Exception as e:
@@ -1909,22 +2010,29 @@ class App(ctk.CTk):
         self.select_frame_by_name("excise")
 
     def open_price_list(self):
+        from app.ui.price_list_dialog import PriceListDialog
         PriceListDialog(self)
 
     def open_fbr_settings(self):
+        from app.ui.fbr_settings_dialog import FBRSettingsDialog
         FBRSettingsDialog(self)
 
     def open_db_settings(self):
+        from app.ui.db_settings_dialog import DatabaseSettingsDialog
         DatabaseSettingsDialog(self)
 
     def form_capture_button_event(self):
         """Launch the Browser for Import / Capture"""
+        from app.services.form_capture_service import form_capture_service
         if form_capture_service.is_running:
              messagebox.showinfo("Browser Running", "The browser is already running.\nYou can use 'Import' or 'Capture' features now.")
              return
 
         # Default to Atlas Honda Portal base URL
         target_url = "https://dealers.ahlportal.com"
+
+        # Submissions are written in the background; hear back when they land
+        form_capture_service.processor.add_listener(self.on_capture_saved)
         
         try:
             form_capture_service.start_capture_session(target_url)
@@ -1932,6 +2040,21 @@ class App(ctk.CTk):
         except Exception as e:
             messagebox.showerror("Error", f"Failed to launch browser: {e}")
 
+    def on_capture_saved(self, record, error):
+        """Called by the capture writer thread, so must use after to update UI safely"""
+        if self.winfo_exists():
+            self.after(0, lambda: self._show_capture_saved(record, error))
+
+    def _show_capture_saved(self, record, error):
+        if not self.winfo_exists(): return
+        chassis = record.get("chassis_number")
+        if error:
+            messagebox.showerror("Capture Not Saved", f"Captured form for chassis {chassis} could not be saved:\n{error}")
+            return
+        logger.info(f"Captured form for chassis {chassis} saved")
+        if getattr(self, "current_frame_name", None) == "captured_data" and getattr(self, "captured_data_frame", None):
+            self.captured_data_frame.load_data()
+
     def _populate_bike_details(self, bike):
         """Helper to populate form fields from bike object"""
         # Auto-fill Engine
@@ -2037,24 +2160,13 @@ class App(ctk.CTk):
         
         # If CNIC is incomplete (assuming 15 chars with dashes), clear fields
         if not cnic or len(cnic) < 15: 
+            if hasattr(self, "cnic_loader"):
+                self.cnic_loader.cancel()
             self.buyer_name_var.set("")
             self.father_name_var.set("")
             self.buyer_cell_var.set("")
             self.buyer_address_var.set("")
-            return
-            
-        db = SessionLocal()
-        try:
-            customer = db.query(Customer).filter(Customer.cnic == cnic).first()
-            if customer:
-                self.buyer_name_var.set(customer.name)
-                self.father_name_var.set(customer.father_name or "")
-                self.buyer_cell_var.set(customer.phone or "")
-                self.buyer_address_var.set(customer.address or "")
-        except Exception as e:
-            print(f"CNIC Auto-fill error: {e}")
-        finally:
-            db.close()
+        # A complete CNIC is looked up by validate_cnic_input -> perform_cnic_lookup
 
     def on_chassis_key_release(self, event=None):
         """Handle key release for suggestion logic"""
@@ -2,12 +2,14 @@ import customtkinter as ctk
 from tkinter import messagebox, filedialog, ttk
 import csv
 from datetime import datetime
-from app.db.session import SessionLocal
+from app.db.session import ReadSessionLocal
 from app.db.models import Invoice, Motorcycle, Customer, ProductModel, InvoiceItem
 from sqlalchemy import or_
 from sqlalchemy.orm import joinedload
 from app.services.print_service import print_service
+from app.services.report_service import report_service
 from app.ui.calendar_dialog import CalendarDialog
+from app.ui.tree_renderer import TreeRenderer
 
 class ReportsFrame(ctk.CTkFrame):
     def __init__(self, master, **kwargs):
@@ -136,6 +138,7 @@ class ReportsFrame(ctk.CTkFrame):
         
         # Bind double click
         self.sales_tree.bind("<Double-1>", self.show_sales_detail)
+        self.sales_renderer = TreeRenderer(self.sales_tree)
 
     def setup_inventory_tab(self):
         self.tab_inventory.grid_columnconfigure(0, weight=1)
@@ -188,6 +191,7 @@ class ReportsFrame(ctk.CTkFrame):
         
         self.inv_tree.pack(side="left", fill="both", expand=True)
         v_scroll.config(command=self.inv_tree.yview)
+        self.inv_renderer = TreeRenderer(self.inv_tree)
 
     def toggle_date_inputs(self, choice):
         if choice == "Custom":
@@ -215,16 +219,8 @@ class ReportsFrame(ctk.CTkFrame):
         self.load_inventory()
 
     def load_sales(self):
-        # Clear existing items
-        for item in self.sales_tree.get_children():
-            self.sales_tree.delete(item)
-            
-        db = SessionLocal()
+        db = ReadSessionLocal()
         try:
-            query = db.query(Invoice).join(Customer).options(
-                joinedload(Invoice.items).joinedload(InvoiceItem.motorcycle)
-            ).order_by(Invoice.datetime.desc())
-            
             # Apply Filters
             search_text = self.sales_search.get().strip()
             status_filter = self.sales_status_var.get()
@@ -258,68 +254,11 @@ class ReportsFrame(ctk.CTkFrame):
                     except ValueError:
                         pass
 
-            if start_date:
-                query = query.filter(Invoice.datetime >= start_date)
-            if end_date:
-                query = query.filter(Invoice.datetime <= end_date)
+            query = report_service.sales_query(db, status_filter, search_text, start_date, end_date)
+            rows = report_service.sales_rows(query.all())
 
-            if search_text:
-                search = f"%{search_text}%"
-                query = query.outerjoin(Invoice.items).outerjoin(InvoiceItem.motorcycle).filter(
-                    or_(
-                        Invoice.invoice_number.ilike(search),
-                        Customer.name.ilike(search),
-                        Customer.cnic.ilike(search),
-                        Motorcycle.chassis_number.ilike(search),
-                        Motorcycle.engine_number.ilike(search)
-                    )
-                )
-                
-            if status_filter == "Synced":
-                query = query.filter(Invoice.is_fiscalized == True)
-            elif status_filter == "Pending":
-                query = query.filter(Invoice.is_fiscalized == False, Invoice.sync_status != "FAILED")
-            elif status_filter == "Failed":
-                query = query.filter(Invoice.sync_status == "FAILED")
-            
-            invoices = query.all()
-            
-            for inv in invoices:
-                date_str = inv.datetime.strftime("%Y-%m-%d %H:%M")
-                
-                # Determine Status and Tag
-                if inv.is_fiscalized:
-                    status = "Synced"
-                    tag = "synced"
-                elif inv.sync_status == "FAILED":
-                    status = "Failed"
-                    tag = "failed"
-                else:
-                    status = "Pending"
-                    tag = "pending"
-                
-                buyer_name = inv.customer.name if inv.customer else "N/A"
-                
-                # Get chassis and engine numbers
-                chassis_list = []
-                engine_list = []
-                for item in inv.items:
-                    if item.motorcycle:
-                        chassis_list.append(item.motorcycle.chassis_number or "")
-                        engine_list.append(item.motorcycle.engine_number or "")
-                
-                chassis_str = ", ".join(filter(None, chassis_list))
-                engine_str = ", ".join(filter(None, engine_list))
-                
-                self.sales_tree.insert("", "end", values=(
-                    date_str,
-                    inv.invoice_number,
-                    buyer_name,
-                    chassis_str,
-                    engine_str,
-                    f"{inv.total_amount:,.2f}",
-                    status
-                ), tags=(tag,))
+            # Keyed on invoice number: a refresh only touches changed invoices
+            self.sales_renderer.render(rows, key=lambda values: values[1], tags=lambda values: (values[6].lower(),))
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load sales: {e}")
@@ -355,7 +294,7 @@ class ReportsFrame(ctk.CTkFrame):
         if not inv_map:
             return
             
-        db = SessionLocal()
+        db = ReadSessionLocal()
         try:
             invoices = db.query(Invoice.invoice_number, Invoice.is_fiscalized, Invoice.sync_status).filter(
                 Invoice.invoice_number.in_(inv_map.keys())
@@ -389,11 +328,7 @@ class ReportsFrame(ctk.CTkFrame):
             db.close()
 
     def load_inventory(self):
-        # Clear existing items
-        for item in self.inv_tree.get_children():
-            self.inv_tree.delete(item)
-            
-        db = SessionLocal()
+        db = ReadSessionLocal()
         try:
             query = db.query(Motorcycle).options(joinedload(Motorcycle.product_model))
             
@@ -416,14 +351,14 @@ class ReportsFrame(ctk.CTkFrame):
             
             bikes = query.all()
             
-            for bike in bikes:
-                self.inv_tree.insert("", "end", values=(
-                    bike.chassis_number,
-                    bike.engine_number,
-                    bike.product_model.model_name if bike.product_model else "Unknown",
-                    bike.color,
-                    bike.status
-                ))
+            rows = [(
+                bike.chassis_number,
+                bike.engine_number,
+                bike.product_model.model_name if bike.product_model else "Unknown",
+                bike.color,
+                bike.status
+            ) for bike in bikes]
+            self.inv_renderer.render(rows, key=lambda values: values[0])
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load inventory: {e}")
@@ -435,7 +370,7 @@ class ReportsFrame(ctk.CTkFrame):
         if not filename:
             return
             
-        db = SessionLocal()
+        db = ReadSessionLocal()
         try:
             invoices = db.query(Invoice).options(
                 joinedload(Invoice.customer),
@@ -486,7 +421,7 @@ class ReportsFrame(ctk.CTkFrame):
         self.configure(cursor="wait")
         self.update_idletasks()
         
-        db = SessionLocal()
+        db = ReadSessionLocal()
         try:
             inv = db.query(Invoice).options(
                 joinedload(Invoice.customer), 
@@ -743,7 +678,7 @@ class ReportsFrame(ctk.CTkFrame):
         # Values are (chassis, engine, model, color, status)
         chassis = item['values'][0]
         
-        db = SessionLocal()
+        db = ReadSessionLocal()
         try:
             bike = db.query(Motorcycle).options(
                 joinedload(Motorcycle.product_model),
@@ -819,7 +754,7 @@ class ReportsFrame(ctk.CTkFrame):
         # Values are (Date, Invoice #, Buyer, Total, Status)
         invoice_number = str(item['values'][1]) 
         
-        db = SessionLocal()
+        db = ReadSessionLocal()
         try:
             invoice = db.query(Invoice).filter(Invoice.invoice_number == invoice_number).options(
                 joinedload(Invoice.customer),
@@ -845,7 +780,7 @@ class ReportsFrame(ctk.CTkFrame):
         if not filename:
             return
             
-        db = SessionLocal()
+        db = ReadSessionLocal()
         try:
             bikes = db.query(Motorcycle).options(joinedload(Motorcycle.product_model)).all()
             with open(filename, 'w', newline='') as f:
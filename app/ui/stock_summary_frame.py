@@ -1,6 +1,6 @@
 import customtkinter as ctk
 import threading
-from app.db.session import SessionLocal
+from app.db.session import ReadSessionLocal
 from app.db.models import Motorcycle, ProductModel
 from sqlalchemy import func
 
@@ -81,7 +81,7 @@ class StockSummaryFrame(ctk.CTkFrame):
         threading.Thread(target=self._load_data_thread, daemon=True).start()
 
     def _load_data_thread(self):
-        session = SessionLocal()
+        session = ReadSessionLocal()
         try:
             # Query to get stock count per model
             # Filter by status='IN_STOCK' and join with ProductModel
@@ -0,0 +1,110 @@
+import logging
+import time
+from typing import Any, Callable, Hashable, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Longest one idle callback spends inserting rows before yielding to Tk
+CHUNK_BUDGET_MS = 15
+
+
+def _normalize(values) -> tuple:
+    # Tk hands values back as strings (or ints); compare on the string form
+    return tuple("" if v is None else str(v) for v in values)
+
+
+class TreeRenderer:
+    """
+    Fills a ttk.Treeview without freezing the window on large result sets.
+
+    Rows are written in time-sliced chunks from after_idle(), so input and
+    redraws are handled between chunks. With a `key`, each row's item id is
+    derived from it and a refresh is a diff: rows no longer present are
+    removed in one delete() call, changed rows are updated in place, and
+    unchanged rows are left alone. Without a key the tree is cleared in one
+    delete() call and refilled.
+
+    A new render() cancels one that is still in progress.
+    """
+
+    def __init__(self, tree, budget_ms: int = CHUNK_BUDGET_MS):
+        self.tree = tree
+        self.budget = budget_ms / 1000.0
+        self._job = None
+        self._generation = 0
+
+    @property
+    def busy(self) -> bool:
+        return self._job is not None
+
+    def cancel(self):
+        self._generation += 1
+        if self._job is not None:
+            try:
+                self.tree.after_cancel(self._job)
+            except Exception:
+                pass
+            self._job = None
+
+    def render(self, rows: Sequence[Sequence[Any]], key: Optional[Callable[[Sequence[Any]], Hashable]] = None,
+               tags: Optional[Callable[[Sequence[Any]], tuple]] = None, on_done: Optional[Callable[[], None]] = None):
+        """
+        Shows `rows` (sequences of column values) in order. key(row) identifies a
+        row across refreshes; tags(row) gives its Treeview tags. on_done() runs
+        once every row is in place.
+        """
+        self.cancel()
+        generation = self._generation
+
+        if key is None:
+            children = self.tree.get_children()
+            if children:
+                self.tree.delete(*children)
+            items = [(None, row) for row in rows]
+        else:
+            items, seen = [], set()
+            for row in rows:
+                iid = f"k:{key(row)}"
+                if iid in seen:
+                    continue  # Duplicate key; item ids must be unique
+                seen.add(iid)
+                items.append((iid, row))
+            stale = [iid for iid in self.tree.get_children() if iid not in seen]
+            if stale:
+                self.tree.delete(*stale)
+
+        self._step(generation, items, 0, tags, on_done)
+
+    def _step(self, generation, items, start, tags, on_done):
+        self._job = None
+        if generation != self._generation:
+            return
+        try:
+            if not self.tree.winfo_exists():
+                return
+        except Exception:
+            return
+
+        deadline = time.perf_counter() + self.budget
+        index = start
+        while index < len(items):
+            iid, row = items[index]
+            row_tags = tags(row) if tags else ()
+            if iid is not None and self.tree.exists(iid):
+                if _normalize(self.tree.item(iid, "values")) != _normalize(row):
+                    self.tree.item(iid, values=row, tags=row_tags)
+                if self.tree.index(iid) != index:
+                    self.tree.move(iid, "", index)
+            elif iid is not None:
+                self.tree.insert("", index, iid=iid, values=row, tags=row_tags)
+            else:
+                self.tree.insert("", "end", values=row, tags=row_tags)
+            index += 1
+            if time.perf_counter() >= deadline:
+                break
+
+        if index < len(items):
+            self._job = self.tree.after_idle(lambda: self._step(generation, items, index, tags, on_done))
+            return
+        if on_done:
+            on_done()
@@ -0,0 +1,33 @@
+import shutil
+
+from app.services.backup_service import BackupService
+
+
+def _backup_service(work_dir, db_copy):
+    service = BackupService()
+    service.config.local_path = str(work_dir / "backups")
+    service.config.cloud_path = ""
+    service.config.retention_days = 0
+    # Work on a copy so the restore never overwrites the database the other benchmarks use
+    service.get_db_path = lambda: db_copy
+    return service
+
+
+def test_backup_create(benchmark, bench_db_path, work_dir):
+    db_copy = work_dir / "backup_source.db"
+    shutil.copy2(bench_db_path, db_copy)
+    service = _backup_service(work_dir, db_copy)
+
+    result = benchmark(service.create_backup, is_manual=True)
+    assert result["success"], result["message"]
+
+
+def test_backup_restore(benchmark, bench_db_path, work_dir):
+    db_copy = work_dir / "restore_target.db"
+    shutil.copy2(bench_db_path, db_copy)
+    service = _backup_service(work_dir, db_copy)
+    created = service.create_backup(is_manual=True)
+    assert created["success"], created["message"]
+
+    result = benchmark(service.restore_backup, created["path"])
+    assert result["success"], result["message"]
@@ -0,0 +1,60 @@
+import threading
+
+from app.db.models import CapturedData
+from app.services.captured_data_service import CapturedDataService
+
+
+def _search_term(db, dataset):
+    """Chassis of a live row from the middle of the seeded set, whatever the --bench-scale."""
+    row = (db.query(CapturedData).filter(CapturedData.is_deleted == False)
+           .order_by(CapturedData.id).offset(dataset["captured"] // 2).first())
+    return row.chassis_number
+
+
+def _last_cursor(service, per_page=20):
+    """Walks the keyset cursor to the last page, as paging through the screen would."""
+    cursor = None
+    while True:
+        page = service.get_captured_page(cursor=cursor, per_page=per_page)
+        if not page["has_more"]:
+            return cursor
+        cursor = page["next_cursor"]
+
+
+def _count(service, search_query=None):
+    """Runs the background count once, skipping the cache."""
+    service.invalidate_counts()
+    done = threading.Event()
+    totals = []
+    service.get_total_count(search_query, on_ready=lambda total: (totals.append(total), done.set()))
+    done.wait(timeout=60)
+    return totals[0] if totals else None
+
+
+def test_captured_data_first_page(benchmark, dataset):
+    service = CapturedDataService()
+    result = benchmark(service.get_captured_page, per_page=20)
+    assert len(result["data"]) == 20
+    service.close()
+
+
+def test_captured_data_deep_page(benchmark, dataset):
+    service = CapturedDataService()
+    cursor = _last_cursor(service)
+    result = benchmark(service.get_captured_page, cursor=cursor, per_page=20)
+    assert result["data"]
+    service.close()
+
+
+def test_captured_data_search(benchmark, dataset, db):
+    service = CapturedDataService()
+    result = benchmark(service.get_captured_page, per_page=20, search_query=_search_term(db, dataset))
+    assert result["data"]
+    service.close()
+
+
+def test_captured_data_total_count(benchmark, dataset):
+    service = CapturedDataService()
+    total = benchmark(_count, service)
+    assert total
+    service.close()
@@ -0,0 +1,56 @@
+from datetime import datetime
+
+from app.api.fbr_client import FBRClient
+
+SETTINGS = {"pos_id": "123456", "pct_code": "8711.2010"}
+
+
+def _invoice_data(item_count: int) -> dict:
+    items = [
+        {
+            "item_code": f"CD70-{i}",
+            "item_name": "Honda CD70",
+            "quantity": 1,
+            "tax_rate": 18.0,
+            "sale_value": 133813.56,
+            "tax_charged": 24086.44,
+            "further_tax": 0.0,
+            "total_amount": 157900.0,
+            "pct_code": "8711.2010",
+            "discount": 0.0,
+        }
+        for i in range(item_count)
+    ]
+    return {
+        "invoice_number": "BENCH-0001",
+        "datetime": datetime(2026, 1, 1, 10, 30),
+        "buyer_name": "ALI KHAN",
+        "buyer_cnic": "35202-1234567-1",
+        "buyer_phone": "03001234567",
+        "total_amount": 157900.0 * item_count,
+        "total_quantity": item_count,
+        "total_sale_value": 133813.56 * item_count,
+        "total_tax_charged": 24086.44 * item_count,
+        "payment_mode": "Cash",
+        "items": items,
+    }
+
+
+def _transform_and_validate(client, data):
+    payload = client._transform_to_fbr_format(data, SETTINGS)
+    client._validate_payload(payload)
+    return payload
+
+
+def test_transform_and_validate_single_item(benchmark):
+    client = FBRClient()
+    data = _invoice_data(1)
+    payload = benchmark(lambda: [_transform_and_validate(client, data) for _ in range(1000)])
+    assert payload[-1]["POSID"] == 123456
+
+
+def test_transform_and_validate_fifty_items(benchmark):
+    client = FBRClient()
+    data = _invoice_data(50)
+    payload = benchmark(lambda: [_transform_and_validate(client, data) for _ in range(100)])
+    assert len(payload[-1]["items"]) == 50
@@ -0,0 +1,42 @@
+import itertools
+from datetime import datetime
+
+from app.api.schemas import InvoiceCreate, InvoiceItemCreate
+from app.services.invoice_service import InvoiceService
+
+_counter = itertools.count(1)
+
+
+def _next_invoice() -> InvoiceCreate:
+    n = next(_counter)
+    return InvoiceCreate(
+        invoice_number=f"BENCH-INV-{n:06d}",
+        datetime=datetime.now(),
+        buyer_name="ALI KHAN",
+        buyer_father_name="AHMED KHAN",
+        buyer_cnic=f"35202-{n:07d}-1",
+        buyer_phone="03001234567",
+        buyer_address="HOUSE 1 LAHORE",
+        payment_mode="Cash",
+        items=[
+            InvoiceItemCreate(
+                item_code="CD70",
+                item_name="Honda CD70",
+                pct_code="8711.2010",
+                quantity=1,
+                tax_rate=18.0,
+                sale_value=133813.56,
+                tax_charged=24086.44,
+                chassis_number=f"BENCH-CH-{n:07d}",
+                engine_number=f"BENCH-EN-{n:07d}",
+                model_name="CD70",
+                color="RED",
+            )
+        ],
+    )
+
+
+def test_create_invoice_with_stub_sync(benchmark, db, fbr_stub):
+    service = InvoiceService()
+    invoice = benchmark(lambda: service.create_invoice(db, _next_invoice()), rounds=20)
+    assert invoice.sync_status == "SYNCED"
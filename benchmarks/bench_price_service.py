@@ -0,0 +1,13 @@
+from app.services.price_service import PriceService
+
+
+def test_get_active_price(benchmark, dataset):
+    service = PriceService()
+    price = benchmark(lambda: [service.get_active_price(m) for m in ("CD70", "CG125", "CB150F") * 20])
+    assert price[0] is not None
+
+
+def test_get_price_by_model_and_color(benchmark, dataset):
+    service = PriceService()
+    price = benchmark(lambda: [service.get_price_by_model_and_color("CB125F", c) for c in ("BLUE", "RED", "GREEN") * 20])
+    assert price[0] is not None
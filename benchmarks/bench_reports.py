@@ -0,0 +1,27 @@
+from datetime import datetime
+
+from app.services.report_service import report_service
+
+
+def _sales_query(db, status_filter="All", search_text="", start_date=None):
+    """The query and row building ReportsFrame.load_sales runs."""
+    query = report_service.sales_query(db, status_filter, search_text, start_date)
+    return report_service.sales_rows(query.all())
+
+
+def test_sales_report_all(benchmark, db):
+    rows = benchmark(lambda: (db.expire_all(), _sales_query(db))[1])
+    assert rows
+
+
+def test_sales_report_pending(benchmark, db):
+    benchmark(lambda: (db.expire_all(), _sales_query(db, status_filter="Pending"))[1])
+
+
+def test_sales_report_search(benchmark, db):
+    rows = benchmark(lambda: (db.expire_all(), _sales_query(db, search_text="SYN-CH-00001"))[1])
+    assert rows
+
+
+def test_sales_report_date_range(benchmark, db):
+    benchmark(lambda: (db.expire_all(), _sales_query(db, start_date=datetime(2025, 12, 1)))[1])
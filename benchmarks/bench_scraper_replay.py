@@ -0,0 +1,47 @@
+import pytest
+
+from benchmarks.portal_replay import HeadlessPortalSession, ReplayServer, generate_fixture
+
+PAGES = 10
+ROWS_PER_PAGE = 20
+
+
+@pytest.fixture(scope="module", params=["input", "button"])
+def replay(request, work_dir):
+    fixture_dir = work_dir / f"portal_{request.param}"
+    generate_fixture(fixture_dir, pages=PAGES, rows_per_page=ROWS_PER_PAGE, pager=request.param)
+
+    session = HeadlessPortalSession()
+    try:
+        session.start()
+    except Exception as e:
+        pytest.skip(f"Headless Chromium not available: {e}")
+
+    with ReplayServer(fixture_dir, latency="fixed:0.02") as server:
+        yield server, session
+    session.stop()
+
+
+def _scraper(session):
+    from app.services.scraper_service import HondaScraper
+    return HondaScraper(capture_service=session)
+
+
+def test_scrape_all_pages_replay(benchmark, replay):
+    server, session = replay
+    scraper = _scraper(session)
+
+    def open_list():
+        session.page.goto(server.list_url)
+        session.page.wait_for_selector("tbody tr")
+
+    items = benchmark(scraper.scrape_all_pages, max_pages=PAGES, setup=open_list, rounds=3)
+    assert len(items) == PAGES * ROWS_PER_PAGE
+
+
+def test_detect_total_pages_replay(benchmark, replay):
+    server, session = replay
+    scraper = _scraper(session)
+    session.page.goto(server.list_url)
+
+    assert benchmark(scraper.detect_total_pages) == PAGES
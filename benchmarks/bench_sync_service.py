@@ -0,0 +1,22 @@
+from app.db.models import Invoice
+from app.services.sync_service import SyncService
+
+QUEUE_SIZE = 200
+
+
+def _requeue(db):
+    """Marks a fixed block of invoices as PENDING so every round drains the same queue."""
+    db.query(Invoice).update({Invoice.sync_status: "SYNCED"}, synchronize_session=False)
+    ids = [row.id for row in db.query(Invoice.id).order_by(Invoice.id.asc()).limit(QUEUE_SIZE)]
+    db.query(Invoice).filter(Invoice.id.in_(ids)).update(
+        {Invoice.sync_status: "PENDING", Invoice.is_fiscalized: False}, synchronize_session=False
+    )
+    db.commit()
+
+
+def test_sync_queue_drain(benchmark, db, fbr_stub):
+    service = SyncService()
+    benchmark(service._process_queue, setup=lambda: _requeue(db), rounds=3)
+
+    db.expire_all()
+    assert db.query(Invoice).filter(Invoice.sync_status == "PENDING").count() == 0
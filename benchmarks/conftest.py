@@ -0,0 +1,232 @@
+"""
+Benchmark harness for the core hot paths.
+
+The suite runs against a throw-away SQLite database filled with the synthetic
+dataset from benchmarks/dataset.py and a local FBR stub server, so it never
+touches fbr_invoices.db or the real FBR endpoints.
+
+Usage:
+    # Record results
+    python -m pytest benchmarks -q --bench-json=bench_results.json
+
+    # Compare against a previous run, fail if any median is >25% slower
+    python -m pytest benchmarks -q --bench-compare=bench_results.json --bench-threshold=0.25
+
+Benchmarks only run when the benchmarks directory is passed explicitly, so a
+plain `pytest` from the project root keeps running the unit tests only.
+"""
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+BENCH_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = BENCH_DIR.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+# Point the application at a scratch database BEFORE any app module is imported.
+# app.core.config reads DB_URL at import time and every service binds to it.
+_WORK_DIR = Path(tempfile.mkdtemp(prefix="fbr_bench_"))
+BENCH_DB_PATH = _WORK_DIR / "bench.db"
+os.environ["DB_SERVER"] = ""
+os.environ["DB_URL"] = f"sqlite:///{BENCH_DB_PATH.as_posix()}"
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+DEFAULT_ROUNDS = 5
+DEFAULT_THRESHOLD = 0.20
+
+_results = {}
+_regressions = []
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("benchmarks")
+    group.addoption("--bench-json", action="store", default=None,
+                    help="Write benchmark results to this JSON file.")
+    group.addoption("--bench-compare", action="store", default=None,
+                    help="Compare results against a previously saved JSON file.")
+    group.addoption("--bench-threshold", action="store", type=float, default=DEFAULT_THRESHOLD,
+                    help="Allowed slowdown of the median as a fraction (0.20 = 20%%).")
+    group.addoption("--bench-rounds", action="store", type=int, default=DEFAULT_ROUNDS,
+                    help="Timed rounds per benchmark.")
+    group.addoption("--bench-scale", action="store", type=float, default=1.0,
+                    help="Multiplier for the synthetic dataset size.")
+
+
+def _explicitly_requested(config) -> bool:
+    """True if the benchmarks directory (or a file in it) was passed on the command line."""
+    for arg in config.invocation_params.args:
+        path = Path(str(arg).split("::")[0])
+        if not path.is_absolute():
+            path = Path(config.invocation_params.dir) / path
+        try:
+            path.resolve().relative_to(BENCH_DIR)
+            return True
+        except ValueError:
+            continue
+    return False
+
+
+def pytest_collect_file(file_path, parent):
+    if file_path.suffix == ".py" and file_path.name.startswith("bench_"):
+        if _explicitly_requested(parent.config):
+            return pytest.Module.from_parent(parent, path=file_path)
+    return None
+
+
+class BenchmarkRunner:
+    """
+    Callable fixture object. Times `func` for a number of rounds and records
+    min/max/mean/median/stddev under the test's name.
+    """
+
+    def __init__(self, name: str, rounds: int):
+        self.name = name
+        self.rounds = rounds
+
+    def __call__(self, func, *args, setup=None, rounds=None, warmup=1, **kwargs):
+        rounds = rounds or self.rounds
+
+        for _ in range(warmup):
+            if setup:
+                setup()
+            func(*args, **kwargs)
+
+        timings = []
+        result = None
+        for _ in range(rounds):
+            if setup:
+                setup()
+            start = time.perf_counter()
+            result = func(*args, **kwargs)
+            timings.append(time.perf_counter() - start)
+
+        _results[self.name] = {
+            "rounds": rounds,
+            "min": min(timings),
+            "max": max(timings),
+            "mean": statistics.fmean(timings),
+            "median": statistics.median(timings),
+            "stddev": statistics.stdev(timings) if len(timings) > 1 else 0.0,
+        }
+        return result
+
+
+@pytest.fixture
+def benchmark(request):
+    rounds = request.config.getoption("--bench-rounds", DEFAULT_ROUNDS)
+    return BenchmarkRunner(request.node.name, rounds)
+
+
+@pytest.fixture(scope="session")
+def dataset(request):
+    """Creates the schema and loads the synthetic dataset once per session."""
+    from app.db import session as db_session
+    from benchmarks.dataset import populate
+
+    db_session.init_db()
+    db = db_session.SessionLocal()
+    try:
+        sizes = populate(db, scale=request.config.getoption("--bench-scale", 1.0))
+    finally:
+        db.close()
+    return sizes
+
+
+@pytest.fixture(scope="session")
+def fbr_stub(dataset):
+    """Starts the local FBR stub and makes it the active SANDBOX endpoint."""
+    from app.services.settings_service import settings_service
+    from benchmarks.fbr_stub_server import StubServer
+
+    server = StubServer().start()
+    settings_service._initialize_defaults()
+    settings_service.save_environment(
+        "SANDBOX", server.base_url, "123456", "BENCH", "stub-token", "18.0", "8711.2010",
+        "Standard", "0.0", "", ""
+    )
+    settings_service.set_active_environment("SANDBOX")
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def db(dataset):
+    from app.db.session import SessionLocal
+
+    session = SessionLocal()
+    yield session
+    session.close()
+
+
+@pytest.fixture(scope="session")
+def work_dir():
+    return _WORK_DIR
+
+
+@pytest.fixture(scope="session")
+def bench_db_path(dataset):
+    return BENCH_DB_PATH
+
+
+def _load_baseline(path: str) -> dict:
+    with open(path, "r") as f:
+        return json.load(f).get("benchmarks", {})
+
+
+def pytest_sessionfinish(session, exitstatus):
+    if not _results:
+        return
+    config = session.config
+
+    json_path = config.getoption("--bench-json", None)
+    if json_path:
+        report = {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "machine": platform.platform(),
+            "scale": config.getoption("--bench-scale", 1.0),
+            "benchmarks": _results,
+        }
+        with open(json_path, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+
+    compare_path = config.getoption("--bench-compare", None)
+    if compare_path:
+        threshold = config.getoption("--bench-threshold", DEFAULT_THRESHOLD)
+        baseline = _load_baseline(compare_path)
+        for name, current in sorted(_results.items()):
+            previous = baseline.get(name)
+            if not previous or previous.get("median", 0) <= 0:
+                continue
+            ratio = current["median"] / previous["median"]
+            if ratio > 1 + threshold:
+                _regressions.append((name, previous["median"], current["median"], ratio))
+        if _regressions:
+            session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+    shutil.rmtree(_WORK_DIR, ignore_errors=True)
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    if not _results:
+        return
+    tr = terminalreporter
+    tr.section("benchmark results (seconds)")
+    tr.write_line(f"{'name':<50} {'median':>10} {'min':>10} {'max':>10} {'rounds':>7}")
+    for name, r in sorted(_results.items()):
+        tr.write_line(f"{name:<50} {r['median']:>10.5f} {r['min']:>10.5f} {r['max']:>10.5f} {r['rounds']:>7}")
+
+    if _regressions:
+        tr.section("benchmark regressions")
+        for name, before, after, ratio in _regressions:
+            tr.write_line(f"{name}: {before:.5f}s -> {after:.5f}s ({(ratio - 1) * 100:+.1f}%)", red=True)
@@ -0,0 +1,176 @@
+"""
+Synthetic dataset used by the benchmark suite.
+
+Everything is generated from a seeded random.Random so two runs with the same
+scale produce identical tables and the timings stay comparable between releases.
+"""
+import random
+from datetime import datetime, timedelta
+
+from app.db.models import (
+    CapturedData, Customer, CustomerType, Invoice, InvoiceItem, Motorcycle, Price, ProductModel
+)
+
+MODELS = [
+    ("CD70", "70cc", 157900.0, "RED,BLACK,BLUE"),
+    ("CD70 DREAM", "70cc", 168900.0, "RED,BLACK"),
+    ("CG125", "125cc", 234900.0, "RED,BLACK,GREY"),
+    ("CG125 SE", "125cc", 282900.0, "BLACK,GOLD"),
+    ("CB125F", "125cc", 390900.0, "BLACK,BLUE,RED"),
+    ("CB150F", "150cc", 489900.0, "RED,SILVER,BLACK"),
+    ("PRIDOR", "100cc", 210900.0, "RED,BLACK"),
+]
+
+FIRST_NAMES = ["ALI", "AHMED", "USMAN", "BILAL", "HAMZA", "ZAIN", "SANA", "AYESHA", "FATIMA", "HASSAN", "IMRAN", "KASHIF"]
+LAST_NAMES = ["KHAN", "BUTT", "MALIK", "QURESHI", "CHAUDHRY", "SHEIKH", "AWAN", "RAJPUT", "MIRZA", "SIDDIQUI"]
+CITIES = ["LAHORE", "KARACHI", "FAISALABAD", "MULTAN", "GUJRANWALA", "SIALKOT"]
+
+# Number of rows per table at scale=1
+BASE_SIZES = {
+    "customers": 1000,
+    "motorcycles": 2000,
+    "invoices": 1000,
+    "captured": 5000,
+}
+
+
+def _cnic(rng: random.Random) -> str:
+    return f"{rng.randint(10000, 99999)}-{rng.randint(1000000, 9999999)}-{rng.randint(0, 9)}"
+
+
+def _phone(rng: random.Random) -> str:
+    return f"03{rng.randint(0, 49):02d}{rng.randint(1000000, 9999999)}"
+
+
+def _name(rng: random.Random) -> str:
+    return f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+
+
+def populate(db, scale: float = 1.0, seed: int = 1234) -> dict:
+    """
+    Fills an empty database with product models, prices, customers, stock,
+    invoices and captured form rows. Returns the row counts that were created.
+    """
+    rng = random.Random(seed)
+    sizes = {k: max(1, int(v * scale)) for k, v in BASE_SIZES.items()}
+    now = datetime(2026, 1, 1, 9, 0, 0)
+
+    # Product models and their active price rows
+    models = []
+    for model_name, capacity, total, colors in MODELS:
+        pm = ProductModel(model_name=model_name, make="Honda", engine_capacity=capacity, pct_code="8711.2010")
+        db.add(pm)
+        models.append((pm, total, colors))
+    db.flush()
+
+    for pm, total, colors in models:
+        base = round(total / 1.18, 2)
+        db.add(Price(
+            product_model_id=pm.id,
+            base_price=base,
+            tax_amount=round(total - base, 2),
+            levy_amount=0.0,
+            total_price=total,
+            optional_features={"colors": colors},
+            effective_date=now - timedelta(days=90),
+        ))
+
+    # Customers (a slice of them are dealers)
+    cnics = set()
+    customers = []
+    for i in range(sizes["customers"]):
+        cnic = _cnic(rng)
+        while cnic in cnics:
+            cnic = _cnic(rng)
+        cnics.add(cnic)
+        is_dealer = i % 20 == 0
+        business = f"{rng.choice(LAST_NAMES)} MOTORS {i}" if is_dealer else None
+        customers.append(Customer(
+            cnic=cnic,
+            name=_name(rng),
+            father_name=_name(rng),
+            business_name=business,
+            normalized_business_name=business.lower().replace(" ", "") if business else None,
+            phone=_phone(rng),
+            address=f"HOUSE {rng.randint(1, 999)} {rng.choice(CITIES)}",
+            type=CustomerType.DEALER if is_dealer else CustomerType.INDIVIDUAL,
+            created_at=now - timedelta(minutes=i),
+        ))
+    db.add_all(customers)
+    db.flush()
+
+    # Stock. The first `invoices` bikes are sold through an invoice each.
+    bikes = []
+    for i in range(sizes["motorcycles"]):
+        pm, total, colors = models[i % len(models)]
+        bikes.append(Motorcycle(
+            product_model_id=pm.id,
+            chassis_number=f"SYN-CH-{i:07d}",
+            engine_number=f"SYN-EN-{i:07d}",
+            year=2026,
+            color=rng.choice(colors.split(",")),
+            cost_price=total * 0.9,
+            sale_price=total,
+            status="IN_STOCK",
+            purchase_date=now - timedelta(days=rng.randint(0, 365)),
+        ))
+    db.add_all(bikes)
+    db.flush()
+
+    statuses = ["SYNCED"] * 8 + ["PENDING", "FAILED"]
+    for i in range(min(sizes["invoices"], len(bikes))):
+        bike = bikes[i]
+        bike.status = "SOLD"
+        pm, total, _ = models[i % len(models)]
+        sale_value = round(total / 1.18, 2)
+        tax = round(total - sale_value, 2)
+        status = rng.choice(statuses)
+        db.add(Invoice(
+            invoice_number=f"SYN-{i + 1:06d}",
+            pos_id="123456",
+            usin=f"SYN-{i + 1:06d}",
+            datetime=now - timedelta(hours=i),
+            customer_id=customers[i % len(customers)].id,
+            total_sale_value=sale_value,
+            total_tax_charged=tax,
+            total_further_tax=0.0,
+            total_quantity=1,
+            total_amount=total,
+            payment_mode="Cash",
+            fbr_invoice_number=f"FBR{i:015d}" if status == "SYNCED" else None,
+            is_fiscalized=status == "SYNCED",
+            sync_status=status,
+            items=[InvoiceItem(
+                motorcycle_id=bike.id,
+                item_code=pm.model_name,
+                item_name=f"Honda {pm.model_name}",
+                pct_code="8711.2010",
+                quantity=1,
+                tax_rate=18.0,
+                sale_value=sale_value,
+                tax_charged=tax,
+                total_amount=total,
+            )],
+        ))
+
+    # Captured portal forms
+    captured = []
+    for i in range(sizes["captured"]):
+        pm, _, colors = models[i % len(models)]
+        captured.append(CapturedData(
+            name=_name(rng),
+            father=_name(rng),
+            cnic=_cnic(rng),
+            cell=_phone(rng),
+            address=f"STREET {rng.randint(1, 99)} {rng.choice(CITIES)}",
+            chassis_number=f"CAP-CH-{i:07d}",
+            engine_number=f"CAP-EN-{i:07d}",
+            color=rng.choice(colors.split(",")),
+            model=pm.model_name,
+            is_deleted=i % 25 == 0,
+            created_at=now - timedelta(minutes=i),
+        ))
+    db.add_all(captured)
+
+    db.commit()
+    return sizes
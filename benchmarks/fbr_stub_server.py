@@ -0,0 +1,292 @@
+"""
+Local stand-in for the FBR PostData endpoint.
+
+Answers with the same shape InvoiceService.sync_invoice expects
+(InvoiceNumber, Code, Response) so the real FBRClient and SyncService
+can be exercised without touching the FBR servers.
+
+The behaviour is configurable for load and soak testing: latency
+distributions, logical rejection rates, 5xx bursts, hanging requests
+(client timeouts) and throttling. Run it standalone with:
+
+    python -m benchmarks.fbr_stub_server --port 8765 --latency lognormal:-3:0.5 --error-rate 0.02
+
+and point the SANDBOX API base URL at http://127.0.0.1:8765.
+"""
+import argparse
+import asyncio
+import random
+import socket
+import threading
+import time
+import uuid
+from typing import Callable, Dict, Optional
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+# Outcomes recorded per USIN so a load driver can check the final invoice status
+OUTCOME_SUCCESS = "success"
+OUTCOME_REJECTED = "rejected"
+OUTCOME_SERVER_ERROR = "server_error"
+OUTCOME_THROTTLED = "throttled"
+OUTCOME_TIMEOUT = "timeout"
+
+
+def parse_latency(spec: str) -> Callable[[random.Random], float]:
+    """
+    Parses a latency distribution spec into a sampler returning seconds.
+
+    Supported forms:
+        none | fixed:S | uniform:LO:HI | normal:MEAN:STDDEV | lognormal:MU:SIGMA | exp:MEAN
+    """
+    if not spec or spec == "none":
+        return lambda rng: 0.0
+
+    kind, *params = spec.split(":")
+    try:
+        values = [float(p) for p in params]
+    except ValueError:
+        raise ValueError(f"Invalid latency spec: {spec}")
+
+    if kind == "fixed" and len(values) == 1:
+        return lambda rng: values[0]
+    if kind == "uniform" and len(values) == 2:
+        return lambda rng: rng.uniform(values[0], values[1])
+    if kind == "normal" and len(values) == 2:
+        return lambda rng: max(0.0, rng.gauss(values[0], values[1]))
+    if kind == "lognormal" and len(values) == 2:
+        return lambda rng: rng.lognormvariate(values[0], values[1])
+    if kind == "exp" and len(values) == 1:
+        return lambda rng: rng.expovariate(1.0 / values[0]) if values[0] > 0 else 0.0
+    raise ValueError(f"Invalid latency spec: {spec}")
+
+
+class StubBehaviour:
+    def __init__(self,
+                 latency: str = "none",
+                 error_rate: float = 0.0,
+                 server_error_rate: float = 0.0,
+                 burst_every: int = 0,
+                 burst_length: int = 0,
+                 timeout_rate: float = 0.0,
+                 timeout_seconds: float = 15.0,
+                 rate_limit: float = 0.0,
+                 rate_burst: int = 10,
+                 seed: Optional[int] = None):
+        self.latency = latency
+        self.error_rate = error_rate                # 200 OK with an FBR rejection body
+        self.server_error_rate = server_error_rate  # random 500s
+        self.burst_every = burst_every              # every N requests ...
+        self.burst_length = burst_length            # ... the next M requests get 503
+        self.timeout_rate = timeout_rate            # requests that hang past the client timeout
+        self.timeout_seconds = timeout_seconds
+        self.rate_limit = rate_limit                # requests/second, 0 = unlimited (429 when exceeded)
+        self.rate_burst = rate_burst
+        self.seed = seed
+
+    @classmethod
+    def from_dict(cls, data: Dict):
+        return cls(**data)
+
+    def to_dict(self):
+        return dict(self.__dict__)
+
+
+class _TokenBucket:
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+
+    def take(self) -> bool:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+
+class _StubState:
+    def __init__(self, behaviour: StubBehaviour):
+        self.configure(behaviour)
+
+    def configure(self, behaviour: StubBehaviour):
+        self.behaviour = behaviour
+        self.rng = random.Random(behaviour.seed)
+        self.sample_latency = parse_latency(behaviour.latency)
+        self.bucket = _TokenBucket(behaviour.rate_limit, behaviour.rate_burst) if behaviour.rate_limit > 0 else None
+        self.received = 0
+        self.counts = {}
+        self.outcomes = {}
+        self.latencies = []
+
+    def record(self, usin: str, outcome: str, latency: float):
+        self.counts[outcome] = self.counts.get(outcome, 0) + 1
+        if usin:
+            self.outcomes[usin] = outcome
+        self.latencies.append(latency)
+
+    def in_burst(self) -> bool:
+        b = self.behaviour
+        if b.burst_every <= 0 or b.burst_length <= 0:
+            return False
+        position = (self.received - 1) % (b.burst_every + b.burst_length)
+        return position >= b.burst_every
+
+
+def create_app(behaviour: StubBehaviour = None) -> FastAPI:
+    app = FastAPI(title="FBR Stub", version="1.0.0")
+    state = _StubState(behaviour or StubBehaviour())
+    app.state.stub = state
+
+    @app.post("/PostData")
+    async def post_data(request: Request):
+        started = time.perf_counter()
+        payload = await request.json()
+        usin = payload.get("USIN")
+        b = state.behaviour
+        state.received += 1
+
+        if state.bucket and not state.bucket.take():
+            state.record(usin, OUTCOME_THROTTLED, time.perf_counter() - started)
+            return JSONResponse(status_code=429, headers={"Retry-After": "1"},
+                                content={"Code": "429", "Response": "Too many requests"})
+
+        if state.in_burst():
+            state.record(usin, OUTCOME_SERVER_ERROR, time.perf_counter() - started)
+            return JSONResponse(status_code=503, content={"Code": "503", "Response": "Service unavailable"})
+
+        delay = state.sample_latency(state.rng)
+        if b.timeout_rate and state.rng.random() < b.timeout_rate:
+            state.record(usin, OUTCOME_TIMEOUT, b.timeout_seconds)
+            await asyncio.sleep(b.timeout_seconds)
+            return JSONResponse(status_code=504, content={"Code": "504", "Response": "Gateway timeout"})
+
+        if delay:
+            await asyncio.sleep(delay)
+
+        if b.server_error_rate and state.rng.random() < b.server_error_rate:
+            state.record(usin, OUTCOME_SERVER_ERROR, time.perf_counter() - started)
+            return JSONResponse(status_code=500, content={"Code": "500", "Response": "Internal server error"})
+
+        if b.error_rate and state.rng.random() < b.error_rate:
+            state.record(usin, OUTCOME_REJECTED, time.perf_counter() - started)
+            return {"Code": "401", "Response": "Invalid buyer information", "Errors": "Stub rejection"}
+
+        state.record(usin, OUTCOME_SUCCESS, time.perf_counter() - started)
+        return {
+            "InvoiceNumber": f"STUB{uuid.uuid4().hex[:16].upper()}",
+            "Code": "100",
+            "Response": "Invoice received successfully",
+            "Errors": None,
+            "USIN": usin,
+        }
+
+    @app.get("/__stub/stats")
+    def stats():
+        return {"received": state.received, "counts": state.counts, "behaviour": state.behaviour.to_dict()}
+
+    @app.post("/__stub/config")
+    async def configure(request: Request):
+        state.configure(StubBehaviour.from_dict(await request.json()))
+        return {"behaviour": state.behaviour.to_dict()}
+
+    return app
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class StubServer:
+    """Runs the stub app with uvicorn on a background thread."""
+
+    def __init__(self, app: FastAPI = None, host: str = "127.0.0.1", port: int = None, behaviour: StubBehaviour = None):
+        self.app = app or create_app(behaviour)
+        self.host = host
+        self.port = port or _free_port()
+        self._server = None
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def state(self) -> _StubState:
+        return self.app.state.stub
+
+    def start(self, timeout: float = 10.0):
+        config = uvicorn.Config(self.app, host=self.host, port=self.port, log_level="warning")
+        self._server = uvicorn.Server(config)
+        self._thread = threading.Thread(target=self._server.run, daemon=True)
+        self._thread.start()
+
+        deadline = time.time() + timeout
+        while not self._server.started:
+            if time.time() > deadline:
+                raise RuntimeError("FBR stub server did not start in time")
+            time.sleep(0.05)
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.should_exit = True
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def add_behaviour_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--latency", default="none", help="none | fixed:S | uniform:LO:HI | normal:M:SD | lognormal:MU:SIGMA | exp:MEAN")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests rejected with an FBR error body.")
+    parser.add_argument("--server-error-rate", type=float, default=0.0, help="Fraction of requests answered with HTTP 500.")
+    parser.add_argument("--burst-every", type=int, default=0, help="Start a 503 burst after this many requests.")
+    parser.add_argument("--burst-length", type=int, default=0, help="Number of requests in each 503 burst.")
+    parser.add_argument("--timeout-rate", type=float, default=0.0, help="Fraction of requests that hang past the client timeout.")
+    parser.add_argument("--timeout-seconds", type=float, default=15.0, help="How long a hanging request is held open.")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="Requests per second before answering 429 (0 = off).")
+    parser.add_argument("--rate-burst", type=int, default=10, help="Token bucket size for --rate-limit.")
+    parser.add_argument("--seed", type=int, default=None)
+
+
+def behaviour_from_args(args) -> StubBehaviour:
+    return StubBehaviour(
+        latency=args.latency,
+        error_rate=args.error_rate,
+        server_error_rate=args.server_error_rate,
+        burst_every=args.burst_every,
+        burst_length=args.burst_length,
+        timeout_rate=args.timeout_rate,
+        timeout_seconds=args.timeout_seconds,
+        rate_limit=args.rate_limit,
+        rate_burst=args.rate_burst,
+        seed=args.seed,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local FBR PostData stub server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    add_behaviour_arguments(parser)
+    args = parser.parse_args()
+
+    parse_latency(args.latency)  # fail fast on a bad spec
+    uvicorn.run(create_app(behaviour_from_args(args)), host=args.host, port=args.port, log_level="info")
+
+
+if __name__ == "__main__":
+    main()
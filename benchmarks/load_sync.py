@@ -0,0 +1,216 @@
+"""
+Load / soak driver for the FBR sync path.
+
+Seeds a scratch SQLite database with thousands of PENDING invoices, points the
+SANDBOX settings at the local FBR stub (benchmarks/fbr_stub_server.py) and
+drains the queue through the real SyncService, InvoiceService and FBRClient.
+
+Reports throughput, client-side p50/p95/p99 latency per invoice sync and
+checks that every invoice ended in the status its last stub response implies.
+
+Usage:
+    python -m benchmarks.load_sync --invoices 5000 --latency lognormal:-3:0.5 \
+        --error-rate 0.02 --burst-every 500 --burst-length 20 --passes 2
+
+Note: hanging requests (--timeout-rate) hit FBRClient's 10s timeout and its
+retry back-off, so keep that rate small for large runs.
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+# Final sync_status InvoiceService.sync_invoice assigns for the last response the stub gave.
+# HTTP errors with a response body are raised by FBRClient as plain exceptions (no retry),
+# hanging requests surface as requests.Timeout and are retried, then left queued.
+EXPECTED_STATUS = {
+    "success": "SYNCED",
+    "rejected": "FAILED",
+    "server_error": "FAILED",
+    "throttled": "FAILED",
+    "timeout": "PENDING",
+}
+
+
+def percentile(values, pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * pct / 100.0
+    lo = int(k)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+def seed_invoices(db, count: int) -> int:
+    """Creates `count` PENDING single-item invoices. Returns the number created."""
+    from app.db.models import Customer, CustomerType, Invoice, InvoiceItem, Motorcycle, ProductModel
+
+    now = datetime(2026, 1, 1, 9, 0, 0)
+    pm = ProductModel(model_name="CD70", make="Honda", engine_capacity="70cc", pct_code="8711.2010")
+    db.add(pm)
+    customers = [
+        Customer(cnic=f"35202-{1000000 + i}-1", name=f"LOAD CUSTOMER {i}", phone="03001234567",
+                 type=CustomerType.INDIVIDUAL)
+        for i in range(100)
+    ]
+    db.add_all(customers)
+    db.flush()
+
+    bikes = [
+        Motorcycle(product_model_id=pm.id, chassis_number=f"LOAD-CH-{i:07d}", engine_number=f"LOAD-EN-{i:07d}",
+                   year=2026, color="RED", cost_price=140000.0, sale_price=157900.0, status="SOLD")
+        for i in range(count)
+    ]
+    db.add_all(bikes)
+    db.flush()
+
+    for i, bike in enumerate(bikes):
+        db.add(Invoice(
+            invoice_number=f"LOAD-{i + 1:06d}",
+            pos_id="123456",
+            usin=f"LOAD-{i + 1:06d}",
+            datetime=now + timedelta(seconds=i),
+            customer_id=customers[i % len(customers)].id,
+            total_sale_value=133813.56,
+            total_tax_charged=24086.44,
+            total_further_tax=0.0,
+            total_quantity=1,
+            total_amount=157900.0,
+            payment_mode="Cash",
+            sync_status="PENDING",
+            items=[InvoiceItem(
+                motorcycle_id=bike.id, item_code="CD70", item_name="Honda CD70", pct_code="8711.2010",
+                quantity=1, tax_rate=18.0, sale_value=133813.56, tax_charged=24086.44, total_amount=157900.0,
+            )],
+        ))
+    db.commit()
+    return count
+
+
+def check_transitions(db, outcomes: dict) -> dict:
+    """
+    Compares every invoice's final sync_status with the status the stub's last
+    response for its USIN should have produced.
+    """
+    from app.db.models import Invoice
+
+    status_counts = {}
+    mismatches = []
+    for number, status in db.query(Invoice.invoice_number, Invoice.sync_status):
+        status_counts[status] = status_counts.get(status, 0) + 1
+        outcome = outcomes.get(number)
+        expected = EXPECTED_STATUS.get(outcome, "PENDING")
+        if status != expected:
+            mismatches.append({"invoice": number, "outcome": outcome, "expected": expected, "actual": status})
+    return {"status_counts": status_counts, "mismatches": mismatches}
+
+
+def run(args) -> dict:
+    from app.api.fbr_client import fbr_client
+    from app.db import session as db_session
+    from app.services.settings_service import settings_service
+    from app.services.sync_service import SyncService
+    from benchmarks.fbr_stub_server import StubServer, behaviour_from_args
+
+    db_session.init_db()
+    db = db_session.SessionLocal()
+    try:
+        seed_invoices(db, args.invoices)
+    finally:
+        db.close()
+
+    latencies = []
+    original_post = fbr_client.post_invoice
+
+    def timed_post(invoice_data):
+        start = time.perf_counter()
+        try:
+            return original_post(invoice_data)
+        finally:
+            latencies.append(time.perf_counter() - start)
+
+    server = StubServer(behaviour=behaviour_from_args(args)).start()
+    fbr_client.post_invoice = timed_post
+    try:
+        settings_service._initialize_defaults()
+        settings_service.save_environment(
+            "SANDBOX", server.base_url, "123456", "LOAD", "stub-token", "18.0", "8711.2010",
+            "Standard", "0.0", "", ""
+        )
+        settings_service.set_active_environment("SANDBOX")
+
+        service = SyncService()
+        started = time.perf_counter()
+        for _ in range(args.passes):
+            service._process_queue()
+        elapsed = time.perf_counter() - started
+
+        db = db_session.SessionLocal()
+        try:
+            transitions = check_transitions(db, server.state.outcomes)
+        finally:
+            db.close()
+        stub_counts = dict(server.state.counts)
+    finally:
+        fbr_client.post_invoice = original_post
+        server.stop()
+
+    return {
+        "invoices": args.invoices,
+        "passes": args.passes,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_per_s": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "latency_s": {
+            "p50": round(percentile(latencies, 50), 5),
+            "p95": round(percentile(latencies, 95), 5),
+            "p99": round(percentile(latencies, 99), 5),
+            "max": round(max(latencies), 5) if latencies else 0.0,
+        },
+        "requests": stub_counts,
+        "status_counts": transitions["status_counts"],
+        "mismatches": len(transitions["mismatches"]),
+        "mismatch_samples": transitions["mismatches"][:10],
+    }
+
+
+def main():
+    from benchmarks.fbr_stub_server import add_behaviour_arguments
+
+    parser = argparse.ArgumentParser(description="Drive the SyncService against the local FBR stub")
+    parser.add_argument("--invoices", type=int, default=2000, help="Number of PENDING invoices to seed.")
+    parser.add_argument("--passes", type=int, default=1, help="Queue drains to run (later passes retry what is left PENDING).")
+    parser.add_argument("--json", default=None, help="Also write the report to this file.")
+    add_behaviour_arguments(parser)
+    args = parser.parse_args()
+
+    # Scratch database, set before any app module reads DB_URL
+    work_dir = Path(tempfile.mkdtemp(prefix="fbr_load_"))
+    os.environ["DB_SERVER"] = ""
+    os.environ["DB_URL"] = f"sqlite:///{(work_dir / 'load.db').as_posix()}"
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+    try:
+        report = run(args)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    print(json.dumps(report, indent=2))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+    sys.exit(1 if report["mismatches"] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,501 @@
+"""
+Offline replay of the dealer portal's stock list for HondaScraper.
+
+A fixture is a directory with one HTML file per list page plus a manifest.json
+describing the paging (total pages, rows, the pagination strategy that works).
+Fixtures are either generated (synthetic stock in any of the pager styles
+_go_to_next_page understands) or recorded from the live portal with the real
+scraper. The replay server serves them on localhost with a configurable latency
+and injects a small pager script, so paging works without the portal's own
+JavaScript: in "ajax" mode the table body is swapped in place like the portal's
+grid does, in "navigate" mode every page is a full load.
+
+    python -m benchmarks.portal_replay generate --out /tmp/portal --pages 20 --pager input
+    python -m benchmarks.portal_replay serve --fixture /tmp/portal --latency lognormal:-2:0.4
+    python -m benchmarks.portal_replay bench --fixture /tmp/portal --rounds 5 --workers 4
+    python -m benchmarks.portal_replay record --out benchmarks/fixtures/portal_recorded --url https://dealers.ahlportal.com
+
+`bench` and `record` need a Chromium installed for playwright (`playwright install chromium`).
+Recorded fixtures contain real dealer stock; keep them out of git.
+"""
+import argparse
+import asyncio
+import json
+import random
+import re
+import statistics
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from fastapi import FastAPI
+from fastapi.responses import HTMLResponse, JSONResponse
+
+from benchmarks.fbr_stub_server import StubServer, parse_latency
+
+MANIFEST = "manifest.json"
+PAGER_STYLES = ("input", "select", "button", "link")
+MODES = ("ajax", "navigate")
+
+_SCRIPT_TAG = re.compile(r"<script\b[^>]*>.*?</script\s*>", re.IGNORECASE | re.DOTALL)
+_TBODY = re.compile(r"<tbody\b[^>]*>(.*?)</tbody\s*>", re.IGNORECASE | re.DOTALL)
+
+_MODELS = ("CD70", "CD70 DREAM", "CG125", "CG125S", "CB150F")
+_COLORS = ("RED", "BLACK", "BLUE", "SILVER")
+
+
+def _page_file(page_num: int) -> str:
+    return f"page_{page_num:03d}.html"
+
+
+def load_manifest(fixture_dir) -> Dict:
+    with open(Path(fixture_dir) / MANIFEST, "r") as f:
+        return json.load(f)
+
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+def _pager_html(style: str, page_num: int, total: int) -> str:
+    if style == "input":
+        control = f'<input type="text" id="txtPageNo" value="{page_num}" style="width:40px">'
+    elif style == "select":
+        options = "".join(
+            f'<option value="{n}"{" selected" if n == page_num else ""}>{n}</option>' for n in range(1, total + 1)
+        )
+        control = f'<select id="cmbPageNo">{options}</select>'
+    elif style == "button":
+        control = '<button type="button" class="next-page" title="Next Page">&gt;</button>'
+    elif style == "link":
+        first = max(1, page_num - 2)
+        control = " ".join(f'<a href="?page={n}">{n}</a>' for n in range(first, min(total, first + 4) + 1))
+    else:
+        raise ValueError(f"Unknown pager style: {style}")
+    return f'<div class="pager">{control} <span class="page-label">Page {page_num} of {total}</span></div>'
+
+
+def _stock_rows(rng: random.Random, start: int, count: int) -> str:
+    rows = []
+    for i in range(start, start + count):
+        status = "Sold" if rng.random() < 0.2 else "In Stock"
+        rows.append(
+            "<tr>"
+            f"<td>{i}</td><td>PO{100000 + i}</td><td>2025-01-{(i % 28) + 1:02d}</td>"
+            f"<td>{rng.choice(_MODELS)}</td><td>{rng.choice(_COLORS)}</td>"
+            f"<td>ENG{i:07d}</td><td>CHS{i:07d}</td><td>{status}</td>"
+            "</tr>"
+        )
+    return "".join(rows)
+
+
+def generate_fixture(out_dir, pages: int = 10, rows_per_page: int = 20, pager: str = "input",
+                     seed: int = 1234) -> Dict:
+    """Writes a synthetic stock list in the portal's column layout (see STOCK_TABLE_COLUMNS)."""
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    rng = random.Random(seed)
+    header = "".join(f"<th>{h}</th>" for h in ("Sr", "PO #", "Date", "Model", "Color", "Engine #", "Chassis #", "Status"))
+
+    for page_num in range(1, pages + 1):
+        rows = _stock_rows(rng, (page_num - 1) * rows_per_page + 1, rows_per_page)
+        html = (
+            "<!DOCTYPE html><html><head><title>Stock List</title></head><body>"
+            "<h3>Dealer Stock</h3>"
+            f'<table id="stock"><thead><tr>{header}</tr></thead><tbody>{rows}</tbody></table>'
+            f"{_pager_html(pager, page_num, pages)}"
+            "</body></html>"
+        )
+        (out / _page_file(page_num)).write_text(html, encoding="utf-8")
+
+    manifest = {
+        "source": "synthetic",
+        "list_path": "/stock",
+        "total_pages": pages,
+        "rows_per_page": rows_per_page,
+        "total_rows": pages * rows_per_page,
+        "pager": pager,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+    }
+    (out / MANIFEST).write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    return manifest
+
+
+def record_fixture(out_dir, scraper=None, max_pages: int = 50, status_callback=None) -> Dict:
+    """
+    Saves the stock list currently open in the scraper's browser, page by page,
+    paging with the scraper's own _go_to_next_page. The portal's scripts are
+    stripped; the replay server provides paging instead.
+    """
+    from app.services.scraper_service import DETECT_TOTAL_PAGES_JS, HondaScraper
+
+    scraper = scraper or HondaScraper()
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+
+    def task(page):
+        source_url = page.url
+        total_pages = page.evaluate(DETECT_TOTAL_PAGES_JS)
+        total_rows = 0
+        recorded = 0
+        for page_num in range(1, max_pages + 1):
+            if status_callback:
+                status_callback(f"Recording page {page_num}...")
+            rows = scraper._scrape_page_logic(page, page_num)
+            if not rows:
+                break
+            html = _SCRIPT_TAG.sub("", page.content())
+            (out / _page_file(page_num)).write_text(html, encoding="utf-8")
+            total_rows += len(rows)
+            recorded = page_num
+
+            first_cell_text, old_row_count = scraper._table_state(page)
+            scraper._arm_table_watch(page)
+            if not scraper._go_to_next_page(page, current_page_num=page_num):
+                break
+            if not scraper._wait_for_table_update(page, old_text=first_cell_text, old_row_count=old_row_count):
+                break
+        return source_url, total_pages, recorded, total_rows
+
+    source_url, detected_total, recorded, total_rows = scraper.capture_service.execute_task(task)
+    host = re.sub(r"^https?://", "", source_url).split("/")[0]
+    manifest = {
+        "source": "recorded",
+        "source_url": source_url,
+        "list_path": "/stock",
+        "total_pages": recorded,
+        "detected_total_pages": detected_total,
+        "total_rows": total_rows,
+        "pagination": scraper.capture_service.config.get("pagination_strategies", {}).get(host),
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+    }
+    (out / MANIFEST).write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    return manifest
+
+
+# ---------------------------------------------------------------------------
+# Replay server
+# ---------------------------------------------------------------------------
+
+# Emulates the portal's pager: page input + Enter, page select, Next buttons and
+# numbered links. In ajax mode rows are fetched and swapped into the table body.
+REPLAY_PAGER_JS = r"""
+(function () {
+    const cfg = __REPLAY_CONFIG__;
+    let current = cfg.page;
+    const NEXT = "[title='Next Page'], [aria-label='Next Page'], .next, .next-page, .k-pager-last, .icon-next";
+
+    function syncPager(n) {
+        document.querySelectorAll('input').forEach(el => { if (el.value.trim() === String(current)) el.value = n; });
+        document.querySelectorAll('select').forEach(el => { if (el.value === String(current)) el.value = String(n); });
+        document.querySelectorAll('*').forEach(el => {
+            if (el.children.length === 0 && /Page\s+\d+\s+of\s+\d+/i.test(el.textContent)) {
+                el.textContent = el.textContent.replace(/Page\s+\d+/i, 'Page ' + n);
+            }
+        });
+    }
+
+    async function go(n) {
+        if (!n || n < 1 || n > cfg.total || n === current) return;
+        if (cfg.mode !== 'ajax') {
+            location.href = cfg.listPath + '?page=' + n;
+            return;
+        }
+        const res = await fetch('/__replay/rows?page=' + n);
+        if (!res.ok) return;
+        const bodies = Array.from(document.querySelectorAll('tbody'));
+        const tbody = bodies.sort((a, b) => b.rows.length - a.rows.length)[0];
+        if (tbody) tbody.innerHTML = await res.text();
+        syncPager(n);
+        current = n;
+    }
+
+    document.addEventListener('keydown', (e) => {
+        if (e.key === 'Enter' && e.target.matches('input')) {
+            const n = parseInt(e.target.value, 10);
+            if (n && n !== current) { e.preventDefault(); go(n); }
+        }
+    }, true);
+    document.addEventListener('change', (e) => {
+        if (e.target.matches('select')) go(parseInt(e.target.value, 10));
+    }, true);
+    document.addEventListener('click', (e) => {
+        const el = e.target.closest('a, button, span');
+        if (!el) return;
+        const text = (el.innerText || '').trim();
+        if (el.matches(NEXT) || el.closest(NEXT) || /^next/i.test(text)) {
+            e.preventDefault();
+            go(current + 1);
+        } else if (/^\d+$/.test(text) && el.closest('a, button')) {
+            e.preventDefault();
+            go(parseInt(text, 10));
+        }
+    }, true);
+})();
+"""
+
+
+class _ReplayState:
+    def __init__(self, fixture_dir, latency: str, mode: str, seed: Optional[int]):
+        if mode not in MODES:
+            raise ValueError(f"Unknown replay mode: {mode}")
+        self.fixture_dir = Path(fixture_dir)
+        self.manifest = load_manifest(fixture_dir)
+        self.mode = mode
+        self.latency = latency
+        self.rng = random.Random(seed)
+        self.sample_latency = parse_latency(latency)
+        self.requests = {"page": 0, "rows": 0}
+        self._pages: Dict[int, str] = {}
+
+    @property
+    def total_pages(self) -> int:
+        return int(self.manifest["total_pages"])
+
+    def html(self, page_num: int) -> Optional[str]:
+        if page_num not in self._pages:
+            path = self.fixture_dir / _page_file(page_num)
+            if not path.exists():
+                return None
+            self._pages[page_num] = path.read_text(encoding="utf-8")
+        return self._pages[page_num]
+
+    def rows(self, page_num: int) -> Optional[str]:
+        html = self.html(page_num)
+        if html is None:
+            return None
+        bodies = _TBODY.findall(html)
+        return max(bodies, key=lambda b: b.lower().count("<tr"), default="")
+
+    def page_with_pager(self, page_num: int) -> Optional[str]:
+        html = self.html(page_num)
+        if html is None:
+            return None
+        config = {"page": page_num, "total": self.total_pages, "mode": self.mode,
+                  "listPath": self.manifest.get("list_path", "/stock")}
+        script = "<script>" + REPLAY_PAGER_JS.replace("__REPLAY_CONFIG__", json.dumps(config)) + "</script>"
+        if re.search(r"</body\s*>", html, re.IGNORECASE):
+            return re.sub(r"</body\s*>", lambda m: script + m.group(0), html, count=1, flags=re.IGNORECASE)
+        return html + script
+
+
+def create_app(fixture_dir, latency: str = "none", mode: str = "ajax", seed: Optional[int] = None) -> FastAPI:
+    app = FastAPI(title="Portal Replay", version="1.0.0")
+    state = _ReplayState(fixture_dir, latency, mode, seed)
+    app.state.stub = state
+    list_path = state.manifest.get("list_path", "/stock")
+
+    async def _delay():
+        delay = state.sample_latency(state.rng)
+        if delay:
+            await asyncio.sleep(delay)
+
+    @app.get(list_path)
+    async def list_page(page: int = 1):
+        state.requests["page"] += 1
+        await _delay()
+        html = state.page_with_pager(page)
+        if html is None:
+            return HTMLResponse("Page not found", status_code=404)
+        return HTMLResponse(html)
+
+    @app.get("/__replay/rows")
+    async def rows(page: int = 1):
+        state.requests["rows"] += 1
+        await _delay()
+        body = state.rows(page)
+        if body is None:
+            return HTMLResponse("", status_code=404)
+        return HTMLResponse(body)
+
+    @app.get("/__replay/stats")
+    def stats():
+        return JSONResponse({"requests": state.requests, "mode": state.mode, "latency": state.latency,
+                             "manifest": state.manifest})
+
+    return app
+
+
+class ReplayServer(StubServer):
+    """Serves a fixture on a background thread (see StubServer)."""
+
+    def __init__(self, fixture_dir, latency: str = "none", mode: str = "ajax", seed: Optional[int] = None,
+                 host: str = "127.0.0.1", port: int = None):
+        super().__init__(app=create_app(fixture_dir, latency, mode, seed), host=host, port=port)
+
+    @property
+    def list_url(self) -> str:
+        return self.base_url + self.state.manifest.get("list_path", "/stock")
+
+
+# ---------------------------------------------------------------------------
+# Headless browser for the scraper
+# ---------------------------------------------------------------------------
+
+class HeadlessPortalSession:
+    """
+    Stand-in for FormCaptureService's browser thread: a headless Chromium whose
+    page runs HondaScraper tasks on the calling thread. The capture injection
+    script and py_capture binding are installed like in the app, so their cost
+    shows up in the numbers.
+    """
+
+    def __init__(self, inject_capture_script: bool = True, resource_policy: bool = True):
+        self.inject_capture_script = inject_capture_script
+        self.use_resource_policy = resource_policy
+        self.config: Dict = {}
+        self.resource_policy = None
+        self.captured: List = []
+        self.is_running = False
+        self._playwright = None
+        self.browser = None
+        self.context = None
+        self.page = None
+
+    def start(self):
+        from playwright.sync_api import sync_playwright
+
+        self._playwright = sync_playwright().start()
+        try:
+            self.browser = self._playwright.chromium.launch(headless=True)
+        except Exception:
+            self._playwright.stop()
+            raise
+        self.context = self.browser.new_context()
+        if self.inject_capture_script:
+            from app.services.form_capture_service import FormCaptureService
+            self.context.expose_binding("py_capture", lambda source, data: self.captured.append(data))
+            self.context.add_init_script(FormCaptureService()._get_injection_script())
+        if self.use_resource_policy:
+            from app.services.resource_policy import ResourcePolicy
+            self.resource_policy = ResourcePolicy()
+        self.page = self.context.new_page()
+        self.is_running = True
+        return self
+
+    def stop(self):
+        self.is_running = False
+        if self.browser:
+            self.browser.close()
+        if self._playwright:
+            self._playwright.stop()
+        self.browser = self._playwright = self.context = self.page = None
+
+    def execute_task(self, callback):
+        return callback(self.page)
+
+    def save_config(self):
+        # Learned pagination strategies stay in memory; the app's capture_config.json is untouched
+        pass
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def _timed(func, rounds: int, setup=None) -> Dict:
+    timings = []
+    result = None
+    for _ in range(rounds):
+        if setup:
+            setup()
+        started = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - started)
+    return {
+        "median_s": statistics.median(timings),
+        "min_s": min(timings),
+        "max_s": max(timings),
+        "result": result,
+    }
+
+
+def run_bench(fixture_dir, latency: str = "none", mode: str = "ajax", rounds: int = 3, workers: int = 1,
+              seed: Optional[int] = None) -> Dict:
+    """Times detect_total_pages and scrape_all_pages against a replayed fixture."""
+    from app.services.scraper_service import HondaScraper
+
+    manifest = load_manifest(fixture_dir)
+    expected_rows = manifest.get("total_rows")
+    report = {"fixture": str(fixture_dir), "latency": latency, "mode": mode, "rounds": rounds, "workers": workers}
+
+    with ReplayServer(fixture_dir, latency=latency, mode=mode, seed=seed) as server, HeadlessPortalSession() as session:
+        scraper = HondaScraper(capture_service=session)
+
+        def open_list():
+            session.page.goto(server.list_url)
+            session.page.wait_for_selector("tbody tr")
+
+        detect = _timed(scraper.detect_total_pages, rounds, setup=open_list)
+        scrape = _timed(
+            lambda: len(scraper.scrape_all_pages(max_pages=manifest["total_pages"], workers=workers)),
+            rounds, setup=open_list,
+        )
+        report.update({
+            "detect_total_pages": detect,
+            "scrape_all_pages": scrape,
+            "expected_rows": expected_rows,
+            "server_requests": dict(server.state.requests),
+            "pagination": session.config.get("pagination_strategies"),
+            "captures": len(session.captured),
+        })
+    report["ok"] = detect["result"] == manifest["total_pages"] and scrape["result"] == expected_rows
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline replay of the dealer portal stock list")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    gen = sub.add_parser("generate", help="Write a synthetic fixture")
+    gen.add_argument("--out", required=True)
+    gen.add_argument("--pages", type=int, default=10)
+    gen.add_argument("--rows-per-page", type=int, default=20)
+    gen.add_argument("--pager", choices=PAGER_STYLES, default="input")
+    gen.add_argument("--seed", type=int, default=1234)
+
+    for name in ("serve", "bench"):
+        p = sub.add_parser(name, help=f"{name.capitalize()} a fixture")
+        p.add_argument("--fixture", required=True)
+        p.add_argument("--latency", default="none", help="none | fixed:S | uniform:LO:HI | normal:M:SD | lognormal:MU:SIGMA | exp:MEAN")
+        p.add_argument("--mode", choices=MODES, default="ajax")
+        p.add_argument("--seed", type=int, default=None)
+    sub.choices["serve"].add_argument("--host", default="127.0.0.1")
+    sub.choices["serve"].add_argument("--port", type=int, default=8766)
+    sub.choices["bench"].add_argument("--rounds", type=int, default=3)
+    sub.choices["bench"].add_argument("--workers", type=int, default=1)
+
+    rec = sub.add_parser("record", help="Record the stock list open in the app's browser")
+    rec.add_argument("--out", required=True)
+    rec.add_argument("--max-pages", type=int, default=50)
+    rec.add_argument("--url", default=None, help="Portal URL to open first (log in and open the stock list there)")
+
+    args = parser.parse_args()
+
+    if args.command == "generate":
+        print(json.dumps(generate_fixture(args.out, args.pages, args.rows_per_page, args.pager, args.seed), indent=2))
+    elif args.command == "serve":
+        import uvicorn
+        parse_latency(args.latency)  # fail fast on a bad spec
+        app = create_app(args.fixture, args.latency, args.mode, args.seed)
+        print(f"Replaying {args.fixture} at http://{args.host}:{args.port}{app.state.stub.manifest.get('list_path', '/stock')}")
+        uvicorn.run(app, host=args.host, port=args.port, log_level="info")
+    elif args.command == "bench":
+        report = run_bench(args.fixture, args.latency, args.mode, args.rounds, args.workers, args.seed)
+        print(json.dumps(report, indent=2, default=str))
+        sys.exit(0 if report["ok"] else 1)
+    elif args.command == "record":
+        from app.services.scraper_service import HondaScraper
+        scraper = HondaScraper()
+        scraper.capture_service.start_capture_session(args.url)
+        input("Log in, open the stock list on page 1, then press Enter to record...")
+        print(json.dumps(record_fixture(args.out, scraper, max_pages=args.max_pages, status_callback=print), indent=2))
+        scraper.capture_service.stop_capture_session()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Startup import-time report.
+
+Runs a fresh interpreter with `python -X importtime`, imports the UI entry
+module and summarises where the time went: total import time, the slowest
+modules by cumulative and self time, and the app.* modules.
+
+Usage:
+    python scripts/startup_report.py
+    python scripts/startup_report.py --module app.ui.main_window --top 25
+    python scripts/startup_report.py --budget-ms 1500   # exit 1 if slower
+    python scripts/startup_report.py --json startup.json
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# import time:       self [us] |  cumulative | imported package
+_LINE_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def collect(module: str) -> list:
+    """Imports `module` in a child interpreter and returns (name, self_us, cumulative_us, depth) rows."""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = str(PROJECT_ROOT) + os.pathsep + env.get("PYTHONPATH", "")
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=str(PROJECT_ROOT), env=env, capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        # importtime lines also go to stderr, show only the traceback tail
+        tail = [l for l in proc.stderr.splitlines() if not l.startswith("import time:")]
+        raise RuntimeError(f"Importing {module} failed:\n" + "\n".join(tail[-15:]))
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        match = _LINE_RE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        rows.append({
+            "module": name,
+            "self_ms": int(self_us) / 1000.0,
+            "cumulative_ms": int(cumulative_us) / 1000.0,
+            "depth": (len(indent) - 1) // 2,
+        })
+    return rows
+
+
+def summarise(module: str, rows: list, top: int) -> dict:
+    root = next((r for r in rows if r["module"] == module), None)
+    by_cumulative = sorted(rows, key=lambda r: r["cumulative_ms"], reverse=True)
+    by_self = sorted(rows, key=lambda r: r["self_ms"], reverse=True)
+    return {
+        "module": module,
+        "total_ms": root["cumulative_ms"] if root else sum(r["self_ms"] for r in rows),
+        "modules_imported": len(rows),
+        "top_cumulative": by_cumulative[:top],
+        "top_self": by_self[:top],
+        "app_modules": [r for r in by_cumulative if r["module"].startswith("app.")][:top],
+    }
+
+
+def print_report(report: dict):
+    print(f"Import of {report['module']}: {report['total_ms']:.1f} ms ({report['modules_imported']} modules)")
+    for title, key, field in (
+        ("Slowest by cumulative time", "top_cumulative", "cumulative_ms"),
+        ("Slowest by self time", "top_self", "self_ms"),
+        ("Application modules", "app_modules", "cumulative_ms"),
+    ):
+        print(f"\n{title}:")
+        for row in report[key]:
+            print(f"  {row[field]:>10.1f} ms  {row['module']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report import time of the application startup path")
+    parser.add_argument("--module", default="app.ui.main_window", help="Module to import (default: app.ui.main_window)")
+    parser.add_argument("--top", type=int, default=15, help="Rows per section.")
+    parser.add_argument("--budget-ms", type=float, default=None, help="Fail if total import time exceeds this.")
+    parser.add_argument("--json", default=None, help="Also write the report to this file.")
+    args = parser.parse_args()
+
+    report = summarise(args.module, collect(args.module), args.top)
+    print_report(report)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.budget_ms is not None and report["total_ms"] > args.budget_ms:
+        print(f"\nOver budget: {report['total_ms']:.1f} ms > {args.budget_ms:.1f} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+import pytest
+from unittest.mock import patch
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db.models import Base
+
+
+@pytest.fixture
+def engine():
+    """In-memory SQLite with the full schema; StaticPool keeps one database across threads."""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session_local(request, engine):
+    """
+    A sessionmaker on `engine`, patched in for the SessionLocal the test module names.
+
+    The patch target is the indirect parameter if there is one, else the module's
+    SESSION_LOCAL, e.g. SESSION_LOCAL = "app.services.purge_service.SessionLocal".
+    Modules that need seed rows or extra patches override this fixture and request it.
+    """
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    target = getattr(request, "param", None) or getattr(request.module, "SESSION_LOCAL", None)
+    if target is None:
+        yield factory
+        return
+    with patch(target, factory):
+        yield factory
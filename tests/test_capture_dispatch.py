@@ -0,0 +1,90 @@
+import threading
+import time
+import unittest
+from concurrent.futures import CancelledError
+from unittest.mock import patch
+
+from app.services.form_capture_service import FormCaptureService
+
+
+class TestCaptureDispatch(unittest.TestCase):
+    def setUp(self):
+        self.service = FormCaptureService()
+        self.saved = (self.service.is_running, self.service.thread, self.service.page)
+        self.service.is_running = True
+        self.service.thread = None
+        self.service.page = "page"
+        self.service._fail_pending_tasks()
+        self.service.task_timings.clear()
+
+    def tearDown(self):
+        self.service._fail_pending_tasks()
+        self.service.is_running, self.service.thread, self.service.page = self.saved
+
+    def test_future_resolves_when_browser_thread_runs_task(self):
+        future = self.service.submit_task(lambda page: f"ran on {page}")
+        self.assertFalse(future.done())
+
+        self.service._run_pending_tasks()
+
+        self.assertEqual(future.result(timeout=1), "ran on page")
+        self.assertEqual(self.service.task_stats()["tasks"], 1)
+
+    def test_exception_is_raised_to_caller(self):
+        def boom(page):
+            raise ValueError("bad selector")
+
+        future = self.service.submit_task(boom)
+        self.service._run_pending_tasks()
+
+        with self.assertRaises(ValueError):
+            future.result(timeout=1)
+
+    def test_cancelled_task_is_skipped(self):
+        calls = []
+        future = self.service.submit_task(lambda page: calls.append(page))
+        future.cancel()
+
+        self.service._run_pending_tasks()
+
+        self.assertEqual(calls, [])
+        with self.assertRaises(CancelledError):
+            future.result(timeout=1)
+
+    def test_execute_task_times_out_instead_of_blocking(self):
+        with self.assertRaises(TimeoutError):
+            self.service.execute_task(lambda page: None, timeout=0.05)
+        # The timed-out task was cancelled, so the browser thread skips it
+        self.service._run_pending_tasks()
+        self.assertEqual(self.service.task_stats()["tasks"], 0)
+
+    def test_execute_task_from_browser_thread_runs_inline(self):
+        self.service.thread = threading.current_thread()
+
+        self.assertEqual(self.service.execute_task(lambda page: 42, timeout=1), 42)
+
+    def test_pending_tasks_fail_when_session_stops(self):
+        future = self.service.submit_task(lambda page: None)
+
+        self.service._fail_pending_tasks()
+
+        with self.assertRaises(RuntimeError):
+            future.result(timeout=1)
+
+    def test_cold_start_does_not_sleep(self):
+        self.service.is_running = False
+        with patch.object(self.service, "start_capture_session") as start, patch("time.sleep") as sleep:
+            self.service.submit_task(lambda page: None)
+        start.assert_called_once()
+        sleep.assert_not_called()
+
+    def test_queue_wait_is_recorded(self):
+        self.service.submit_task(lambda page: None)
+        time.sleep(0.02)
+        self.service._run_pending_tasks()
+
+        self.assertGreaterEqual(self.service.task_stats()["queue_wait_ms_max"], 15)
+
+
+if __name__ == "__main__":
+    unittest.main()
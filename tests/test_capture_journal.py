@@ -0,0 +1,183 @@
+import json
+import threading
+import time
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import MagicMock, patch
+
+from app.services.capture_journal import CaptureJournal
+from app.services.form_capture_service import FormCaptureService
+
+
+class TestCaptureJournal(unittest.TestCase):
+    def setUp(self):
+        self.tmp = TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "captured_forms.journal"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_burst_is_written_behind_in_one_batch(self):
+        journal = CaptureJournal(self.path, flush_delay=0.05)
+        for i in range(20):
+            journal.append({"page": "p", "selector": "#name", "data": {"value": "x" * i}})
+        self.assertFalse(self.path.exists())  # nothing written on the caller's thread
+
+        deadline = time.time() + 2
+        while len(journal.replay()) < 20 and time.time() < deadline:
+            time.sleep(0.02)
+        events = journal.replay()
+        self.assertEqual(len(events), 20)
+        self.assertEqual(events[-1]["data"]["value"], "x" * 19)
+
+    def test_append_does_not_wait_on_fsync(self):
+        journal = CaptureJournal(self.path, flush_delay=0)
+        journal._writer = MagicMock()  # flush by hand below
+        journal._writer.is_alive.return_value = True
+        journal.append({"page": "p", "selector": "#a", "data": {}})
+        in_fsync, release = threading.Event(), threading.Event()
+
+        def slow_fsync(fd):
+            in_fsync.set()
+            release.wait(2)
+
+        with patch("app.services.capture_journal.os.fsync", slow_fsync):
+            flusher = threading.Thread(target=journal.flush)
+            flusher.start()
+            self.assertTrue(in_fsync.wait(2))
+            started = time.monotonic()
+            journal.append({"page": "p", "selector": "#b", "data": {}})
+            self.assertLess(time.monotonic() - started, 0.5)
+            release.set()
+            flusher.join()
+        journal.flush()
+
+        self.assertEqual([e["selector"] for e in journal.replay()], ["#a", "#b"])
+
+    def test_torn_last_line_is_skipped(self):
+        self.path.write_text(json.dumps({"page": "p", "selector": "#a", "data": {}, "seq": 1}) + "\n{\"page\": \"p\", \"sel")
+
+        self.assertEqual([e["selector"] for e in CaptureJournal(self.path).replay()], ["#a"])
+
+    def test_reset_keeps_events_newer_than_mark(self):
+        journal = CaptureJournal(self.path, flush_delay=0)
+        journal.append({"page": "p", "selector": "#a", "data": {}})
+        journal.flush()
+        mark = journal.mark()
+        journal.append({"page": "p", "selector": "#b", "data": {}})
+        journal.flush()
+
+        journal.reset(mark)
+
+        self.assertEqual([e["selector"] for e in journal.replay()], ["#b"])
+
+    def test_sequence_continues_after_restart(self):
+        journal = CaptureJournal(self.path, flush_delay=0)
+        journal.append({"page": "p", "selector": "#a", "data": {}})
+        journal.flush()
+
+        reopened = CaptureJournal(self.path)
+        reopened.reset(reopened.mark())
+
+        self.assertEqual(reopened.replay(), [])
+
+
+class TestCaptureRecovery(unittest.TestCase):
+    def setUp(self):
+        self.tmp = TemporaryDirectory()
+        self.service = FormCaptureService()
+        self.saved = (self.service.output_file, self.service.journal, self.service.session_data)
+        self.service.output_file = Path(self.tmp.name) / "captured_forms.json"
+        self.service.journal = CaptureJournal(self.service.output_file.with_suffix(".journal"), flush_delay=0)
+
+    def tearDown(self):
+        self.service.output_file, self.service.journal, self.service.session_data = self.saved
+        self.tmp.cleanup()
+
+    def test_field_edit_is_journaled_not_snapshotted(self):
+        self.service.session_data = {"pages": {}}
+        self.service.page = None
+        source = MagicMock()
+        source.page.url = "https://portal/form"
+
+        with patch.object(self.service, "_save_data") as save_data:
+            self.service._handle_captured_data(source, {"selector": "#txt_full_name", "value": "Ali"})
+        self.service.journal.flush()
+
+        save_data.assert_not_called()
+        self.assertEqual(self.service.journal.replay()[0]["selector"], "#txt_full_name")
+
+    def test_batched_events_are_recorded_per_selector(self):
+        self.service.session_data = {"pages": {}}
+        self.service.page = None
+        source = MagicMock()
+        source.page.url = "https://portal/form"
+
+        self.service._handle_captured_data(source, {"type": "batch", "events": [
+            {"selector": "#txt_full_name", "value": "Ali"},
+            {"selector": "#nic1", "value": "35202"},
+            {"value": "no selector"},
+        ]})
+        self.service.journal.flush()
+
+        fields = self.service.session_data["pages"]["https://portal/form"]["fields"]
+        self.assertEqual(fields["#txt_full_name"]["value"], "Ali")
+        self.assertEqual(fields["#nic1"]["value"], "35202")
+        self.assertEqual([e["selector"] for e in self.service.journal.replay()], ["#txt_full_name", "#nic1"])
+
+    def test_saved_submission_keeps_later_edits(self):
+        submitted = {"pages": {"https://portal/form": {"fields": {
+            "#txt_chassis": {"value": "CH-1"}, "#txt_full_name": {"value": "Ali"}}}}}
+        self.service.session_data = {"pages": {"https://portal/form": {"fields": {
+            "#txt_chassis": {"value": "CH-1"}, "#txt_full_name": {"value": "Bilal"}}}}}
+
+        self.service._on_submission_written(submitted, {"chassis_number": "CH-1"}, None)
+
+        fields = self.service.session_data["pages"]["https://portal/form"]["fields"]
+        self.assertEqual(fields, {"#txt_full_name": {"value": "Bilal"}})
+
+    def test_submission_ack_races_field_edits_safely(self):
+        self.service.session_data = {"pages": {}}
+        submitted = {"pages": {f"https://portal/p{i}": {"fields": {"#a": {"value": i}}} for i in range(50)}}
+        errors = []
+        debug_log = Path("save_debug.txt")
+        debug_size = debug_log.stat().st_size if debug_log.exists() else 0
+
+        def edit():
+            try:
+                for n in range(2000):
+                    self.service._record_field(f"https://portal/p{n % 60}", {"selector": f"#f{n % 7}", "value": n})
+            except Exception as e:
+                errors.append(e)
+
+        editor = threading.Thread(target=edit)
+        editor.start()
+        for _ in range(20):
+            self.service._on_submission_written(submitted, {"chassis_number": "CH-1"}, None)
+        editor.join()
+
+        self.assertEqual(errors, [])
+        # Saves no longer append debug lines
+        self.assertEqual(debug_log.stat().st_size if debug_log.exists() else 0, debug_size)
+
+    def test_recovery_replays_journal_over_snapshot(self):
+        self.service.output_file.write_text(json.dumps({"pages": {"https://portal/form": {"fields": {
+            "#txt_full_name": {"value": "Old"}}}}}))
+        self.service.journal.append({"page": "https://portal/form", "selector": "#txt_full_name", "data": {"value": "New"}, "ts": 1})
+        self.service.journal.append({"page": "https://portal/form", "selector": "#nic1", "data": {"value": "35202"}, "ts": 2})
+        self.service.journal.flush()
+
+        data = self.service._load_session_data()
+
+        fields = data["pages"]["https://portal/form"]["fields"]
+        self.assertEqual(fields["#txt_full_name"]["value"], "New")
+        self.assertEqual(fields["#nic1"]["value"], "35202")
+        # Compacted: the snapshot has everything and the journal is empty
+        snapshot = json.loads(self.service.output_file.read_text())
+        self.assertEqual(snapshot["pages"]["https://portal/form"]["fields"]["#nic1"]["value"], "35202")
+        self.assertEqual(self.service.journal.replay(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
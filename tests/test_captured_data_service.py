@@ -0,0 +1,98 @@
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.orm import scoped_session
+
+from app.db.models import CapturedData
+from app.services.captured_data_service import CapturedDataService
+
+
+@pytest.fixture
+def service(session_local):
+    svc = CapturedDataService()
+    svc.db = scoped_session(session_local)
+
+    base = datetime(2025, 1, 1)
+    rows = [CapturedData(chassis_number=f"CH-{i:02d}", name="ALI" if i % 2 else "BILAL",
+                         created_at=base + timedelta(minutes=i // 3))  # ties on created_at
+            for i in range(25)]
+    rows.append(CapturedData(chassis_number="CH-DEL", is_deleted=True, created_at=base))
+    svc.db.add_all(rows)
+    svc.db.commit()
+    yield svc
+    svc.db.remove()
+
+
+def test_keyset_pages_cover_every_row_once_newest_first(service):
+    seen, cursor = [], None
+    while True:
+        page = service.get_captured_page(cursor=cursor, per_page=7)
+        seen.extend((r.created_at, r.id) for r in page["data"])
+        if not page["has_more"]:
+            assert page["next_cursor"] is None
+            break
+        cursor = page["next_cursor"]
+
+    assert len(seen) == 25
+    assert seen == sorted(seen, reverse=True)
+
+
+def test_keyset_page_applies_search(service):
+    page = service.get_captured_page(per_page=50, search_query="bilal")
+    assert {r.name for r in page["data"]} == {"BILAL"}
+    assert len(page["data"]) == 13
+
+
+def test_total_count_is_cached_and_refreshed_in_background(service):
+    ready = threading.Event()
+    counts = []
+
+    assert service.get_total_count(on_ready=lambda n: (counts.append(n), ready.set())) is None
+    assert ready.wait(5)
+    assert counts == [25]
+    assert service.get_total_count() == 25
+
+    service.invalidate_counts()
+    assert service.get_total_count() is None
+
+
+def test_rows_without_created_at_are_paged_last(service):
+    # Legacy rows; an ORM insert would apply the created_at default
+    service.db.execute(CapturedData.__table__.insert(),
+                       [{"chassis_number": f"CH-NULL-{i}", "is_deleted": False, "created_at": None} for i in range(4)])
+    service.db.commit()
+
+    seen, cursor = [], None
+    while True:
+        page = service.get_captured_page(cursor=cursor, per_page=7)
+        seen.extend(r.chassis_number for r in page["data"])
+        if not page["has_more"]:
+            break
+        cursor = page["next_cursor"]
+
+    assert len(seen) == len(set(seen)) == 29
+    assert sorted(seen[-4:]) == [f"CH-NULL-{i}" for i in range(4)]
+
+
+def test_count_racing_an_invalidation_is_not_cached(service):
+    ready = threading.Event()
+    counts = []
+    real_query = service._filtered_query
+    calls = []
+
+    def racing_query(search_query=None):
+        calls.append(search_query)
+        if len(calls) == 1:
+            # Records change while the first count runs
+            service.invalidate_counts()
+        return real_query(search_query)
+
+    service._filtered_query = racing_query
+    service.get_total_count(on_ready=lambda n: (counts.append(n), ready.set()))
+    assert ready.wait(5)
+
+    # The racing count was discarded and the records counted again
+    assert len(calls) == 2
+    assert counts == [25]
+    assert service.get_total_count() == 25
@@ -0,0 +1,63 @@
+import threading
+from unittest.mock import patch
+
+from app.db.models import CapturedData
+from app.services import captured_form_processor
+from app.services.captured_form_processor import CapturedFormProcessor
+
+SESSION_LOCAL = "app.services.captured_form_processor.SessionLocal"
+
+MAPPING = {"#txt_chassis": "chassis_number", "#txt_full_name": "buyer_name", "#txt_engine_no": "engine_number"}
+
+
+def _session(chassis, name="ali", engine="eng-1"):
+    return {"pages": {"https://portal/form": {"fields": {
+        "#txt_chassis": {"value": chassis},
+        "#txt_full_name": {"value": name},
+        "#txt_engine_no": {"value": engine},
+    }}}}
+
+
+def test_save_records_upserts_on_chassis(session_local):
+    processor = CapturedFormProcessor({"field_mapping": MAPPING})
+
+    assert processor.save_records([processor.prepare_record(_session("CH-1"))]) == 1
+    assert processor.save_records([
+        processor.prepare_record(_session("CH-1", name="ali khan", engine="")),
+        processor.prepare_record(_session("CH-2")),
+    ]) == 2
+
+    with session_local() as db:
+        rows = {r.chassis_number: r for r in db.query(CapturedData).all()}
+    assert set(rows) == {"CH-1", "CH-2"}
+    assert rows["CH-1"].name == "ALI KHAN"
+    assert rows["CH-1"].engine_number is None
+    assert rows["CH-2"].is_deleted is False
+
+
+def test_submit_writes_on_writer_thread_and_acknowledges(session_local):
+    processor = CapturedFormProcessor({"field_mapping": MAPPING})
+    done = threading.Event()
+    acks = []
+
+    def on_done(record, error):
+        acks.append((record["chassis_number"], error, threading.current_thread().name))
+        done.set()
+
+    assert processor.submit(_session("CH-9"), on_done=on_done) is True
+    assert done.wait(5)
+
+    assert acks == [("CH-9", None, "capture-writer")]
+    with session_local() as db:
+        assert db.query(CapturedData).filter_by(chassis_number="CH-9").count() == 1
+
+
+def test_submit_rejects_invalid_and_overflow(session_local):
+    processor = CapturedFormProcessor({"field_mapping": MAPPING})
+    assert processor.submit({"pages": {}}) is False
+
+    with patch.object(processor, "_ensure_writer"):
+        for i in range(captured_form_processor.SUBMISSION_QUEUE_SIZE):
+            assert processor.submit(_session(f"CH-{i}")) is True
+        assert processor.submit(_session("CH-overflow")) is False
+    assert processor.pending_writes() == captured_form_processor.SUBMISSION_QUEUE_SIZE
@@ -0,0 +1,108 @@
+import pytest
+from unittest.mock import patch
+
+from app.db.models import Customer, CustomerMergeSuggestion, Invoice
+from app.services import customer_dedup_service as dedup_module
+from app.services.customer_dedup_service import CustomerDedupService, phonetic_key, normalize_phone
+
+SESSION_LOCAL = "app.services.customer_dedup_service.SessionLocal"
+
+
+def _invoice(number, customer_id):
+    return Invoice(invoice_number=number, pos_id="1", usin=number, customer_id=customer_id,
+                   total_sale_value=100, total_tax_charged=18, total_quantity=1, total_amount=118)
+
+
+@pytest.fixture
+def session_local(session_local):
+    with session_local() as db:
+        db.add_all([
+            # 1 and 2: same buyer, spelling + CNIC typo + phone format
+            Customer(id=1, cnic="35202-1234567-1", name="MUHAMMAD ALI", father_name="AKBAR KHAN", phone="03001234567"),
+            Customer(id=2, cnic="35202-1234576-1", name="MOHAMMAD ALI", father_name="AKBAR KHAN", phone="+92 300 1234567"),
+            # 3: same name and father, different person (CNIC and phone differ)
+            Customer(id=3, cnic="61101-9999999-3", name="MUHAMMAD ALI", father_name="AKBAR", phone="03339999999"),
+            # 4 and 5: same phone, spelling variants, no father name on one
+            Customer(id=4, cnic="42101-5555555-5", name="ZAIN UL ABIDEEN", phone="03211112222"),
+            Customer(id=5, cnic="42101-7777777-7", name="ZAIN UL ABIDIN", phone="0321-1112222"),
+            Customer(id=6, cnic="35202-0000000-6", name="UNRELATED PERSON", phone="03450000000"),
+        ])
+        db.flush()
+        db.add_all([_invoice("INV-1", 2), _invoice("INV-2", 2), _invoice("INV-3", 1), _invoice("INV-4", 5)])
+        db.commit()
+    with patch.object(dedup_module, "customer_index") as index, \
+            patch.object(dedup_module, "customer_service"):
+        session_local.index = index
+        yield session_local
+
+
+def _pairs(db, status="PENDING"):
+    return {(s.primary_id, s.duplicate_id) for s in db.query(CustomerMergeSuggestion).filter_by(status=status)}
+
+
+def test_blocking_keys():
+    assert phonetic_key("MUHAMMAD ALI") == phonetic_key("Mohammad Aly") == phonetic_key("MOHAMMED ALI") == "mhmd al"
+    assert normalize_phone("+92 300 1234567") == normalize_phone("3001234567") == "03001234567"
+    assert normalize_phone("12345") == ""
+
+
+def test_scan_suggests_ranked_pairs_keeping_busier_record(session_local):
+    assert CustomerDedupService().find_duplicates() == 2
+
+    with session_local() as db:
+        # 2 has more invoices than 1, so 2 is kept; 5 has an invoice, 4 doesn't
+        assert _pairs(db) == {(2, 1), (5, 4)}
+        best = db.query(CustomerMergeSuggestion).order_by(CustomerMergeSuggestion.score.desc()).first()
+        assert (best.primary_id, best.duplicate_id) == (2, 1)
+        assert "CNIC differs by a typo" in best.reasons and "same phone" in best.reasons
+
+
+def test_rescan_skips_dismissed_pairs(session_local):
+    service = CustomerDedupService()
+    service.find_duplicates()
+    rows = {r[2]: r[0] for r in service.get_pending_suggestions()}
+
+    assert service.dismiss_suggestions([rows[5]]) == 1
+    assert service.find_duplicates() == 1
+    with session_local() as db:
+        assert _pairs(db) == {(2, 1)}
+
+
+def test_oversized_blocks_are_not_compared(session_local):
+    with patch.object(dedup_module, "MAX_BLOCK_SIZE", 1):
+        assert CustomerDedupService().find_duplicates() == 0
+
+
+def test_merge_repoints_invoices_and_soft_deletes(session_local):
+    service = CustomerDedupService()
+    service.find_duplicates()
+    ids = [r[0] for r in service.get_pending_suggestions()]
+
+    success, message = service.merge_suggestions(ids)
+
+    assert success, message
+    with session_local() as db:
+        owners = {i.invoice_number: i.customer_id for i in db.query(Invoice)}
+        assert owners == {"INV-1": 2, "INV-2": 2, "INV-3": 2, "INV-4": 5}
+        deleted = {c.id for c in db.query(Customer).filter(Customer.is_deleted == True)}
+        assert deleted == {1, 4}
+        assert _pairs(db) == set()
+        assert _pairs(db, "MERGED") == {(2, 1), (5, 4)}
+    assert {c.args[0] for c in session_local.index.remove.call_args_list} == {1, 4}
+
+
+def test_merge_collapses_chains(session_local):
+    with session_local() as db:
+        db.add_all([
+            CustomerMergeSuggestion(primary_id=2, duplicate_id=1, score=0.9, status="PENDING"),
+            CustomerMergeSuggestion(primary_id=1, duplicate_id=3, score=0.8, status="PENDING"),
+        ])
+        db.commit()
+        ids = [s.id for s in db.query(CustomerMergeSuggestion)]
+
+    success, _ = CustomerDedupService().merge_suggestions(ids)
+
+    assert success
+    with session_local() as db:
+        assert {i.customer_id for i in db.query(Invoice).filter(Invoice.customer_id.in_([1, 2, 3]))} == {2}
+        assert {c.id for c in db.query(Customer).filter(Customer.is_deleted == True)} == {1, 3}
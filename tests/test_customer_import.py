@@ -0,0 +1,108 @@
+import csv
+
+import pytest
+from unittest.mock import patch
+
+from app.db.models import Customer, CustomerType
+from app.services import customer_import_service as import_module
+from app.services.customer_import_service import CustomerImportService
+
+SESSION_LOCAL = "app.services.customer_import_service.SessionLocal"
+
+
+@pytest.fixture
+def session_local(session_local):
+    with session_local() as db:
+        db.add(Customer(cnic="35202-0000000-1", name="OLD", business_name="HONDA CENTER",
+                        normalized_business_name="hondacenter", type=CustomerType.DEALER))
+        db.commit()
+    with patch.object(import_module, "customer_index") as index, \
+            patch.object(import_module, "customer_service"):
+        session_local.index = index
+        yield session_local
+
+
+def _write_csv(path, rows):
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["CNIC", "Name", "Father Name", "Business Name", "Phone", "NTN", "Type"])
+        writer.writerows(rows)
+    return str(path)
+
+
+def test_csv_import_validates_and_reports_per_row(session_local, tmp_path):
+    path = _write_csv(tmp_path / "customers.csv", [
+        ["3520212345671", "ali", "akbar", "", "3001234567", "", ""],          # 2: ok, digits reformatted
+        ["35202-1234567-1", "ali again", "", "", "03001234567", "", ""],      # 3: duplicate in file
+        ["35202-0000000-1", "old", "", "", "03001234567", "", ""],            # 4: already in DB
+        ["1234", "bad", "", "", "0300", "12", ""],                            # 5: three format errors
+        ["", "", "", "", "", "", ""],                                         # 6: blank, skipped
+        ["35202-7654321-1", "bilal", "", "Honda-Center", "03211234567", "", "dealer"],  # 7: name taken
+        ["35202-7654321-2", "zain", "", "Yamaha Point", "03211234567", "1234567-8", "DEALER"],  # 8: ok
+    ])
+
+    result = CustomerImportService().import_file(path)
+
+    assert result.total == 6
+    assert result.imported == 2
+    errors = {(e.row, e.field) for e in result.errors}
+    assert errors == {(3, "cnic"), (4, "cnic"), (5, "cnic"), (5, "phone"), (5, "ntn"), (7, "business_name")}
+
+    with session_local() as db:
+        rows = {c.cnic: c for c in db.query(Customer).filter(Customer.cnic != "35202-0000000-1")}
+    assert set(rows) == {"35202-1234567-1", "35202-7654321-2"}
+    assert rows["35202-1234567-1"].name == "ALI"
+    assert rows["35202-1234567-1"].phone == "03001234567"
+    assert rows["35202-7654321-2"].normalized_business_name == "yamahapoint"
+    assert rows["35202-7654321-2"].type == CustomerType.DEALER
+    assert session_local.index.upsert.call_count == 2
+
+    report = tmp_path / "errors.csv"
+    result.write_report(str(report))
+    lines = report.read_text().splitlines()
+    assert lines[0] == "Row,Field,Error"
+    assert len(lines) == 7
+
+
+def test_forced_dealer_type_requires_business_name(session_local):
+    result = CustomerImportService().import_rows(
+        [{"cnic": "35202-1111111-1", "name": "a", "phone": "03001234567"}], customer_type=CustomerType.DEALER
+    )
+
+    assert result.imported == 0
+    assert [(e.row, e.field) for e in result.errors] == [(2, "business_name")]
+
+
+def test_inserts_in_chunks_and_isolates_conflicting_row(session_local):
+    rows = [{"cnic": f"35202-{i:07d}-9", "name": f"c{i}", "phone": "03001234567"} for i in range(5)]
+    service = CustomerImportService()
+
+    # A row that appears in the DB between the duplicate check and the insert
+    real_drop = service._drop_existing
+
+    def drop_then_race(records, result):
+        kept = real_drop(records, result)
+        with session_local() as db:
+            db.add(Customer(cnic="35202-0000003-9", name="RACE"))
+            db.commit()
+        return kept
+
+    with patch.object(import_module, "IMPORT_CHUNK_SIZE", 2), \
+            patch.object(service, "_drop_existing", drop_then_race):
+        result = service.import_rows(rows)
+
+    assert result.imported == 4
+    assert [(e.row, e.field) for e in result.errors] == [(5, "cnic")]
+    with session_local() as db:
+        assert db.query(Customer).count() == 6
+
+
+def test_unsupported_file_and_missing_columns(tmp_path):
+    service = CustomerImportService()
+    with pytest.raises(ValueError):
+        service.read_file(str(tmp_path / "customers.txt"))
+
+    path = tmp_path / "no_cnic.csv"
+    path.write_text("Name,Phone\nali,03001234567\n")
+    with pytest.raises(ValueError):
+        service.read_file(str(path))
@@ -0,0 +1,79 @@
+import pytest
+from unittest.mock import patch
+from sqlalchemy import event, text
+from sqlalchemy.orm import scoped_session
+
+from app.db.models import Customer, Invoice
+from app.services import customer_service as customer_module
+from app.services.customer_service import CustomerService
+
+
+@pytest.fixture
+def service(session_local):
+    db = scoped_session(session_local)
+    customer = Customer(cnic="35202-1234567-1", name="ALI", father_name="AKBAR", phone="0300", address="LHR")
+    db.add(customer)
+    db.flush()
+    for number in ("INV-1", "INV-2"):
+        db.add(Invoice(invoice_number=number, pos_id="1", usin=number, customer_id=customer.id,
+                       total_sale_value=100, total_tax_charged=18, total_quantity=1, total_amount=118))
+    db.commit()
+
+    service = CustomerService()
+    with patch.object(service, "db", db):
+        yield service
+    db.remove()
+
+
+def _count_queries(engine):
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    return statements
+
+
+def test_profile_comes_from_customer_and_latest_invoice(service):
+    profile = service.get_customer_profile("35202-1234567-1")
+
+    assert (profile.name, profile.father_name, profile.phone) == ("ALI", "AKBAR", "0300")
+    assert profile.last_invoice_number == "INV-2"
+
+
+def test_repeat_lookups_are_cached_under_normalized_cnic(service, engine):
+    service.get_customer_profile("35202-1234567-1")
+    statements = _count_queries(engine)
+
+    assert service.get_customer_profile("3520212345671").name == "ALI"
+    assert service.get_customer_profile("99999-9999999-9") is None
+    assert service.get_customer_profile("99999-9999999-9") is None  # Misses are cached too
+    assert len(statements) == 1
+
+
+def test_customer_write_invalidates_profile(service):
+    assert service.get_customer_profile("35202-1234567-1").phone == "0300"
+
+    customer = service.get_customer_by_cnic("35202-1234567-1")
+    with patch.object(customer_module, "customer_index"):
+        service.update_customer(customer.id, "35202-1234567-1", "ALI", "AKBAR", "0321", "LHR")
+
+    assert service.get_customer_profile("35202-1234567-1").phone == "0321"
+
+
+def test_cache_is_bounded_lru(service):
+    with patch.object(customer_module, "PROFILE_CACHE_SIZE", 2):
+        service.get_customer_profile("35202-1234567-1")
+        service.get_customer_profile("11111-1111111-1")
+        service.get_customer_profile("35202-1234567-1")  # Refresh: most recently used
+        service.get_customer_profile("22222-2222222-2")
+
+    assert list(service._profiles) == ["3520212345671", "2222222222222"]
+
+
+def test_latest_invoice_lookup_uses_customer_index(engine):
+    with engine.connect() as conn:
+        plan = conn.execute(text(
+            "EXPLAIN QUERY PLAN SELECT invoice_number FROM invoices WHERE customer_id = 1 ORDER BY id DESC LIMIT 1"
+        )).fetchall()
+
+    detail = " ".join(str(row[-1]) for row in plan)
+    assert "ix_invoices_customer_id_id" in detail
+    assert "TEMP B-TREE" not in detail
@@ -0,0 +1,94 @@
+import threading
+import unittest
+
+from app.ui.data_loader import AsyncLoader
+
+
+class FakeWidget:
+    """Stands in for a Tk widget: after() callbacks run when pump() is called."""
+
+    def __init__(self):
+        self.scheduled = []
+        self.lock = threading.Lock()
+
+    def after(self, ms, callback):
+        with self.lock:
+            self.scheduled.append(callback)
+            return len(self.scheduled) - 1
+
+    def after_cancel(self, job):
+        with self.lock:
+            self.scheduled[job] = None
+
+    def winfo_exists(self):
+        return True
+
+    def pump(self):
+        with self.lock:
+            callbacks, self.scheduled = self.scheduled, []
+        for callback in callbacks:
+            if callback:
+                callback()
+
+
+class TestAsyncLoader(unittest.TestCase):
+    def setUp(self):
+        self.widget = FakeWidget()
+        self.loader = AsyncLoader(self.widget)
+        self.results = []
+
+    def _wait(self):
+        self.loader._future.result(timeout=5)
+
+    def test_result_delivered_through_after(self):
+        self.loader.load(lambda: [1, 2], self.results.append)
+        self._wait()
+        self.assertEqual(self.results, [])  # Not on the worker thread
+
+        self.widget.pump()
+        self.assertEqual(self.results, [[1, 2]])
+
+    def test_newer_load_supersedes_running_one(self):
+        started, release = threading.Event(), threading.Event()
+
+        def slow():
+            started.set()
+            release.wait(5)
+            return "old"
+
+        self.loader.load(slow, self.results.append)
+        first = self.loader._future
+        self.assertTrue(started.wait(5))
+        self.loader.load(lambda: "new", self.results.append)
+        release.set()
+        first.result(timeout=5)
+        self._wait()
+
+        self.widget.pump()
+        self.assertEqual(self.results, ["new"])
+
+    def test_debounced_load_restarts_wait(self):
+        self.loader.load(lambda: "a", self.results.append, delay_ms=300)
+        self.loader.load(lambda: "ab", self.results.append, delay_ms=300)
+
+        self.widget.pump()  # Fires the surviving debounce timer
+        self._wait()
+        self.widget.pump()
+        self.assertEqual(self.results, ["ab"])
+
+    def test_errors_go_to_on_error(self):
+        errors = []
+
+        def fail():
+            raise ValueError("db down")
+
+        self.loader.load(fail, self.results.append, on_error=errors.append)
+        self._wait()
+        self.widget.pump()
+
+        self.assertEqual(self.results, [])
+        self.assertEqual(str(errors[0]), "db down")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,34 @@
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from app.ui.main_window import App, FRAME_MODULES, WARMUP_FRAMES
+
+
+class TestDeferredFrames(unittest.TestCase):
+    def _fake_app(self):
+        app = SimpleNamespace()
+        create = MagicMock(side_effect=lambda: setattr(app, "reports_frame", MagicMock()))
+        app._frame_factories = {"reports": ("reports_frame", create)}
+        return app, create
+
+    def test_frame_built_once_on_first_request(self):
+        app, create = self._fake_app()
+
+        self.assertTrue(App._ensure_frame(app, "reports"))
+        self.assertFalse(App._ensure_frame(app, "reports"))
+        create.assert_called_once()
+
+    def test_eager_frames_are_not_factories(self):
+        app, create = self._fake_app()
+
+        self.assertFalse(App._ensure_frame(app, "home"))
+        create.assert_not_called()
+
+    def test_warmup_frames_have_modules(self):
+        for name in WARMUP_FRAMES:
+            self.assertIn(name, FRAME_MODULES)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -79,7 +79,8 @@ def test_form_capture_td_extraction():
         
         # Expose python binding
         def py_capture(data):
-            captured_data.append(data)
+            # Field events arrive batched
+            captured_data.extend(data["events"] if data.get("type") == "batch" else [data])
             
         page.expose_function("py_capture", py_capture)
         
@@ -183,7 +184,8 @@ def test_label_based_extraction():
         page = browser.new_page()
         
         def py_capture(data):
-            captured_data.append(data)
+            # Field events arrive batched
+            captured_data.extend(data["events"] if data.get("type") == "batch" else [data])
             
         page.expose_function("py_capture", py_capture)
         page.set_content(html_content)
@@ -266,7 +268,8 @@ def test_complex_layouts():
         page = browser.new_page()
         
         def py_capture(data):
-            captured_data.append(data)
+            # Field events arrive batched
+            captured_data.extend(data["events"] if data.get("type") == "batch" else [data])
             
         page.expose_function("py_capture", py_capture)
         page.set_content(html_content)
@@ -0,0 +1,58 @@
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import MagicMock, patch
+
+from app.services.backup_service import BackupService
+from app.services.settings_service import SettingsService
+
+
+class TestLazySettingsService(unittest.TestCase):
+    @patch("app.services.settings_service.SessionLocal")
+    def test_constructor_does_not_touch_db(self, mock_session_local):
+        SettingsService()
+        mock_session_local.assert_not_called()
+
+    @patch("app.services.settings_service.SessionLocal")
+    def test_defaults_initialized_once_on_first_use(self, mock_session_local):
+        mock_db = MagicMock()
+        mock_session_local.return_value = mock_db
+        service = SettingsService()
+
+        with patch.object(service, "_initialize_defaults", wraps=service._initialize_defaults) as init:
+            service.get_active_environment()
+            service.get_active_environment()
+            init.assert_called_once()
+        self.assertTrue(service._defaults_ready)
+
+    @patch("app.services.settings_service.SessionLocal")
+    def test_failed_initialization_is_retried(self, mock_session_local):
+        mock_db = MagicMock()
+        mock_db.query.side_effect = [Exception("no such table"), MagicMock(), MagicMock(), MagicMock()]
+        mock_session_local.return_value = mock_db
+        service = SettingsService()
+
+        service._ensure_defaults()
+        self.assertFalse(service._defaults_ready)
+        service._ensure_defaults()
+        self.assertTrue(service._defaults_ready)
+
+
+class TestLazyBackupService(unittest.TestCase):
+    def test_config_loaded_on_first_access(self):
+        with TemporaryDirectory() as tmp:
+            data_dir = Path(tmp) / "appdata"
+            with patch("app.services.backup_service.platformdirs") as mock_dirs:
+                mock_dirs.user_data_dir.return_value = str(data_dir)
+                service = BackupService()
+
+            self.assertFalse(data_dir.exists())
+
+            config = service.config
+            self.assertTrue((data_dir / "backup_config.json").exists())
+            self.assertEqual(config.local_path, str(data_dir / "backups"))
+            self.assertIs(service.config, config)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+from datetime import datetime, timedelta
+
+import pytest
+from unittest.mock import patch
+from sqlalchemy import desc, text
+
+from app.db.models import CapturedData, Customer, CustomerMergeSuggestion, Invoice
+from app.db.session import soft_delete_index_ddl
+from app.services import purge_service as purge_module
+from app.services.purge_service import PurgeService
+
+OLD = datetime.utcnow() - timedelta(days=200)
+RECENT = datetime.utcnow() - timedelta(days=5)
+SESSION_LOCAL = "app.services.purge_service.SessionLocal"
+
+
+@pytest.fixture
+def session_local(session_local, engine):
+    with engine.connect() as conn:
+        for statement in soft_delete_index_ddl("sqlite"):
+            conn.execute(text(statement))
+        conn.commit()
+    with patch.object(purge_module, "customer_service") as service, \
+            patch.object(purge_module, "BATCH_PAUSE_SECONDS", 0):
+        session_local.customer_service = service
+        yield session_local
+
+
+def _plan(db, query):
+    sql = str(query.statement.compile(db.get_bind(), compile_kwargs={"literal_binds": True}))
+    return " ".join(str(row[-1]) for row in db.execute(text("EXPLAIN QUERY PLAN " + sql)))
+
+
+def test_mysql_indexes_lead_with_is_deleted():
+    ddl = soft_delete_index_ddl("mysql")
+    assert "CREATE INDEX ix_customers_live_id ON customers (is_deleted, id)" in ddl
+    assert all("WHERE" not in statement for statement in ddl)
+
+
+def test_live_queries_use_partial_indexes(session_local):
+    with session_local() as db:
+        customers = db.query(Customer).filter(Customer.is_deleted == False).order_by(Customer.id.desc())
+        assert "ix_customers_live_id" in _plan(db, customers)
+
+        page = db.query(CapturedData).filter(CapturedData.is_deleted == False).order_by(
+            desc(CapturedData.created_at), desc(CapturedData.id)).limit(21)
+        assert "ix_captured_data_live_created" in _plan(db, page)
+
+        dead = db.query(Customer.id).filter(Customer.is_deleted == True, Customer.deleted_at < RECENT)
+        assert "ix_customers_deleted_at" in _plan(db, dead)
+
+
+def test_purge_removes_only_expired_rows_in_batches(session_local):
+    with session_local() as db:
+        db.add_all([Customer(id=i, cnic=f"35202-000000{i}-1", name=f"OLD {i}", is_deleted=True, deleted_at=OLD)
+                    for i in range(1, 6)])
+        db.add_all([
+            Customer(id=6, cnic="35202-0000006-1", name="RECENT", is_deleted=True, deleted_at=RECENT),
+            Customer(id=7, cnic="35202-0000007-1", name="LIVE"),
+            # Deleted long ago but still on an invoice: must stay
+            Customer(id=8, cnic="35202-0000008-1", name="BILLED", is_deleted=True, deleted_at=OLD),
+            CapturedData(chassis_number="CH-OLD", is_deleted=True, deleted_at=OLD),
+            CapturedData(chassis_number="CH-LIVE"),
+            CustomerMergeSuggestion(primary_id=7, duplicate_id=1, score=0.9, status="DISMISSED"),
+        ])
+        db.add(Invoice(invoice_number="INV-1", pos_id="1", usin="INV-1", customer_id=8,
+                       total_sale_value=100, total_tax_charged=18, total_quantity=1, total_amount=118))
+        db.commit()
+
+    counts = PurgeService().purge(retention_days=90, batch_size=2)
+
+    assert counts == {"customers": 5, "captured_data": 1}
+    with session_local() as db:
+        assert {c.id for c in db.query(Customer)} == {6, 7, 8}
+        assert [c.chassis_number for c in db.query(CapturedData)] == ["CH-LIVE"]
+        assert db.query(CustomerMergeSuggestion).count() == 0
+    session_local.customer_service.invalidate_profile.assert_called_once_with()
+
+
+def test_zero_retention_disables_purge(session_local):
+    with session_local() as db:
+        db.add(Customer(id=1, cnic="35202-0000001-1", name="OLD", is_deleted=True, deleted_at=OLD))
+        db.commit()
+
+    assert PurgeService().purge(retention_days=0) == {}
+    with session_local() as db:
+        assert db.query(Customer).count() == 1
+
+
+def test_soft_delete_records_deleted_at(session_local):
+    from app.services.customer_service import CustomerService
+    from app.services import customer_service as customer_module
+    from sqlalchemy.orm import scoped_session
+
+    db = scoped_session(session_local)
+    db.add(Customer(id=1, cnic="35202-0000001-1", name="ALI"))
+    db.commit()
+    service = CustomerService()
+    with patch.object(service, "db", db), patch.object(customer_module, "customer_index"):
+        assert service.delete_customers([1])[0]
+    assert db.get(Customer, 1).deleted_at is not None
+    db.remove()
@@ -0,0 +1,62 @@
+import threading
+import pytest
+from unittest.mock import patch
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from app.db import session as db_session
+
+
+def _settings(db_url, read_url=""):
+    settings = db_session.config.settings.model_copy()
+    settings.DB_URL = db_url
+    settings.DB_READ_URL = read_url
+    return settings
+
+
+def test_sqlite_file_gets_read_only_uri(tmp_path):
+    db_file = tmp_path / "app.db"
+    with patch.object(db_session.config, "settings", _settings(f"sqlite:///{db_file.as_posix()}")):
+        url = db_session.get_read_url()
+    assert url == f"sqlite:///file:{db_file.resolve().as_posix()}?mode=ro&uri=true"
+
+
+def test_memory_sqlite_uses_primary_url():
+    with patch.object(db_session.config, "settings", _settings("sqlite:///:memory:")):
+        assert db_session.get_read_url() == "sqlite:///:memory:"
+
+
+def test_configured_replica_url_wins():
+    replica = "mysql+pymysql://reader:pw@replica:3306/fbr"
+    with patch.object(db_session.config, "settings", _settings("mysql+pymysql://app:pw@primary:3306/fbr", replica)):
+        assert db_session.get_read_url() == replica
+
+
+def test_read_only_engine_rejects_writes(tmp_path):
+    db_file = tmp_path / "app.db"
+    writer = create_engine(f"sqlite:///{db_file.as_posix()}")
+    with writer.begin() as conn:
+        conn.execute(text("CREATE TABLE t (x INTEGER)"))
+        conn.execute(text("INSERT INTO t VALUES (1)"))
+
+    with patch.object(db_session.config, "settings", _settings(f"sqlite:///{db_file.as_posix()}")):
+        reader = db_session._create_read_engine()
+
+    with reader.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM t")).scalar() == 1
+        with pytest.raises(OperationalError):
+            conn.execute(text("INSERT INTO t VALUES (2)"))
+    reader.dispose()
+    writer.dispose()
+
+
+def test_scoped_session_is_per_thread():
+    sessions = []
+    worker = threading.Thread(target=lambda: sessions.append(db_session.ScopedSession()))
+    worker.start()
+    worker.join()
+
+    try:
+        assert sessions[0] is not db_session.ScopedSession()
+    finally:
+        db_session.ScopedSession.remove()
@@ -0,0 +1,60 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db.models import Base, Customer, Invoice, InvoiceItem, Motorcycle, ProductModel
+from app.services.report_service import ReportService
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    pm = ProductModel(model_name="CD70", make="Honda", engine_capacity="70cc")
+    customer = Customer(cnic="35202-1234567-1", name="ALI")
+    session.add_all([pm, customer])
+    session.flush()
+    bike = Motorcycle(chassis_number="CH-001", engine_number="ENG-001", product_model_id=pm.id, year=2024,
+                      cost_price=50000, sale_price=100000, status="SOLD")
+    session.add(bike)
+    session.flush()
+    for number, when, fiscalized, sync_status in (
+            ("INV-1", datetime(2025, 1, 5), True, "SYNCED"),
+            ("INV-2", datetime(2025, 2, 5), False, "FAILED"),
+            ("INV-3", datetime(2025, 3, 5), False, "PENDING")):
+        invoice = Invoice(invoice_number=number, pos_id="1", usin=number, customer_id=customer.id, datetime=when,
+                          is_fiscalized=fiscalized, sync_status=sync_status, total_sale_value=100,
+                          total_tax_charged=18, total_quantity=1, total_amount=118)
+        session.add(invoice)
+        session.flush()
+        if number == "INV-1":
+            session.add(InvoiceItem(invoice_id=invoice.id, motorcycle_id=bike.id, item_code="CD70", item_name="CD70",
+                                    quantity=1, tax_rate=18, sale_value=100, tax_charged=18, total_amount=118))
+    session.commit()
+    yield session
+    session.close()
+
+
+def test_sales_rows_newest_first_with_status(db):
+    service = ReportService()
+
+    rows = service.sales_rows(service.sales_query(db).all())
+
+    assert [(r[1], r[6]) for r in rows] == [("INV-3", "Pending"), ("INV-2", "Failed"), ("INV-1", "Synced")]
+    assert rows[2][2:6] == ("ALI", "CH-001", "ENG-001", "118.00")
+
+
+def test_sales_query_filters(db):
+    service = ReportService()
+
+    def numbers(**filters):
+        return [inv.invoice_number for inv in service.sales_query(db, **filters).all()]
+
+    assert numbers(status_filter="Pending") == ["INV-3"]
+    assert numbers(status_filter="Failed") == ["INV-2"]
+    assert numbers(search_text="CH-001") == ["INV-1"]
+    assert numbers(start_date=datetime(2025, 2, 1), end_date=datetime(2025, 2, 28)) == ["INV-2"]
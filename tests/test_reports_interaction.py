@@ -20,6 +20,8 @@ class DummyCTkFrame:
     def bind(self, *args, **kwargs): pass
     def configure(self, *args, **kwargs): pass
     def update_idletasks(self, *args, **kwargs): pass
+    def winfo_exists(self): return False
+    def winfo_viewable(self): return False
     def destroy(self): pass
 
 class TestReportsInteraction(unittest.TestCase):
@@ -62,7 +64,7 @@ class TestReportsInteraction(unittest.TestCase):
     def tearDown(self):
         patch.stopall()
 
-    @patch('app.ui.reports_frame.SessionLocal')
+    @patch('app.ui.reports_frame.ReadSessionLocal')
     @patch('customtkinter.CTkToplevel')
     @patch('app.ui.reports_frame.messagebox')
     def test_show_sales_detail_fetches_and_displays(self, mock_msgbox, mock_toplevel, mock_session_local):
@@ -135,7 +137,7 @@ class TestReportsInteraction(unittest.TestCase):
         self.assertIn("INV-001", args[0])
         self.assertIn("FAILED", args[0])
 
-    @patch('app.ui.reports_frame.SessionLocal')
+    @patch('app.ui.reports_frame.ReadSessionLocal')
     @patch('customtkinter.CTkToplevel')
     @patch('app.ui.reports_frame.messagebox')
     def test_show_sales_detail_pending_status(self, mock_msgbox, mock_toplevel, mock_session_local):
@@ -186,7 +188,7 @@ class TestReportsInteraction(unittest.TestCase):
         self.assertIn("INV-002", args[0])
         self.assertIn("PENDING", args[0])
 
-    @patch('app.ui.reports_frame.SessionLocal')
+    @patch('app.ui.reports_frame.ReadSessionLocal')
     @patch('customtkinter.CTkToplevel')
     @patch('app.ui.reports_frame.messagebox')
     def test_show_sales_detail_db_error(self, mock_msgbox, mock_toplevel, mock_session_local):
@@ -0,0 +1,101 @@
+import unittest
+from unittest.mock import MagicMock
+
+from app.services.resource_policy import ResourcePolicy, PLACEHOLDER_GIF
+
+
+def _request(url, resource_type):
+    request = MagicMock()
+    request.url = url
+    request.resource_type = resource_type
+    return request
+
+
+class TestResourcePolicy(unittest.TestCase):
+    def test_decisions(self):
+        policy = ResourcePolicy()
+
+        self.assertEqual(policy.decide("https://dealers.ahlportal.com/stock", "document"), "continue")
+        self.assertEqual(policy.decide("https://dealers.ahlportal.com/app.js", "script"), "continue")
+        self.assertEqual(policy.decide("https://dealers.ahlportal.com/site.css", "stylesheet"), "continue")
+        self.assertEqual(policy.decide("https://dealers.ahlportal.com/logo.png", "image"), "stub")
+        self.assertEqual(policy.decide("https://fonts.gstatic.com/x.woff2", "font"), "abort")
+        self.assertEqual(policy.decide("https://www.googletagmanager.com/gtm.js", "script"), "stub")
+        self.assertEqual(policy.decide("https://www.google-analytics.com/collect", "xhr"), "abort")
+
+    def test_third_party_blocking_is_opt_in(self):
+        policy = ResourcePolicy({"block_third_party": True, "allowed_domains": ["cdn.example.com"]})
+        page = MagicMock()
+
+        with policy.applied(page, "https://dealers.ahlportal.com/stock"):
+            self.assertEqual(policy.decide("https://static.ahlportal.com/app.js", "script"), "continue")
+            self.assertEqual(policy.decide("https://cdn.example.com/jquery.js", "script"), "continue")
+            self.assertEqual(policy.decide("https://widgets.other.net/chat.js", "script"), "stub")
+
+    def test_route_installed_only_while_applied(self):
+        policy = ResourcePolicy()
+        page = MagicMock()
+
+        with policy.applied(page, "https://dealers.ahlportal.com/stock"):
+            page.route.assert_called_once_with("**/*", policy._handle_route)
+            page.unroute.assert_not_called()
+        page.unroute.assert_called_once_with("**/*", policy._handle_route)
+
+    def test_scrape_routes_its_own_pages_not_the_context(self):
+        from app.services.scraper_service import HondaScraper
+
+        policy = ResourcePolicy()
+        page = MagicMock()
+        page.url = "https://dealers.ahlportal.com/stock"
+        tab = page.context.new_page.return_value
+        capture_service = MagicMock()
+        capture_service.resource_policy = policy
+        capture_service.execute_task.side_effect = lambda task: task(page)
+        scraper = HondaScraper(capture_service=capture_service)
+
+        scraper._execute_scrape(lambda p: scraper._new_tab(p))
+
+        page.route.assert_called_once_with("**/*", policy._handle_route)
+        tab.route.assert_called_once_with("**/*", policy._handle_route)
+        page.context.route.assert_not_called()
+        # Tabs opened outside a scrape are left alone
+        self.assertIs(scraper._new_tab(page), tab)
+        tab.route.assert_called_once()
+
+    def test_disabled_policy_does_not_route(self):
+        policy = ResourcePolicy({"enabled": False})
+        page = MagicMock()
+
+        with policy.applied(page, "https://dealers.ahlportal.com/stock"):
+            pass
+        page.route.assert_not_called()
+
+    def test_handle_route_and_savings(self):
+        policy = ResourcePolicy()
+        # Two sampled images of 100 KB / 400 ms and 50 KB / 200 ms
+        for size, ms in ((100000, 400), (50000, 200)):
+            request = _request("https://dealers.ahlportal.com/a.png", "image")
+            request.sizes.return_value = {"responseBodySize": size}
+            request.timing = {"responseEnd": ms}
+            policy._sample(request)
+
+        image_route, font_route, doc_route = MagicMock(), MagicMock(), MagicMock()
+        policy._handle_route(image_route, _request("https://dealers.ahlportal.com/b.png", "image"))
+        policy._handle_route(font_route, _request("https://dealers.ahlportal.com/f.woff", "font"))
+        policy._handle_route(doc_route, _request("https://dealers.ahlportal.com/stock", "document"))
+
+        image_route.fulfill.assert_called_once_with(status=200, content_type="image/gif", body=PLACEHOLDER_GIF)
+        font_route.abort.assert_called_once_with("blockedbyclient")
+        doc_route.continue_.assert_called_once()
+
+        stats = policy.stats()
+        self.assertEqual(stats["stubbed"], {"image": 1})
+        self.assertEqual(stats["blocked"], {"font": 1})
+        self.assertEqual(stats["allowed"], 1)
+        # Sampled image average (75 KB, 300 ms) plus the default font estimate
+        self.assertEqual(stats["saved_bytes"], 75000 + 60000)
+        self.assertEqual(stats["saved_request_ms"], 300 + 300)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+import pytest
+from unittest.mock import MagicMock, patch
+
+from app.services.scrape_worker import ScrapeAuthError, ScrapeWorker
+
+
+@pytest.fixture
+def worker(tmp_path):
+    w = ScrapeWorker(storage_state_path=str(tmp_path / "state.json"))
+    w.capture_service = MagicMock()
+    w.capture_service.config = {}
+    page = MagicMock()
+    page.query_selector.return_value = None
+    w.page = page
+    w.execute_task = lambda callback: callback(page)
+    return w
+
+
+def test_scrape_requires_saved_login(worker):
+    with pytest.raises(ScrapeAuthError):
+        worker.scrape_stock("https://portal/stock")
+
+
+def test_expired_session_detected_on_open(worker):
+    worker.page.query_selector.return_value = MagicMock()
+
+    with pytest.raises(ScrapeAuthError):
+        worker._open_list(worker.page, "https://portal/stock")
+
+
+def test_incremental_scrape_runs_on_worker_and_saves_state(worker, tmp_path):
+    (tmp_path / "state.json").write_text("{}")
+    scraper = MagicMock()
+    scraper.scrape_incremental.return_value = [{"chassis_number": "C9"}]
+
+    with patch("app.services.scrape_worker.HondaScraper", return_value=scraper) as scraper_cls:
+        items = worker.scrape_stock("https://portal/stock", known_chassis={"C1"})
+
+    assert items == [{"chassis_number": "C9"}]
+    scraper_cls.assert_called_once_with(capture_service=worker)
+    scraper.scrape_incremental.assert_called_once()
+    assert scraper.scrape_incremental.call_args.args[0] == {"C1"}
+    worker.page.goto.assert_called_once_with("https://portal/stock", timeout=30000)
+    worker.page.context.storage_state.assert_called_once_with(path=worker.storage_state_path)
+    assert worker.take_last_result()["items"] == items
+    assert worker.take_last_result() is None
+
+
+def test_configured_schedule_needs_interval_url_and_login(worker, tmp_path):
+    worker.start_schedule = MagicMock()
+
+    worker.capture_service.config = {"background_scrape": {"list_url": "https://portal/stock", "interval_minutes": 30}}
+    assert worker.start_configured_schedule() is False  # no saved login yet
+
+    (tmp_path / "state.json").write_text("{}")
+    assert worker.start_configured_schedule() is True
+    worker.start_schedule.assert_called_once_with("https://portal/stock", 30.0, None)
+
+    worker.capture_service.config = {"background_scrape": {"list_url": "https://portal/stock", "interval_minutes": 0}}
+    assert worker.start_configured_schedule() is False
+
+
+def test_remember_list_url_saves_once(worker):
+    worker.remember_list_url("https://portal/stock")
+    worker.remember_list_url("https://portal/stock")
+
+    assert worker.config["background_scrape"]["list_url"] == "https://portal/stock"
+    worker.capture_service.save_config.assert_called_once()
+
+
+def test_execute_task_times_out_when_worker_hangs(tmp_path):
+    w = ScrapeWorker(storage_state_path=str(tmp_path / "state.json"))
+    w.start = MagicMock()  # no browser thread picks the task up
+
+    with pytest.raises(TimeoutError):
+        w.execute_task(lambda page: None, timeout=0.05)
+
+    _, future = w.task_queue.get_nowait()
+    assert future.cancelled()
+
+
+def test_worker_is_built_on_first_use():
+    from app.services import scrape_worker as worker_module
+
+    with patch.object(worker_module, "_scrape_worker", None), \
+            patch.object(worker_module, "ScrapeWorker") as worker_cls:
+        assert worker_module.get_scrape_worker(create=False) is None
+        worker_cls.assert_not_called()
+        assert worker_module.get_scrape_worker() is worker_module.get_scrape_worker()
+        worker_cls.assert_called_once_with()
+
+
+def test_scheduled_scrape_builds_worker_only_when_configured(tmp_path):
+    from app.services import scrape_worker as worker_module
+
+    config_path = tmp_path / "capture_config.json"
+    state_path = tmp_path / "state.json"
+    with patch.object(worker_module, "_scrape_worker", None), \
+            patch.object(worker_module, "ScrapeWorker") as worker_cls:
+        assert worker_module.start_scheduled_scrape(str(config_path), str(state_path)) is False
+
+        config_path.write_text('{"background_scrape": {"interval_minutes": 0, "list_url": "https://portal/stock"}}')
+        state_path.write_text("{}")
+        assert worker_module.start_scheduled_scrape(str(config_path), str(state_path)) is False
+        worker_cls.assert_not_called()
+
+        config_path.write_text('{"background_scrape": {"interval_minutes": 30, "list_url": "https://portal/stock"}}')
+        worker_module.start_scheduled_scrape(str(config_path), str(state_path))
+        worker_cls.return_value.start_configured_schedule.assert_called_once_with()
@@ -0,0 +1,450 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from app.services.scraper_service import (
+    HondaScraper, ScrapeCheckpoint, STOCK_TABLE_COLUMNS, EXTRACT_TABLE_JS, WAIT_TABLE_CHANGE_JS,
+)
+
+
+def _row(values):
+    row = MagicMock()
+    cells = []
+    for v in values:
+        cell = MagicMock()
+        cell.inner_text.return_value = f" {v} "
+        cells.append(cell)
+    row.query_selector_all.return_value = cells
+    return row
+
+
+class TestScraperExtraction(unittest.TestCase):
+    def setUp(self):
+        # Skip __init__ so no browser service is created
+        self.scraper = HondaScraper.__new__(HondaScraper)
+
+    def test_fast_path_uses_single_evaluate(self):
+        page = MagicMock()
+        page.evaluate.return_value = [
+            {"purchase_order": "PO1", "model": "CD70", "color": "RED", "engine_number": "E1", "chassis_number": "C1", "status": "Sold"},
+            {"purchase_order": "PO2", "model": "CG125", "color": "BLACK", "engine_number": "", "chassis_number": "C2", "status": "In Stock"},
+        ]
+
+        data = self.scraper._scrape_page_logic(page, 3)
+
+        page.evaluate.assert_called_once_with(EXTRACT_TABLE_JS, STOCK_TABLE_COLUMNS)
+        page.query_selector_all.assert_not_called()
+        self.assertEqual(len(data), 1)
+        self.assertEqual(data[0]["status"], "SOLD")
+        self.assertEqual(data[0]["page_number"], 3)
+
+    def test_falls_back_to_per_cell_when_evaluate_fails(self):
+        page = MagicMock()
+        page.evaluate.side_effect = Exception("Execution context was destroyed")
+        page.query_selector_all.return_value = [
+            _row(["1", "PO1", "x", "CD70", "RED", "E1", "C1", "In Stock"]),
+            _row(["short", "row"]),
+        ]
+
+        data = self.scraper._scrape_page_logic(page, 1)
+
+        self.assertEqual(data, [{
+            "purchase_order": "PO1", "model": "CD70", "color": "RED", "engine_number": "E1",
+            "chassis_number": "C1", "status": "IN_STOCK", "page_number": 1,
+        }])
+
+    def test_unexpected_result_triggers_fallback(self):
+        page = MagicMock()
+        page.evaluate.return_value = None
+        page.query_selector_all.return_value = []
+
+        self.assertEqual(self.scraper._scrape_page_logic(page, 1), [])
+        page.query_selector_all.assert_called()
+
+
+class TestParallelScrape(unittest.TestCase):
+    def setUp(self):
+        self.scraper = HondaScraper.__new__(HondaScraper)
+
+    def test_page_url_template(self):
+        self.assertEqual(
+            HondaScraper._page_url_template("https://portal/stock?status=1&PageNo=1"),
+            "https://portal/stock?status=1&PageNo={page}",
+        )
+        self.assertIsNone(HondaScraper._page_url_template("https://portal/stock?status=1"))
+
+    def test_pages_merged_in_order_with_dedup(self):
+        pages = {
+            1: [{"purchase_order": "PO1", "chassis_number": "C1", "engine_number": "E1"}],
+            2: [{"purchase_order": "PO2", "chassis_number": "C2", "engine_number": "E2"},
+                {"purchase_order": "PO1", "chassis_number": "C1", "engine_number": "E1"}],
+            3: [{"purchase_order": "PO3", "chassis_number": "C3", "engine_number": "E3"}],
+            4: [],
+        }
+        page = MagicMock()
+        page.url = "https://portal/stock?page=1"
+        page.evaluate.return_value = None  # total pages unknown
+        tabs = [MagicMock(), MagicMock()]
+        page.context.new_page.side_effect = tabs
+
+        self.scraper._scrape_page_logic = lambda p, num: pages.get(num, [])
+
+        data = self.scraper._scrape_parallel(page, max_pages=10, workers=2)
+
+        self.assertEqual([d["purchase_order"] for d in data], ["PO1", "PO2", "PO3"])
+        tabs[0].goto.assert_any_call("https://portal/stock?page=2", wait_until="commit", timeout=30000)
+        tabs[1].goto.assert_any_call("https://portal/stock?page=3", wait_until="commit", timeout=30000)
+        for tab in tabs:
+            tab.close.assert_called_once()
+
+    def _url_page(self, pages, failures):
+        """Scraper whose tabs load ?page=N; `failures` maps page -> how many loads fail first."""
+        page = MagicMock()
+        page.url = "https://portal/stock?page=1"
+        page.evaluate.return_value = None
+        page.context.new_page.side_effect = lambda: MagicMock()
+        self.scraper._scrape_page_logic = lambda p, num: pages.get(num, [])
+        real_finish = HondaScraper._finish_page_load
+
+        def finish(tab, num, token):
+            if failures.get(num):
+                failures[num] -= 1
+                return None
+            return real_finish(self.scraper, tab, num, token)
+        self.scraper._finish_page_load = finish
+        return page
+
+    def test_failed_page_is_retried_instead_of_ending_the_list(self):
+        pages = {n: [{"purchase_order": f"PO{n}", "chassis_number": f"C{n}", "engine_number": f"E{n}"}] for n in range(1, 5)}
+        page = self._url_page(pages, {2: 2})
+
+        data = self.scraper._scrape_parallel(page, max_pages=10, workers=2)
+
+        self.assertEqual([d["purchase_order"] for d in data], ["PO1", "PO2", "PO3", "PO4"])
+
+    def test_persistent_failure_falls_back_to_sequential(self):
+        pages = {n: [{"purchase_order": f"PO{n}", "chassis_number": f"C{n}", "engine_number": f"E{n}"}] for n in range(1, 5)}
+        page = self._url_page(pages, {3: 99})
+        self.scraper._scrape_sequential = MagicMock(return_value=["sequential"])
+
+        self.assertEqual(self.scraper._scrape_parallel(page, max_pages=10, workers=2), ["sequential"])
+
+    def test_detected_total_does_not_cap_pages(self):
+        pages = {n: [{"purchase_order": f"PO{n}", "chassis_number": f"C{n}", "engine_number": f"E{n}"}] for n in range(1, 5)}
+        page = self._url_page(pages, {})
+        page.evaluate.return_value = 2
+
+        data = self.scraper._scrape_parallel(page, max_pages=10, workers=2)
+
+        self.assertEqual(len(data), 4)
+
+    def test_failure_past_detected_total_ends_the_list(self):
+        pages = {n: [{"purchase_order": f"PO{n}", "chassis_number": f"C{n}", "engine_number": f"E{n}"}] for n in range(1, 3)}
+        page = self._url_page(pages, {3: 99})
+        page.evaluate.return_value = 2
+        self.scraper._scrape_sequential = MagicMock()
+
+        data = self.scraper._scrape_parallel(page, max_pages=10, workers=2)
+
+        self.assertEqual([d["purchase_order"] for d in data], ["PO1", "PO2"])
+        self.scraper._scrape_sequential.assert_not_called()
+
+    def test_falls_back_to_sequential_when_pages_cannot_be_reached(self):
+        page = MagicMock()
+        page.url = "https://portal/stock"
+        page.evaluate.return_value = 5
+        page.context.new_page.return_value = MagicMock()
+
+        self.scraper._scrape_page_logic = lambda p, num: [{"purchase_order": "PO1", "chassis_number": "C1", "engine_number": "E1"}]
+        self.scraper._start_page_load = MagicMock(return_value=False)
+        self.scraper._scrape_sequential = MagicMock(return_value=["sequential"])
+
+        self.assertEqual(self.scraper._scrape_parallel(page, max_pages=10, workers=3), ["sequential"])
+        self.scraper._scrape_sequential.assert_called_once()
+
+
+class TestIncrementalScrape(unittest.TestCase):
+    PAGES = {
+        1: [{"purchase_order": "PO5", "chassis_number": "C5", "engine_number": "E5"},
+            {"purchase_order": "PO4", "chassis_number": "C4", "engine_number": "E4"}],
+        2: [{"purchase_order": "PO3", "chassis_number": "C3", "engine_number": "E3"},
+            {"purchase_order": "PO2", "chassis_number": "C2", "engine_number": "E2"}],
+        3: [{"purchase_order": "PO1", "chassis_number": "C1", "engine_number": "E1"}],
+    }
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "scrape_checkpoint.json")
+        self.scraper = HondaScraper.__new__(HondaScraper)
+        self.scraper.capture_service = MagicMock()
+        self.scraper.capture_service.execute_task.side_effect = lambda task: task(self.page)
+        self.page = MagicMock()
+        self.page.url = "https://portal/stock?PageNo=1"
+        self.current = {"page": 1}
+        self.scraper._get_first_cell_text = lambda p: ""
+        self.scraper._wait_for_table_update = MagicMock()
+        self.scraper._scrape_page_logic = lambda p, num: self.PAGES.get(self.current["page"], [])
+
+        def next_page(p, current_page_num):
+            self.current["page"] += 1
+            return True
+        self.scraper._go_to_next_page = next_page
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_stops_at_first_page_of_known_chassis(self):
+        checkpoint = ScrapeCheckpoint(self.path)
+
+        data = self.scraper.scrape_incremental({"c3", "C2", "C1"}, checkpoint)
+
+        self.assertEqual([d["chassis_number"] for d in data], ["C5", "C4"])
+        saved = ScrapeCheckpoint(self.path)
+        self.assertFalse(saved.in_progress)
+        self.assertEqual(saved.data["last_chassis"], "C5")
+        self.assertEqual(saved.data["last_purchase_order"], "PO5")
+        self.assertEqual(saved.last_completed_page, 2)
+
+    def test_resumes_after_last_completed_page(self):
+        checkpoint = ScrapeCheckpoint(self.path)
+        checkpoint.start(self.page.url)
+        checkpoint.page_done(1, ScrapeCheckpoint.page_signature(self.PAGES[1]), self.PAGES[1])
+
+        def goto(url, timeout=None):
+            self.current["page"] = int(url.rsplit("=", 1)[1])
+        self.page.goto.side_effect = goto
+
+        data = self.scraper.scrape_incremental(set(), ScrapeCheckpoint(self.path))
+
+        self.assertEqual([d["chassis_number"] for d in data], ["C5", "C4", "C3", "C2", "C1"])
+        self.page.goto.assert_called_once_with("https://portal/stock?PageNo=1", timeout=30000)
+
+    def test_stale_checkpoint_restarts_from_first_page(self):
+        checkpoint = ScrapeCheckpoint(self.path)
+        checkpoint.start(self.page.url)
+        checkpoint.page_done(1, "outdated", [{"purchase_order": "PO0", "chassis_number": "C0", "engine_number": "E0"}])
+
+        def goto(url, timeout=None):
+            self.current["page"] = int(url.rsplit("=", 1)[1])
+        self.page.goto.side_effect = goto
+
+        data = self.scraper.scrape_incremental({"C3", "C2"}, ScrapeCheckpoint(self.path))
+
+        self.assertEqual([d["chassis_number"] for d in data], ["C5", "C4"])
+
+    def test_stops_when_next_page_does_not_change_the_table(self):
+        pages = []
+        self.scraper._scrape_page_logic = lambda p, num: pages.append(num) or self.PAGES[1]
+        self.scraper._go_to_next_page = lambda p, current_page_num: True
+        self.scraper._wait_for_table_update = MagicMock(return_value=False)
+
+        data = self.scraper.scrape_incremental(set(), ScrapeCheckpoint(self.path), max_pages=50)
+
+        self.assertEqual([d["chassis_number"] for d in data], ["C5", "C4"])
+        self.assertEqual(pages, [1])
+
+    def test_stops_when_pager_repeats_the_same_page(self):
+        pages = []
+        self.scraper._scrape_page_logic = lambda p, num: pages.append(num) or self.PAGES[1]
+        self.scraper._go_to_next_page = lambda p, current_page_num: True
+
+        data = self.scraper.scrape_incremental(set(), ScrapeCheckpoint(self.path), max_pages=50)
+
+        self.assertEqual([d["chassis_number"] for d in data], ["C5", "C4"])
+        self.assertEqual(pages, [1, 2])
+
+    def _checkpoint_after_page_one(self):
+        checkpoint = ScrapeCheckpoint(self.path)
+        checkpoint.start(self.page.url)
+        checkpoint.page_done(1, ScrapeCheckpoint.page_signature(self.PAGES[1]), self.PAGES[1],
+                             newest_item=self.PAGES[1][0])
+
+        def goto(url, timeout=None):
+            self.current["page"] = int(url.rsplit("=", 1)[1])
+        self.page.goto.side_effect = goto
+
+    def test_resumed_run_still_records_newest_item(self):
+        self._checkpoint_after_page_one()
+
+        self.scraper.scrape_incremental({"C1"}, ScrapeCheckpoint(self.path))
+
+        saved = ScrapeCheckpoint(self.path)
+        self.assertFalse(saved.in_progress)
+        self.assertEqual(saved.data["last_chassis"], "C5")
+
+    def test_checkpoint_on_last_page_finishes_without_rescanning(self):
+        self._checkpoint_after_page_one()
+        self.scraper._go_to_next_page = lambda p, current_page_num: False
+
+        data = self.scraper.scrape_incremental(set(), ScrapeCheckpoint(self.path))
+
+        self.assertEqual([d["chassis_number"] for d in data], ["C5", "C4"])
+        self.assertEqual(ScrapeCheckpoint(self.path).data["last_chassis"], "C5")
+
+    def test_failed_resume_returns_to_first_page(self):
+        self._checkpoint_after_page_one()
+        calls = []
+
+        def next_page(p, current_page_num):
+            calls.append(current_page_num)
+            if len(calls) == 1:
+                raise RuntimeError("pager gone")
+            self.current["page"] += 1
+            return True
+        self.scraper._go_to_next_page = next_page
+
+        data = self.scraper.scrape_incremental({"C3"}, ScrapeCheckpoint(self.path))
+
+        self.assertEqual(self.page.goto.call_args_list[-1].args[0], "https://portal/stock?PageNo=1")
+        self.assertEqual([d["chassis_number"] for d in data], ["C5", "C4", "C2", "C1"])
+
+    def test_run_types_use_separate_files(self):
+        with patch("os.getcwd", return_value=self.tmp.name):
+            interactive = ScrapeCheckpoint()
+            background = ScrapeCheckpoint(run_type="background")
+        self.assertNotEqual(interactive.path, background.path)
+
+
+class TestTableChangeWait(unittest.TestCase):
+    def setUp(self):
+        self.scraper = HondaScraper.__new__(HondaScraper)
+
+    def test_waits_on_observer_without_fixed_sleep(self):
+        page = MagicMock()
+        page.evaluate.return_value = True
+
+        self.assertTrue(self.scraper._wait_for_table_update(page, old_text="PO1", old_row_count=20))
+
+        page.evaluate.assert_called_once_with(
+            WAIT_TABLE_CHANGE_JS, {"oldText": "PO1", "oldRowCount": 20, "timeoutMs": 10000}
+        )
+        page.wait_for_timeout.assert_not_called()
+
+    def test_row_count_check_is_opt_in(self):
+        page = MagicMock()
+        page.evaluate.return_value = True
+
+        self.scraper._wait_for_table_update(page, old_text="PO1")
+
+        args = page.evaluate.call_args[0][1]
+        self.assertIsNone(args["oldRowCount"])
+        self.assertIn("oldRowCount !== null", WAIT_TABLE_CHANGE_JS)
+
+    def test_incremental_scrape_passes_row_count(self):
+        page = MagicMock()
+        page.url = "https://portal/stock"
+        rows = [MagicMock()] * 20
+        page.query_selector_all.return_value = rows
+        self.scraper.capture_service = MagicMock()
+        self.scraper.capture_service.execute_task.side_effect = lambda task: task(page)
+        self.scraper._get_first_cell_text = lambda p: "PO1"
+        self.scraper._scrape_page_logic = lambda p, num: [{"purchase_order": "PO1", "chassis_number": "C1", "engine_number": "E1"}]
+        self.scraper._go_to_next_page = MagicMock(side_effect=[True, False])
+        self.scraper._wait_for_table_update = MagicMock()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            self.scraper.scrape_incremental(set(), ScrapeCheckpoint(os.path.join(tmp, "cp.json")), resume=False)
+
+        self.scraper._wait_for_table_update.assert_called_once_with(page, old_text="PO1", old_row_count=20)
+
+    def test_timeout_returns_false(self):
+        page = MagicMock()
+        page.evaluate.return_value = False
+
+        self.assertFalse(self.scraper._wait_for_table_update(page, old_text="PO1", timeout_ms=50))
+        page.wait_for_timeout.assert_not_called()
+
+    def test_rechecks_after_navigation(self):
+        page = MagicMock()
+        page.evaluate.side_effect = [Exception("Execution context was destroyed"), True]
+
+        self.assertTrue(self.scraper._wait_for_table_update(page, old_text="PO1"))
+        page.wait_for_load_state.assert_called_once_with("domcontentloaded", timeout=10000)
+
+
+class TestPaginationStrategyCache(unittest.TestCase):
+    def setUp(self):
+        self.scraper = HondaScraper.__new__(HondaScraper)
+        self.scraper.capture_service = MagicMock()
+        self.scraper.capture_service.config = {}
+        self.page = MagicMock()
+        self.page.url = "https://dealers.example.com/stock"
+        self.page.query_selector_all.return_value = []
+
+    def _only_visible(self, selector):
+        self.page.is_visible.side_effect = lambda sel: sel == selector
+
+    def test_learns_and_persists_working_strategy(self):
+        self._only_visible(".next")
+
+        self.assertTrue(self.scraper._go_to_next_page(self.page, current_page_num=1))
+
+        self.page.click.assert_called_once_with(".next")
+        self.assertEqual(
+            self.scraper.capture_service.config["pagination_strategies"],
+            {"dealers.example.com": {"strategy": "button", "selector": ".next"}},
+        )
+        self.scraper.capture_service.save_config.assert_called_once()
+
+    def test_learned_strategy_is_tried_first(self):
+        self.scraper.capture_service.config = {
+            "pagination_strategies": {"dealers.example.com": {"strategy": "button", "selector": ".next"}}
+        }
+        self._only_visible(".next")
+
+        self.assertTrue(self.scraper._go_to_next_page(self.page, current_page_num=4))
+
+        self.page.is_visible.assert_called_once_with(".next")
+        self.page.query_selector_all.assert_not_called()
+        self.scraper.capture_service.save_config.assert_not_called()
+
+    def test_relearns_when_cached_strategy_fails(self):
+        self.scraper.capture_service.config = {
+            "pagination_strategies": {"dealers.example.com": {"strategy": "button", "selector": ".next"}}
+        }
+        self._only_visible("a[title='Next Page']")
+
+        self.assertTrue(self.scraper._go_to_next_page(self.page, current_page_num=2))
+
+        self.assertEqual(
+            self.scraper.capture_service.config["pagination_strategies"]["dealers.example.com"],
+            {"strategy": "button", "selector": "a[title='Next Page']"},
+        )
+        self.scraper.capture_service.save_config.assert_called_once()
+
+    def test_no_strategy_works(self):
+        self.page.is_visible.return_value = False
+        self.page.get_by_role.return_value.is_visible.return_value = False
+
+        self.assertFalse(self.scraper._go_to_next_page(self.page, current_page_num=9))
+        self.assertNotIn("pagination_strategies", self.scraper.capture_service.config)
+
+    def test_failing_candidate_falls_through_to_the_next(self):
+        def is_visible(sel):
+            if sel == "button[title='Next Page']":
+                raise RuntimeError("detached")
+            return sel == "a[title='Next Page']"
+        self.page.is_visible.side_effect = is_visible
+
+        self.assertTrue(self.scraper._go_to_next_page(self.page, current_page_num=1))
+        self.page.click.assert_called_once_with("a[title='Next Page']")
+
+    def test_page_input_selector_quotes_the_id(self):
+        broken, inp = MagicMock(), MagicMock()
+        broken.is_visible.side_effect = RuntimeError("detached")
+        inp.input_value.return_value = "3"
+        inp.bounding_box.return_value = {"width": 40}
+        inp.get_attribute.return_value = 'pager:"no"'
+        self.page.query_selector_all.return_value = [broken, inp]
+
+        self.assertTrue(self.scraper._go_to_next_page(self.page, current_page_num=3))
+        inp.fill.assert_called_once_with("4")
+        self.assertEqual(
+            self.scraper.capture_service.config["pagination_strategies"]["dealers.example.com"],
+            {"strategy": "input", "selector": '[id="pager:\\"no\\""]'},
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+import pytest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from app.db.models import Customer, CustomerType
+from app.services.search_index import CustomerSearchIndex, PrefixIndex
+
+# The index imports SessionLocal at load time
+SESSION_LOCAL = "app.db.session.SessionLocal"
+
+
+def _customer(id, name, business_name=None, cnic="", type=CustomerType.DEALER, is_deleted=False):
+    return SimpleNamespace(id=id, type=type, name=name, father_name="", business_name=business_name,
+                           cnic=cnic, phone="0300", address="LHR", is_deleted=is_deleted)
+
+
+@pytest.fixture
+def session_local(session_local):
+    with session_local() as db:
+        db.add_all([
+            Customer(cnic="35202-1111111-1", name="ALI", business_name="HONDA CENTER",
+                     normalized_business_name="hondacenter", type=CustomerType.DEALER),
+            Customer(cnic="35202-2222222-2", name="BILAL", business_name="HONDA CITY MOTORS",
+                     normalized_business_name="hondacitymotors", type=CustomerType.DEALER),
+            Customer(cnic="35202-3333333-3", name="HONDA FAN", type=CustomerType.INDIVIDUAL),
+            Customer(cnic="35202-4444444-4", name="GONE", business_name="HONDA GONE",
+                     normalized_business_name="hondagone", type=CustomerType.DEALER, is_deleted=True),
+        ])
+        db.commit()
+    return session_local
+
+
+def test_prefix_index_bisects_and_dedupes():
+    index = PrefixIndex([("hondacenter", 1), ("hondacity", 2), ("yamaha", 3), ("honda", 2)])
+
+    assert index.prefix("honda", 10) == [2, 1]
+    assert index.prefix("honda", 1) == [2]
+    assert index.prefix("suzuki", 10) == []
+
+    index.remove("hondacity", 2)
+    index.add("hondaaa", 4)
+    assert index.prefix("hondac", 10) == [1]
+    assert index.prefix("honda", 10) == [2, 4, 1]
+
+
+def test_load_indexes_live_dealers_only(session_local):
+    index = CustomerSearchIndex()
+    assert not index.ready
+
+    index.load()
+
+    assert index.ready
+    # Normalized query: spaces and case don't matter
+    assert [d.business_name for d in index.search_dealers("Honda C", 5)] == ["HONDA CENTER", "HONDA CITY MOTORS"]
+    assert [d.business_name for d in index.search_dealers("honda-city", 5)] == ["HONDA CITY MOTORS"]
+    assert index.search_dealers("honda gone", 5) == []
+
+
+def test_customer_lookup_by_name_or_cnic(session_local):
+    index = CustomerSearchIndex()
+    index.load()
+
+    # Names and business names, newest first like the database search
+    assert [c.name for c in index.search_customers("honda")] == ["HONDA FAN", "BILAL", "ALI"]
+    assert [c.name for c in index.search_customers("fan")] == ["HONDA FAN"]
+    assert [c.name for c in index.search_customers("city motors")] == ["BILAL"]
+    assert [c.name for c in index.search_customers("35202-2222")] == ["BILAL"]
+    assert [c.name for c in index.search_customers("3520222")] == ["BILAL"]
+
+
+def test_customer_search_uses_index_once_ready():
+    from app.services.customer_service import customer_service
+    from app.services import customer_service as customer_module
+
+    index = CustomerSearchIndex()
+    index.ready = True
+    index.upsert(_customer(5, "MUHAMMAD ALI", type=CustomerType.INDIVIDUAL))
+    with patch.object(customer_module, "customer_index", index), \
+            patch.object(customer_service, "db") as db:
+        assert [c.id for c in customer_service.search_customers("ali")] == [5]
+        assert [c.id for c in customer_service.search_customers("0300")] == [5]
+        db.query.assert_not_called()
+
+        # Nothing from the start of a word: the database's substring search
+        customer_service.search_customers("hammad")
+        db.query.assert_called_once()
+
+
+def test_write_hooks_keep_index_current(session_local):
+    index = CustomerSearchIndex()
+    index.load()
+
+    index.upsert(_customer(10, "ZAIN", "SUZUKI POINT"))
+    assert [d.id for d in index.search_dealers("suz")] == [10]
+
+    index.upsert(_customer(10, "ZAIN", "YAMAHA POINT"))
+    assert index.search_dealers("suz") == []
+    assert [d.id for d in index.search_dealers("yam")] == [10]
+
+    index.remove(10)
+    assert index.search_dealers("yam") == []
+    assert index.search_customers("zain") == []
+
+
+def test_changes_during_load_are_replayed(session_local):
+    index = CustomerSearchIndex()
+    index._loading = True  # As if start_loading() were mid-query
+
+    index.upsert(_customer(20, "NEW", "HONDA NEW"))
+    index.remove(1)
+    assert index.search_dealers("honda") == []  # Nothing served before ready
+
+    index.load()
+
+    assert [d.business_name for d in index.search_dealers("honda", 5)] == ["HONDA CITY MOTORS", "HONDA NEW"]
+
+
+def test_dealer_search_uses_index_once_ready():
+    from app.services.dealer_service import dealer_service
+    from app.services import dealer_service as dealer_module
+
+    index = CustomerSearchIndex()
+    index.ready = True
+    index.upsert(_customer(5, "ALI", "HONDA CENTER"))
+    with patch.object(dealer_module, "customer_index", index), \
+            patch.object(dealer_service, "db") as db:
+        results = dealer_service.search_dealers_by_business_name("hon")
+
+    assert [r.business_name for r in results] == ["HONDA CENTER"]
+    db.query.assert_not_called()
@@ -0,0 +1,135 @@
+import unittest
+
+from app.ui.tree_renderer import TreeRenderer
+
+
+class FakeTree:
+    """Minimal in-memory ttk.Treeview; after_idle callbacks run on pump()."""
+
+    def __init__(self):
+        self.order = []
+        self.items = {}
+        self.idle = []
+        self.calls = []
+        self._auto = 0
+
+    def get_children(self, item=""):
+        return tuple(self.order)
+
+    def exists(self, iid):
+        return iid in self.items
+
+    def insert(self, parent, index, iid=None, values=(), tags=()):
+        if iid is None:
+            self._auto += 1
+            iid = f"I{self._auto:03d}"
+        assert iid not in self.items
+        self.items[iid] = {"values": tuple(str(v) for v in values), "tags": tags}
+        self.order.insert(len(self.order) if index == "end" else index, iid)
+        self.calls.append(("insert", iid))
+        return iid
+
+    def delete(self, *iids):
+        self.calls.append(("delete", iids))
+        for iid in iids:
+            self.order.remove(iid)
+            del self.items[iid]
+
+    def item(self, iid, option=None, **kw):
+        if kw:
+            self.calls.append(("item", iid))
+            self.items[iid]["values"] = tuple(str(v) for v in kw["values"])
+            self.items[iid]["tags"] = kw.get("tags", ())
+            return None
+        return self.items[iid][option]
+
+    def index(self, iid):
+        return self.order.index(iid)
+
+    def move(self, iid, parent, index):
+        self.calls.append(("move", iid))
+        self.order.remove(iid)
+        self.order.insert(index, iid)
+
+    def after_idle(self, callback):
+        self.idle.append(callback)
+        return len(self.idle) - 1
+
+    def after_cancel(self, job):
+        self.idle[job] = None
+
+    def winfo_exists(self):
+        return True
+
+    def pump(self):
+        steps = 0
+        while any(self.idle):
+            callbacks, self.idle = self.idle, []
+            for callback in callbacks:
+                if callback:
+                    callback()
+                    steps += 1
+        return steps
+
+    def values(self):
+        return [self.items[iid]["values"] for iid in self.order]
+
+
+class TestTreeRenderer(unittest.TestCase):
+    def setUp(self):
+        self.tree = FakeTree()
+        self.renderer = TreeRenderer(self.tree)
+
+    def test_keyed_refresh_only_touches_changed_rows(self):
+        self.renderer.render([(1, "A"), (2, "B"), (3, "C")], key=lambda r: r[0])
+        self.tree.calls.clear()
+
+        done = []
+        self.renderer.render([(4, "D"), (1, "A"), (3, "C2")], key=lambda r: r[0], on_done=lambda: done.append(True))
+        self.tree.pump()
+
+        self.assertEqual(self.tree.values(), [("4", "D"), ("1", "A"), ("3", "C2")])
+        self.assertEqual(self.tree.calls, [("delete", ("k:2",)), ("insert", "k:4"), ("item", "k:3")])
+        self.assertEqual(done, [True])
+
+    def test_unkeyed_render_clears_in_one_call(self):
+        self.renderer.render([("x",), ("y",)])
+        self.tree.calls.clear()
+
+        self.renderer.render([("z",)])
+
+        self.assertEqual(self.tree.calls[0][0], "delete")
+        self.assertEqual(len(self.tree.calls[0][1]), 2)
+        self.assertEqual(self.tree.values(), [("z",)])
+
+    def test_large_render_is_split_across_idle_callbacks(self):
+        renderer = TreeRenderer(self.tree, budget_ms=0)
+        rows = [(i, f"row {i}") for i in range(50)]
+        done = []
+
+        renderer.render(rows, key=lambda r: r[0], on_done=lambda: done.append(True))
+        self.assertTrue(renderer.busy)
+        self.assertEqual(done, [])
+
+        self.assertGreater(self.tree.pump(), 1)
+        self.assertEqual(len(self.tree.values()), 50)
+        self.assertEqual(done, [True])
+
+    def test_new_render_cancels_unfinished_one(self):
+        renderer = TreeRenderer(self.tree, budget_ms=0)
+        renderer.render([(i,) for i in range(10)], key=lambda r: r[0])
+        renderer.render([(100,), (101,)], key=lambda r: r[0])
+        self.tree.pump()
+
+        self.assertEqual(self.tree.values(), [("100",), ("101",)])
+
+    def test_duplicate_keys_and_tags(self):
+        self.renderer.render([(1, "Synced"), (1, "again"), (2, "Failed")], key=lambda r: r[0],
+                             tags=lambda r: (r[1].lower(),))
+
+        self.assertEqual(self.tree.values(), [("1", "Synced"), ("2", "Failed")])
+        self.assertEqual(self.tree.items["k:2"]["tags"], ("failed",))
+
+
+if __name__ == "__main__":
+    unittest.main()